@@ -0,0 +1,85 @@
+"""
+Command line interface shared by the benchmarks that store their results.
+
+These benchmarks have two commands:
+
+    - run: runs the benchmark cases, prints a line per case and stores the
+      results as JSON.
+
+    - compare: compares the results of two runs and exits with a non-zero
+      status if any case regressed by more than the given threshold.
+
+Each benchmark gives the functions that run and compare its cases, along with
+the functions that format a case and a comparison, and it can add its own
+options to the run command.
+"""
+
+import json
+import argparse
+
+
+def create_parser(description, case_names, threshold, run_command, compare_command):
+    """Create the parser of the run and compare commands of a benchmark.
+
+    The run and compare functions receive the parsed arguments and return the
+    exit status of the command. Returns the parser and the parser of the run
+    command, so the benchmark can add its own options to the run command.
+    """
+
+    parser = argparse.ArgumentParser(description=description)
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.required = True
+
+    run_parser = subparsers.add_parser("run", help="run the benchmark cases")
+    run_parser.add_argument("-o", "--output", help="JSON file where the results are stored")
+    run_parser.add_argument("-c", "--cases", nargs="+", choices=sorted(case_names),
+                            help="cases to run (all by default)")
+    run_parser.set_defaults(func=run_command)
+
+    compare_parser = subparsers.add_parser("compare", help="compare results against a baseline")
+    compare_parser.add_argument("baseline", help="JSON file with the baseline results")
+    compare_parser.add_argument("current", help="JSON file with the results to check")
+    compare_parser.add_argument("-t", "--threshold", type=float, default=threshold,
+                                help="relative change that counts as a regression")
+    compare_parser.set_defaults(func=compare_command)
+
+    return parser, run_parser
+
+
+def report_results(results, format_case, output=None):
+    """Print the results of every case and store them in the output file (if
+    it's given.)
+
+    The format function receives the name and the results of a case and
+    returns the lines that are printed for it.
+    """
+
+    for case_name, case_results in sorted(results["cases"].items()):
+        for line in format_case(case_name, case_results):
+            print(line)
+
+    if output is not None:
+        with open(output, "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+
+def report_comparisons(args, compare_results, format_comparison):
+    """Compare the results of the files given to the compare command.
+
+    The compare function returns a list of comparisons whose last item
+    indicates if the case regressed, and the format function returns the line
+    that is printed for a comparison. Returns the exit status of the command,
+    which is 1 if any case regressed.
+    """
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.current) as current_file:
+        current = json.load(current_file)
+
+    regression_count = 0
+    for comparison in compare_results(baseline, current, args.threshold):
+        regression_count += comparison[-1]
+        print(format_comparison(comparison) + ("   REGRESSION" if comparison[-1] else ""))
+
+    return 1 if regression_count else 0
@@ -0,0 +1,158 @@
+"""
+Scaling benchmark for the build pipeline of BlockDiagram objects.
+
+The harness creates synthetic diagrams (see synthetic.py) of increasing sizes
+and times each phase of BlockDiagram.build separately:
+
+    - construct: creating the components and registering their names.
+    - verify_properties: checking the properties of every component.
+    - setup: passing the default parameters to the components.
+    - organize: finding the order of execution and the sample times.
+    - generate_code_string: generating the code of every component.
+    - create_code: joining, compiling and executing the diagram's code.
+
+For every phase, the growth exponent between two consecutive sizes is
+reported (about 1 for a phase that scales linearly), so it's easy to see which
+phase goes superlinear and at what size:
+
+    python benchmarks/build_bench.py -t chain tree dag -s 100 1000 10000 100000
+
+If a phase fails (e.g. with a RecursionError), the error is reported and the
+larger sizes of that topology are skipped.
+"""
+
+import gc
+import sys
+import json
+import math
+import time
+import argparse
+
+from pyrunner.runners import executors
+
+from synthetic import TOPOLOGIES, generate_diagram
+
+
+PHASES = ("construct", "verify_properties", "setup", "organize", "generate_code_string", "create_code")
+
+DEFAULT_SIZES = (100, 1000, 10000)  # Amount of components of the generated diagrams
+SUPERLINEAR_EXPONENT = 1.2  # Growth exponents above this are flagged as superlinear
+
+
+def time_build(size, topology="dag", fan_in=2, feedback=0.0, seed=0):
+    """Build a synthetic diagram and time each phase of the build.
+
+    Returns a dictionary that maps the phases to their times (in seconds.) If
+    a phase fails, the times of the phases before it are returned along with
+    the error under the "error" key.
+    """
+
+    name = "{}_{}_build_bench".format(topology, size)
+    executors._POOL.pop(name, None)  # Allow timing the same diagram more than once
+
+    diagram = None
+    phases = {
+        "construct": lambda: generate_diagram(name, size, topology, fan_in, feedback, seed),
+        "verify_properties": lambda: diagram.verify_properties(),
+        "setup": lambda: diagram.setup(),
+        "organize": lambda: _organize(diagram),
+        "generate_code_string": lambda: diagram.generate_code_string(),
+        "create_code": lambda: diagram.runner.Builder.create_code([diagram], namespace={}),
+    }
+
+    times = {}
+    gc.collect()
+    try:
+        for phase in PHASES:
+            start = time.perf_counter()
+            result = phases[phase]()
+            times[phase] = time.perf_counter() - start
+            if phase == "construct":
+                diagram = result
+    except Exception as error:
+        times["error"] = "{} in {}: {}".format(type(error).__name__, phase, error)
+    finally:
+        executors._POOL.pop(name, None)
+        if diagram is not None:  # Let the diagram be garbage collected
+            diagram._DIAGRAMS.remove(diagram)
+
+    return times
+
+
+def _organize(diagram):
+
+    diagram.organize()
+    diagram.sample_times = {}
+    diagram.organizer.propagate_sample_times(diagram.sample_times)
+
+
+def get_growth_exponents(sizes, times):
+    """Compute how fast each phase grows between consecutive sizes.
+
+    The exponent k between two sizes satisfies t2 / t1 = (n2 / n1) ** k.
+    Returns a list with a dictionary of exponents per pair of sizes.
+    """
+
+    exponents = []
+    for (size_1, times_1), (size_2, times_2) in zip(zip(sizes, times), zip(sizes[1:], times[1:])):
+        pair_exponents = {}
+        for phase in PHASES:
+            if times_1.get(phase) and times_2.get(phase):
+                pair_exponents[phase] = math.log(times_2[phase] / times_1[phase]) / math.log(size_2 / size_1)
+        exponents.append(pair_exponents)
+
+    return exponents
+
+
+def _print_report(topology, sizes, times):
+
+    print("{} topology".format(topology))
+    print("{:>10}".format("size") + "".join("{:>22}".format(phase) for phase in PHASES))
+    for size, size_times in zip(sizes, times):
+        print("{:>10}".format(size) + "".join("{:>21.4f}s".format(size_times[phase]) if phase in size_times else
+                                              "{:>22}".format("-") for phase in PHASES))
+        if "error" in size_times:
+            print("{:>10}  {}".format("", size_times["error"]))
+
+    for size, pair_exponents in zip(sizes[1:], get_growth_exponents(sizes, times)):
+        flags = "".join(" *" if pair_exponents.get(phase, 0) > SUPERLINEAR_EXPONENT else "  " for phase in PHASES)
+        print("{:>10}".format("k @" + str(size)) + "".join(
+            "{:>20.2f}{}".format(pair_exponents[phase], flags[2 * i:2 * i + 2]) if phase in pair_exponents else
+            "{:>22}".format("-") for i, phase in enumerate(PHASES)))
+    print("")
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("-t", "--topologies", nargs="+", choices=TOPOLOGIES, default=list(TOPOLOGIES),
+                        help="topologies of the generated diagrams")
+    parser.add_argument("-s", "--sizes", nargs="+", type=int, default=list(DEFAULT_SIZES),
+                        help="amount of components of the generated diagrams")
+    parser.add_argument("--fan-in", type=int, default=2, help="amount of inputs of the Sums")
+    parser.add_argument("--feedback", type=float, default=0.05,
+                        help="fraction of the dag components that close a feedback loop")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the dag generator")
+    parser.add_argument("-o", "--output", help="JSON file where the times are stored")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(args.sizes)
+    results = {}
+    for topology in args.topologies:
+        times = []
+        for size in sizes:
+            times.append(time_build(size, topology, args.fan_in, args.feedback, args.seed))
+            if "error" in times[-1]:  # Larger diagrams would fail as well
+                break
+        results[topology] = dict((str(size), size_times) for size, size_times in zip(sizes, times))
+        _print_report(topology, sizes[:len(times)], times)
+
+    if args.output is not None:
+        with open(args.output, "w") as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
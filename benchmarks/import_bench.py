@@ -0,0 +1,171 @@
+"""
+Cold-start benchmark for the imports of the package.
+
+Short-lived processes (like the workers of the mp runner) pay for the imports
+of the package every time they start, so each case times an import statement
+in a fresh interpreter. The cases cover:
+
+    - Importing the components package alone and with all of its components
+      (which creates every component class.)
+
+    - Importing the runner modules, which is what the generated code of a
+      diagram imports.
+
+Every case runs several times and the median and minimum times are stored as
+JSON, so the results of two runs can be compared:
+
+    python benchmarks/import_bench.py run -o baseline.json
+    python benchmarks/import_bench.py run -o current.json
+    python benchmarks/import_bench.py compare baseline.json current.json
+
+The run command can also list the modules that take the longest to import in
+each case (from Python's -X importtime option), to find what to defer.
+"""
+
+import os
+import sys
+import platform
+import statistics
+import subprocess
+from functools import partial
+
+import bench_cli
+
+
+DEFAULT_REPEATS = 10  # Amount of fresh interpreters per case
+DEFAULT_THRESHOLD = 0.1  # Relative change that counts as a regression
+
+CASES = {
+    "components": "import pyrunner.components",
+    "components_all": "from pyrunner.components import *",
+    "component_classes": "import pyrunner.components.math_op, pyrunner.components.continuous, "
+                         "pyrunner.components.systems, pyrunner.components.sources, "
+                         "pyrunner.components.signal_routers",
+    "seq_runner": "import pyrunner.runners.seq_runner",
+    "mp_runner": "import pyrunner.runners.mp_runner",
+}
+
+# Code that times an import statement in the child interpreter
+_TIMER = "import time; _start = time.perf_counter(); {}; print(time.perf_counter() - _start)"
+
+_ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Measurements
+
+def _run_child(args):
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [_ROOT_DIR, env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)  # Use the bytecode caches like a regular start would
+    result = subprocess.run([sys.executable] + args, env=env, cwd=_ROOT_DIR, capture_output=True, text=True,
+                            check=True)
+    return result
+
+
+def run_case(case_name, repeats=DEFAULT_REPEATS):
+    """Time the import statement of a case in fresh interpreters.
+
+    Returns a dictionary with the median and minimum times (in milliseconds)
+    of the case. The first run is discarded, since it might write the bytecode
+    caches.
+    """
+
+    statement = CASES[case_name]
+    times = []
+    for _ in range(repeats + 1):
+        times.append(float(_run_child(["-c", _TIMER.format(statement)]).stdout) * 1e3)
+
+    return {"repeats": repeats, "median_ms": statistics.median(times[1:]), "min_ms": min(times[1:])}
+
+
+def get_slowest_imports(case_name, count=10):
+    """Return the modules that take the longest to import in a case.
+
+    Returns a list of pairs with the module names and their cumulative import
+    times (in milliseconds), which include the times of the modules they
+    import.
+    """
+
+    stderr = _run_child(["-X", "importtime", "-c", CASES[case_name]]).stderr
+    imports = []
+    for line in stderr.splitlines():
+        fields = line.split("|")
+        if len(fields) == 3 and fields[1].strip().isdigit():
+            imports.append((fields[2].strip(), int(fields[1]) / 1e3))
+
+    return sorted(imports, key=lambda module_time: module_time[1], reverse=True)[:count]
+
+
+def run_benchmarks(case_names=None, repeats=DEFAULT_REPEATS):
+    """Run the given cases (all of them by default) and return their results
+    with some information about the environment.
+    """
+
+    case_names = sorted(CASES) if case_names is None else case_names
+    return {
+        "python": platform.python_version(),
+        "cases": dict((case_name, run_case(case_name, repeats)) for case_name in case_names)
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare two sets of results.
+
+    A case regresses if its median time rose by more than the threshold
+    (relative to the baseline.) Returns a list with the comparison of every
+    case in both sets and whether it regressed.
+    """
+
+    comparisons = []
+    for case_name in sorted(set(baseline["cases"]) & set(current["cases"])):
+        change = current["cases"][case_name]["median_ms"] / baseline["cases"][case_name]["median_ms"] - 1
+        comparisons.append((case_name, change, change > threshold))
+
+    return comparisons
+
+
+# Command line interface
+
+def _format_case(case_name, case_results, details=False):
+
+    lines = ["{:<18} median {:>8.2f} ms   min {:>8.2f} ms".format(
+        case_name, case_results["median_ms"], case_results["min_ms"])]
+    if details:
+        for module_name, module_time in get_slowest_imports(case_name):
+            lines.append("{:<18} {:>8.2f} ms   {}".format("", module_time, module_name))
+    return lines
+
+
+def _format_comparison(comparison):
+
+    case_name, change, _ = comparison
+    return "{:<18} median {:>+7.1%}".format(case_name, change)
+
+
+def _run_command(args):
+
+    results = run_benchmarks(args.cases, args.repeats)
+    bench_cli.report_results(results, partial(_format_case, details=args.details), args.output)
+    return 0
+
+
+def _compare_command(args):
+
+    return bench_cli.report_comparisons(args, compare_results, _format_comparison)
+
+
+def main(argv=None):
+
+    parser, run_parser = bench_cli.create_parser(__doc__.split("\n\n")[0].strip(), CASES, DEFAULT_THRESHOLD,
+                                                 _run_command, _compare_command)
+    run_parser.add_argument("-r", "--repeats", type=int, default=DEFAULT_REPEATS,
+                            help="amount of fresh interpreters per case")
+    run_parser.add_argument("-d", "--details", action="store_true", help="list the slowest imports of each case")
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
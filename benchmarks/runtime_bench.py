@@ -0,0 +1,202 @@
+"""
+Runtime throughput benchmarks for the generated executors.
+
+Each benchmark case builds a representative diagram through BlockDiagram.build
+and times the steps of its executor with executors.run. The cases cover:
+
+    - Wide fan-ins, where a single Sum component adds many inputs.
+
+    - Deep chains, where many Abs components are evaluated one after another.
+
+    - Scalar and array signals for both of the above, since the cost of a step
+      with small arrays is dominated by NumPy's call overhead.
+
+For every case, the throughput (steps per second) and the latency percentiles
+of a single step are stored as JSON, so the results of two runs can be
+compared:
+
+    python benchmarks/runtime_bench.py run -o baseline.json
+    python benchmarks/runtime_bench.py run -o current.json
+    python benchmarks/runtime_bench.py compare baseline.json current.json
+
+The compare command exits with a non-zero status if any case regressed by more
+than the given threshold.
+"""
+
+import sys
+import time
+import platform
+
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+import bench_cli
+
+
+DEFAULT_STEPS = 20000  # Amount of timed steps per case
+DEFAULT_WARM_UP = 1000  # Amount of steps that run before the timed steps
+DEFAULT_THRESHOLD = 0.1  # Relative change that counts as a regression
+
+PERCENTILES = (50, 90, 99)  # Latency percentiles that are recorded per case
+
+_ARRAY_SIZE = 64  # Length of the array signals
+
+
+# Benchmark diagrams
+
+def _create_fan_in_diagram(name, width, value):
+    """Diagram where a single Sum component adds all of its inputs."""
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    tags = [signal_routers.Tag(diagram, "x_{}".format(i)) for i in range(width)]
+    adder = math_op.Sum(diagram, comp_signs="+-" * (width // 2) + "+" * (width % 2))
+    adder.inputs.add(*tags)
+
+    diagram.inputs.add(*tags)
+    diagram.outputs.add(adder)
+
+    return diagram, dict((tag.name, value) for tag in tags)
+
+
+def _create_chain_diagram(name, depth, value):
+    """Diagram where every Abs component reads the previous one."""
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    prev_comp = x
+    for _ in range(depth):
+        absolute = math_op.Abs(diagram)
+        absolute.inputs.add(input=prev_comp)
+        prev_comp = absolute
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(prev_comp)
+
+    return diagram, {"x": value}
+
+
+CASES = {
+    "sum_fan_in_scalar": (_create_fan_in_diagram, 64, -1.5),
+    "sum_fan_in_array": (_create_fan_in_diagram, 64, np.linspace(-1.0, 1.0, _ARRAY_SIZE)),
+    "abs_chain_scalar": (_create_chain_diagram, 64, -1.5),
+    "abs_chain_array": (_create_chain_diagram, 64, np.linspace(-1.0, 1.0, _ARRAY_SIZE)),
+}
+
+
+# Measurements
+
+def run_case(case_name, steps=DEFAULT_STEPS, warm_up=DEFAULT_WARM_UP, **build_options):
+    """Build the diagram of a case and time the steps of its executor.
+
+    Returns a dictionary with the throughput and the latency percentiles (in
+    microseconds) of the case.
+    """
+
+    create_diagram, size, value = CASES[case_name]
+    system_name = "{}_bench".format(case_name)
+    executors._POOL.pop(system_name, None)  # Allow running the same case more than once
+
+    diagram, inputs = create_diagram(system_name, size, value)
+    diagram.build(**build_options)
+
+    for _ in range(warm_up):
+        executors.run(system_name, inputs)
+
+    latencies = np.empty(steps)
+    perf_counter_ns = time.perf_counter_ns
+    for i in range(steps):
+        start = perf_counter_ns()
+        executors.run(system_name, inputs)
+        latencies[i] = perf_counter_ns() - start
+
+    total_time = latencies.sum() / 1e9
+    results = {"steps": steps, "steps_per_sec": steps / total_time}
+    for percentile, latency in zip(PERCENTILES, np.percentile(latencies, PERCENTILES)):
+        results["p{}_us".format(percentile)] = latency / 1e3
+
+    return results
+
+
+def run_benchmarks(case_names=None, steps=DEFAULT_STEPS, warm_up=DEFAULT_WARM_UP, **build_options):
+    """Run the given cases (all of them by default) and return their results
+    with some information about the environment.
+    """
+
+    case_names = sorted(CASES) if case_names is None else case_names
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "build_options": build_options,
+        "cases": dict((case_name, run_case(case_name, steps, warm_up, **build_options)) for case_name in case_names)
+    }
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare two sets of results.
+
+    A case regresses if its throughput dropped or its median latency rose by
+    more than the threshold (relative to the baseline.) Returns a list with
+    the comparison of every case in both sets and whether it regressed.
+    """
+
+    comparisons = []
+    for case_name in sorted(set(baseline["cases"]) & set(current["cases"])):
+        base_case = baseline["cases"][case_name]
+        curr_case = current["cases"][case_name]
+
+        throughput_change = curr_case["steps_per_sec"] / base_case["steps_per_sec"] - 1
+        latency_change = curr_case["p50_us"] / base_case["p50_us"] - 1
+        regressed = throughput_change < -threshold or latency_change > threshold
+        comparisons.append((case_name, throughput_change, latency_change, regressed))
+
+    return comparisons
+
+
+# Command line interface
+
+def _format_case(case_name, case_results):
+
+    return ["{:<20} {:>12.0f} steps/s   p50 {:>8.2f} us   p90 {:>8.2f} us   p99 {:>8.2f} us".format(
+        case_name, case_results["steps_per_sec"], case_results["p50_us"], case_results["p90_us"],
+        case_results["p99_us"])]
+
+
+def _format_comparison(comparison):
+
+    case_name, throughput_change, latency_change, _ = comparison
+    return "{:<20} throughput {:>+7.1%}   p50 latency {:>+7.1%}".format(case_name, throughput_change, latency_change)
+
+
+def _run_command(args):
+
+    results = run_benchmarks(args.cases, args.steps, args.warm_up, prune=args.prune,
+                             fold_constants=args.fold_constants, share_exprs=args.share_exprs,
+                             preallocate=args.preallocate)
+    bench_cli.report_results(results, _format_case, args.output)
+    return 0
+
+
+def _compare_command(args):
+
+    return bench_cli.report_comparisons(args, compare_results, _format_comparison)
+
+
+def main(argv=None):
+
+    parser, run_parser = bench_cli.create_parser(__doc__.split("\n\n")[0].strip(), CASES, DEFAULT_THRESHOLD,
+                                                 _run_command, _compare_command)
+    run_parser.add_argument("--steps", type=int, default=DEFAULT_STEPS, help="amount of timed steps per case")
+    run_parser.add_argument("--warm-up", type=int, default=DEFAULT_WARM_UP, help="amount of untimed steps per case")
+    for option in ("prune", "fold-constants", "share-exprs", "preallocate"):
+        run_parser.add_argument("--" + option, action="store_true", help="build with {}".format(option))
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Generator of synthetic BlockDiagram objects for the benchmarks.
+
+The diagrams are only meant to stress the build pipeline, so they are built
+from the simplest components (Tags, Constants, Sums and Abs) in one of the
+following topologies:
+
+    - chain: every component reads the previous one, so the diagram is as deep
+      as it is large.
+
+    - tree: Sums reduce a layer of Constants until a single value is left, so
+      the depth of the diagram grows with the logarithm of its size.
+
+    - dag: every component reads a few random components that were created
+      before it. Optionally, some components read a later component through an
+      Integrator, which creates feedback loops that the organizer must cut at
+      the non-direct feedthrough component.
+
+The generator is seeded, so the same arguments always give the same diagram.
+"""
+
+import random
+
+from pyrunner.components import *
+
+
+TOPOLOGIES = ("chain", "tree", "dag")
+
+
+def generate_diagram(name, size, topology="dag", fan_in=2, feedback=0.0, seed=0):
+    """Create a diagram with about size components in the given topology.
+
+    fan_in is the amount of inputs of the Sums in the tree and dag topologies
+    and feedback is the fraction of the components in the dag topology that
+    read a later component through an Integrator.
+    """
+
+    if topology not in TOPOLOGIES:
+        raise ValueError('The topology "{}" is not one of {}.'.format(topology, TOPOLOGIES))
+    if fan_in < 2:
+        raise ValueError("The fan in of the diagram must be at least 2.")
+
+    diagram = systems.BlockDiagram(name, "seq")
+    if topology == "chain":
+        _generate_chain(diagram, size)
+    elif topology == "tree":
+        _generate_tree(diagram, size, fan_in)
+    else:
+        _generate_dag(diagram, size, fan_in, feedback, random.Random(seed))
+
+    return diagram
+
+
+def _generate_chain(diagram, size):
+
+    x = signal_routers.Tag(diagram, "x")
+    prev_comp = x
+    for _ in range(size - 1):
+        absolute = math_op.Abs(diagram)
+        absolute.inputs.add(input=prev_comp)
+        prev_comp = absolute
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(prev_comp)
+
+
+def _generate_tree(diagram, size, fan_in):
+
+    # A tree with n leaves has about n / (fan_in - 1) Sums on top of them
+    leaf_count = max(1, size * (fan_in - 1) // fan_in)
+    layer = [sources.Constant(diagram, value=i) for i in range(leaf_count)]
+    while len(layer) > 1:
+        next_layer = []
+        for start in range(0, len(layer), fan_in):
+            group = layer[start:start + fan_in]
+            adder = math_op.Sum(diagram, comp_signs="+" * len(group))
+            adder.inputs.add(*group)
+            next_layer.append(adder)
+        layer = next_layer
+
+    diagram.outputs.add(layer[0])
+
+
+def _generate_dag(diagram, size, fan_in, feedback, rng):
+
+    source_count = max(1, min(fan_in, size // 10))
+    tags = [signal_routers.Tag(diagram, "x_{}".format(i)) for i in range(source_count)]
+    comps = list(tags)
+    pending_loops = []  # Integrators whose inputs are components that have not been created yet
+    while len(comps) < size:
+        if pending_loops and pending_loops[0][1] <= len(comps):
+            integrator = pending_loops.pop(0)[0]
+            integrator.inputs.add(input=comps[-1])
+
+        if rng.random() < feedback:
+            integrator = continuous.Integrator(diagram)
+            pending_loops.append((integrator, len(comps) + rng.randint(1, fan_in * 4)))
+            comps.append(integrator)
+            continue
+
+        inputs = [comps[index] for index in rng.sample(range(len(comps)), min(fan_in, len(comps)))]
+        if len(inputs) == 1:
+            comp = math_op.Abs(diagram)
+            comp.inputs.add(input=inputs[0])
+        else:
+            comp = math_op.Sum(diagram, comp_signs="".join(rng.choice("+-") for _ in inputs))
+            comp.inputs.add(*inputs)
+        comps.append(comp)
+
+    for integrator, _ in pending_loops:  # Close the loops that were left open with the last component
+        integrator.inputs.add(input=comps[-1])
+
+    diagram.inputs.add(*tags)
+    diagram.outputs.add(comps[-1])
@@ -1,15 +1,51 @@
 """
 This package contains all the components of the Simupynk system.
+
+The subpackages are imported the first time they (or one of the names they
+export) are accessed through this package, so importing it is cheap and only
+the components that are used are loaded.
 """
 
 __all__ = ["math_op",
+           "continuous",
            "sources",
            "systems",
            "base_comp",
            "signal_routers"]
 
-from .math_op import *
-from .systems import *
-from .sources import *
-from .base_comp import *
-from .signal_routers import *
+
+import importlib
+
+
+# Names that are exported by the subpackages and the subpackage that holds them
+_EXPORTS = {"Sum": "math_op",
+            "Integrator": "continuous",
+            "StateSpace": "continuous",
+            "StateVector": "continuous",
+            "BlockDiagram": "systems",
+            "BaseSystem": "systems",
+            "BaseSubsystem": "systems",
+            "diagram": "systems",
+            "base_sys": "systems",
+            "Constant": "sources",
+            "BaseComponent": "base_comp",
+            "generate_prop_info": "base_comp",
+            "generate_default_name": "base_comp",
+            "generate_direct_feedthrough": "base_comp",
+            "Tag": "signal_routers"}
+
+
+def __getattr__(name):
+
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)  # Importing it sets it as an attribute of the package
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module("." + _EXPORTS[name], __name__), name)
+        globals()[name] = value  # Skip this function on the next lookups
+        return value
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
+
+def __dir__():
+
+    return sorted(set(globals()) | set(__all__) | set(_EXPORTS))
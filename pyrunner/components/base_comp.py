@@ -10,6 +10,7 @@ __all__ = ["BaseComponent",
 
 import re
 from functools import wraps
+from collections.abc import Mapping, MutableMapping, ItemsView, ValuesView
 from abc import abstractmethod
 
 from ..utils.mixins import CPEnabledTypeABC
@@ -33,8 +34,16 @@ class BaseComponent(CPEnabledTypeABC):
     component uses a third-party library, then the code will not generate the
     required import statement and the generated code will raise an error
     related to this.
+
+    The components are slotted (they have no instance dictionary), since a
+    diagram can hold a large amount of them. Components that need additional
+    attributes must declare them in their own __slots__ attribute, otherwise
+    they get an instance dictionary like any other class.
     """
 
+    __slots__ = ("sys", "is_not_mapped", "code_str", "_lib_deps", "_sample_time", "_referrers", "_inputs", "_outputs",
+                 "_parameters", "_name")
+
     def __init__(self, sys_obj, name=None, **parameters):
 
         self.sys = sys_obj  # System that contains object
@@ -42,12 +51,15 @@ class BaseComponent(CPEnabledTypeABC):
         self.code_str = {"Set Up": None, "Execution": None}  # Storage for generated code string
 
         self._lib_deps = None  # Library dependencies for the component
+        self._sample_time = None  # Amount of steps between the component's evaluations (None means inherited)
+        self._referrers = {"inputs": {}, "outputs": {}}  # Components that reference this one (and how many times)
         self._create_properties()
         self._name = sys_obj.register_component_name(self, name)  # Name of the component
 
         self.parameters.add(**parameters)  # Add any parameters that were specified in the constructor
         if not self.is_block_diagram():
             sys_obj.comps.append(self)  # Add component to system component
+            self.mark_dirty(reorder=True)
 
     def __repr__(self):
 
@@ -78,6 +90,39 @@ class BaseComponent(CPEnabledTypeABC):
     def generate_code_string(self):
         """Create the code for the component."""
 
+    def collect_bindings(self):
+        """Bind the objects that the component's code refers to by name.
+
+        Objects that cannot be written as code (like large arrays) are passed
+        to the bind method of the component's diagram, which places them in
+        the namespace of the generated code. This is called before the code
+        of the diagram is generated and when cached code is loaded instead.
+        By default, the component does not bind anything.
+        """
+
+    def generate_buffered_code_string(self, buffer_name):
+        """Create the execution code that writes the component's value into
+        the given buffer variable.
+
+        This is used when a diagram is built with preallocated buffers. The
+        buffer variable holds None when the value cannot be written into a
+        buffer, so the code must compute the value as usual in that case. By
+        default, it returns None, which means the component does not support
+        buffers.
+        """
+
+        return None
+
+    @property
+    def consumers(self):
+        """Components that use the component as one of their inputs.
+
+        This is kept up to date by the component properties, so finding the
+        consumers of a component does not require a search over the system.
+        """
+
+        return list(self._referrers["inputs"])
+
     @property
     def inputs(self):  # TODO: Elaborate more on how inputs work
         """Inputs for the component."""
@@ -138,6 +183,35 @@ class BaseComponent(CPEnabledTypeABC):
 
         return self._outputs
 
+    @property
+    def sample_time(self):
+        """Amount of steps between each evaluation of the component.
+
+        A component with a sample time of n is evaluated on the first step
+        and every n steps after it. Between these steps, its value is held.
+        By default, it's None, which means the component inherits the sample
+        time of its inputs (the greatest common divisor of their sample times)
+        when the diagram is built. A component without inputs is evaluated on
+        every step.
+
+        The sample times of a component and its inputs must be multiples of
+        each other, so the steps where a slower component is evaluated always
+        match the steps where the faster one is evaluated.
+        """
+
+        return self._sample_time
+
+    @sample_time.setter
+    def sample_time(self, sample_time):
+
+        if sample_time is not None:
+            if isinstance(sample_time, bool) or not isinstance(sample_time, int):
+                raise TypeError("The sample time must be an integer or None.")
+            if sample_time <= 0:
+                raise ValueError("The sample time must be a positive integer.")
+        self._sample_time = sample_time
+        self.mark_dirty()
+
     @property
     def parameters(self):  # TODO: Elaborate more on how parameters work
         """Parameters used for calculations in the system."""
@@ -154,6 +228,18 @@ class BaseComponent(CPEnabledTypeABC):
 
         return hasattr(self, "comps")
 
+    def mark_dirty(self, reorder=False):
+        """Flag the component as changed since the last build of its diagram.
+
+        Incremental builds only regenerate the code of the flagged components
+        and the components that depend on them. If reorder is True, the
+        change also affects the order of execution (e.g. an input was added.)
+        The component properties flag their component when they are modified,
+        so this only needs to be called for changes made by other means.
+        """
+
+        self.sys.diagram.mark_component_dirty(self, reorder)
+
     def generate_name(self):
         """Generates a name for a component.
 
@@ -216,7 +302,7 @@ class BaseComponent(CPEnabledTypeABC):
         """Create input, output, and parameter component properties."""
 
         for prop_name, prop_info in self.prop_info.items():
-            setattr(self, "_" + prop_name, _ComponentProperty.init(prop_name, prop_info))
+            setattr(self, "_" + prop_name, _ComponentProperty.init(prop_name, prop_info, self))
 
     def _gather_imports(self):
 
@@ -294,7 +380,7 @@ def _detect_invalid_key_entry(func):
 
         self = args[0]
         try:
-            func(*args)
+            return func(*args)
         except KeyError:
             raise KeyError("Item could not be deleted. You either entered an invalid key " +
                            "or the {}s are empty.".format(self.prop_name))
@@ -316,7 +402,19 @@ def _block_outside_modification(func):
     return block_wrapper
 
 
-class _ComponentProperty(dict):
+class _PropertyValuesView(ValuesView):
+
+    def __iter__(self):
+        return iter(self._mapping._values)
+
+
+class _PropertyItemsView(ItemsView):
+
+    def __iter__(self):
+        return zip(self._mapping, self._mapping._values)
+
+
+class _ComponentProperty(MutableMapping):
     """A class for storing and mapping component properties such as
     inputs, outputs, and parameters (for calculations.)
 
@@ -365,8 +463,6 @@ class _ComponentProperty(dict):
 
         - Original property:
 
-            key_gen_count = n + 1
-
             {(prop_name 1, value 1),
              ...,
              (prop_name i, value i),
@@ -375,72 +471,95 @@ class _ComponentProperty(dict):
 
         - Delete (prop_name i, value i):
 
-            key_gen_count = n  <- This is adjusted so the new generated value has the key "prop_name n"
-
-            {...,
-            (prop_name i-1, value i-1), (prop_name i+1, value i+1),
-            ...,
-            (prop_name n, value n)}
-
-        - Pass entry values to the left (The subsequent steps are skipped if i = key_gen_count):
-
-            key_gen_count = n
-
-            {(prop_name 1, value 1),
-            ...,
-            (prop_name i-1, value i-1), (prop_name i, value i+1),
-            ...,
-            (prop_name n-1, value n), (prop_name n, value n)}
-
-        - Delete the nth entry:
-
-            key_gen_count = n
-
             {(prop_name 1, value 1),
             ...,
             (prop_name i-1, value i-1), (prop_name i, value i+1),
             ...,
             (prop_name n-1, value n)}
 
-      The resulting dictionary has n-1 items. Notice the key "prop_name i"
+      The resulting property has n-1 items. Notice the key "prop_name i"
       reappears, but it now has the value of the next item entry of the
-      original dictionary. These steps result in a "left shift" of the
+      original property. These steps result in a "left shift" of the
       values.
+
+    The values are stored in a list, where each key has a slot (its index in
+    the list). The slot of an order-invariant key is its index minus one and
+    the slots of an order-dependent property are given by the order of its
+    variables, so deleting an item is a single deletion in the list and the
+    order-dependent properties of the same variables share their slots.
     """
 
+    __slots__ = ("prop_name", "owner", "is_order_invariant", "_within_method", "_slots", "_values")
+
     _ALLOWED_TYPES = {"inputs": (BaseComponent, type(None)),
                       "outputs": (BaseComponent, type(None)),
                       "parameters": object}
 
+    # Generated key format for order-invariant properties (the group is the key index)
+    _KEY_REGEXES = {"inputs": re.compile("inputs_([1-9][0-9]*)"),
+                    "outputs": re.compile("outputs_([1-9][0-9]*)"),
+                    "parameters": re.compile("parameters_([1-9][0-9]*)")}
+
+    _SLOTS = {}  # Maps the variables of order-dependent properties to the slots of the variables
+
     # Component property initialization
 
-    def __init__(self, new_dict, prop_name, prop_info):
+    def __init__(self, prop_name, prop_info, owner=None):
+
+        # Verify if prop name is a valid property
+        if prop_name not in self._ALLOWED_TYPES:
+            raise NameError("'{}' is not a valid component property.".format(prop_name))
 
         self.prop_name = prop_name  # Property name
+        self.owner = owner  # Component that has the property (it's flagged as dirty when the property changes)
         self._within_method = False  # Verify if the object is being modified within a method
         if prop_info is None:
-            self._key_gen_count = 1
             self.is_order_invariant = True
+            self._slots = None
+            self._values = []
         else:
             self.is_order_invariant = False
+            variables = tuple(prop_info[1])
+            if variables not in self._SLOTS:
+                self._SLOTS[variables] = dict((variable, slot) for slot, variable in enumerate(variables))
+            self._slots = self._SLOTS[variables]  # Maps each variable to its slot in the values
+            self._values = [None] * len(variables)
 
-        super(_ComponentProperty, self).__init__(new_dict)
+    def __contains__(self, key):
 
-        # Verify if prop name is a valid property
-        if prop_name not in self._ALLOWED_TYPES:
-            raise NameError("'{}' is not a valid component property.".format(prop_name))
+        try:
+            self._get_slot(key)
+        except KeyError:
+            return False
+        return True
 
     @_block_outside_modification
     @_non_erasable_order_dependent_method
     def __delitem__(self, key):
 
-        if re.match(self.prop_name + "_[1-9][0-9]*", key):  # If it matches generated key format
-            self._key_gen_count -= 1  # Adjust key generator count for the next generated key
-            super(_ComponentProperty, self).__delitem__(key)
-            self._shift_values_to_the_left(key)
-        else:
+        if self._KEY_REGEXES[self.prop_name].fullmatch(key) is None:  # If it doesn't match generated key format
             raise KeyError("{} does not match the generated key format of this class. ".format(key) +
                            "You can check the available keys with the show_variables method.")
+        self._delete_slot(self._get_slot(key))
+
+    def __getitem__(self, key):
+
+        return self._values[self._get_slot(key)]
+
+    def __iter__(self):
+
+        if self.is_order_invariant:
+            prop_name = self.prop_name + "_{}"
+            return (prop_name.format(i) for i in range(1, len(self._values) + 1))
+        return iter(self._slots)
+
+    def __len__(self):
+
+        return len(self._values)
+
+    def __repr__(self):
+
+        return repr(dict(self.items()))
 
     @_block_outside_modification
     def __setitem__(self, key, value):
@@ -448,11 +567,21 @@ class _ComponentProperty(dict):
         self._check_key_type(key)
         self._check_value_type(value)
         if self.is_order_invariant:
-            self._check_for_key_generated_format(key)
+            slot = self._check_for_key_generated_format(key) - 1
+            if slot == len(self._values):  # The next generated key
+                self._values.append(None)
         else:
             self._check_if_key_is_in_defined_variables(key)
+            slot = self._slots[key]
 
-        super(_ComponentProperty, self).__setitem__(key, value)
+        self._set_slot(slot, value)
+        self._mark_owner_dirty()
+
+    @property
+    def _key_gen_count(self):
+        """Index of the next generated key of an order-invariant property."""
+
+        return len(self._values) + 1
 
     def add(self, *args, **kwargs):
         """Add value(s) to the component property.
@@ -465,18 +594,20 @@ class _ComponentProperty(dict):
         component.
         """
 
-        self._within_method = True
-
-        # Add item(s)
-        if self.is_order_invariant:
-            for value in args:
-                self[self.prop_name + "_{}".format(self._key_gen_count)] = value
-                self._key_gen_count += 1
+        if self.is_order_invariant:  # The next keys are generated for the values
+            for value in args:  # Nothing is added if any value is invalid
+                self._check_value_type(value)
+            key_format = self.prop_name + "_{}"
+            items = [(key_format.format(index), value) for index, value in enumerate(args, self._key_gen_count)]
         else:
-            for key, value in kwargs.items():
-                self[key] = value
+            items = kwargs.items()
 
-        self._within_method = False
+        self._within_method = True
+        try:
+            for key, value in items:
+                self[key] = value
+        finally:
+            self._within_method = False
 
     @_non_erasable_order_dependent_method
     def clear(self):
@@ -485,8 +616,10 @@ class _ComponentProperty(dict):
         This only works for order-invariant components.
         """
 
-        super(_ComponentProperty, self).clear()
-        self._key_gen_count = 1
+        for value in self._values:
+            self._track_reference(value, -1)
+        self._values.clear()
+        self._mark_owner_dirty()
 
     def get_prop_variables(self):
         """Display all the variables of the component property."""
@@ -494,19 +627,22 @@ class _ComponentProperty(dict):
         return list(self)
 
     @staticmethod
-    def init(prop_name, prop_info):
+    def init(prop_name, prop_info, owner=None):
         """Shorthand constructor for initializing component properties."""
 
-        if prop_info is None:
-            return _ComponentProperty({}, prop_name, prop_info)
-        return _ComponentProperty({prop_name: None for prop_name in prop_info[1]}, prop_name, prop_info)
+        return _ComponentProperty(prop_name, prop_info, owner)
 
     def has_correct_value_types(self):
 
         allowed_types = self._ALLOWED_TYPES[self.prop_name]
-        return all(isinstance(value, allowed_types) for value in self.values())
+        return all(isinstance(value, allowed_types) for value in self._values)
+
+    def items(self):
+
+        return _PropertyItemsView(self)
 
     @_detect_invalid_key_entry
+    @_non_erasable_order_dependent_method
     def pop(self, key):
         """Remove the specified entry and return its value.
 
@@ -514,13 +650,12 @@ class _ComponentProperty(dict):
         The last key will be deleted and from the chosen key onwards
         """
 
-        self._within_method = True
-
-        # Pop the specified entry
         value = self[key]
-        del self[key]
-
-        self._within_method = False
+        self._within_method = True
+        try:
+            del self[key]
+        finally:
+            self._within_method = False
         return value
 
     @_detect_invalid_key_entry
@@ -528,30 +663,30 @@ class _ComponentProperty(dict):
     def popitem(self):
         """Remove and return last generated key entry."""
 
+        key = self.prop_name + "_{}".format(len(self._values))
+        item = (key, self[key])
         self._within_method = True
-
-        # Pop the item
-        prop_name = self.prop_name + "_{}".format(self._key_gen_count - 1)
-        item = (prop_name, self[prop_name])
-        del self[prop_name]
-
-        self._within_method = False
+        try:
+            del self[key]
+        finally:
+            self._within_method = False
         return item
 
     def remove(self, value):
         """Remove the given value from the property."""
 
-        self._within_method = True
-
-        # Remove the component
-        for key, prop_comp in self.copy().items():
-            if prop_comp == value:
-                if self.is_order_invariant:
-                    del self[key]
-                else:
-                    self[key] = None
+        removed_slots = set(slot for slot, prop_value in enumerate(self._values) if prop_value == value)
+        if not removed_slots:
+            return
 
-        self._within_method = False
+        for slot in removed_slots:
+            self._track_reference(self._values[slot], -1)
+        if self.is_order_invariant:  # Remove the values in a single pass instead of shifting them once per value
+            self._values[:] = [prop_value for slot, prop_value in enumerate(self._values) if slot not in removed_slots]
+        else:
+            for slot in removed_slots:
+                self._values[slot] = None
+        self._mark_owner_dirty()
 
     def sort(self):
         """Returns an ordered list of values of an order-invariant property.
@@ -565,20 +700,24 @@ class _ComponentProperty(dict):
         """
 
         if self.is_order_invariant:
-            return [self[self.prop_name + "_{}".format(i)] for i in range(1, self._key_gen_count)]
+            return list(self._values)
         raise AttributeError("Order-dependent component properties do not need to be organized."
                              " Extract the relevant value by using its key/variable.")
 
     def update(self, update_dict=None, **kwargs):
         """Update existing component property entries."""
 
-        if isinstance(update_dict, dict):
+        if isinstance(update_dict, Mapping):
             self._update(update_dict)
         elif not isinstance(update_dict, type(None)):
             raise TypeError('The argument "update_dict" must be a dictionary.')
 
         self._update(kwargs)
 
+    def values(self):
+
+        return _PropertyValuesView(self)
+
     @staticmethod
     def _check_key_type(key):
 
@@ -598,13 +737,14 @@ class _ComponentProperty(dict):
 
     def _check_for_key_generated_format(self, key):
 
-        generated_key_format = self.prop_name + "_[1-9][0-9]*"  # Generated key format for order-invariant property
-        if re.match(generated_key_format, key):
-            key_index = int(key.rsplit('_', 1)[1])
+        match = self._KEY_REGEXES[self.prop_name].fullmatch(key)
+        if match is not None:
+            key_index = int(match.group(1))
             if key_index > self._key_gen_count:  # Check if extracted key number is among the generated count
                 raise KeyError('The key "{}" belongs to a key that has not been generated.'.format(key) +
                                "Use the add method to register values or the show_variables "
                                "method to display the created keys.")
+            return key_index
         else:
             raise KeyError('"{}" does not match the format {self.prop_name}_#, which '.format(key) +
                            'is the one used to generate for order-invariant properties. '
@@ -613,28 +753,62 @@ class _ComponentProperty(dict):
 
     def _check_if_key_is_in_defined_variables(self, key):
 
-        if key not in self:
+        if key not in self._slots:
             if len(self) == 0:
                 raise KeyError("No entries are allowed for the component's {}s.".format(self.prop_name))
             raise KeyError('The variable "{}" is not among these variables: {}.'.format(key, ", ".join(self.keys())))
 
-    def _shift_values_to_the_left(self, key):
+    def _delete_slot(self, slot):
 
-        key_index = int(key.rsplit('_', 1)[1])
-        if key_index < self._key_gen_count:  # "Shift" old entries to the left if it wasn't the last entered
-            prop_name = self.prop_name + "_{}"
-            new_prop_entries = {prop_name.format(i): self[prop_name.format(i + 1)] for i in
-                                range(key_index, self._key_gen_count)}
+        self._track_reference(self._values.pop(slot), -1)  # The values after the slot are shifted to the left
+        self._mark_owner_dirty()
+
+    def _get_slot(self, key):
+        """Return the index of the given key's value."""
+
+        if self._slots is not None:
+            return self._slots[key]
+
+        match = self._KEY_REGEXES[self.prop_name].fullmatch(key) if isinstance(key, str) else None
+        if match is None or int(match.group(1)) > len(self._values):
+            raise KeyError(key)
+        return int(match.group(1)) - 1
+
+    def _mark_owner_dirty(self):
 
-            self[key] = new_prop_entries[key]  # Re-register the deleted key
-            self.update(new_prop_entries)  # Add the rest of the entries
-            super(_ComponentProperty, self).__delitem__(prop_name.format(self._key_gen_count))  # Delete last entry
+        if self.owner is not None:
+            self.owner.mark_dirty(reorder=self.prop_name != "parameters")
+
+    def _set_slot(self, slot, value):
+
+        self._track_reference(self._values[slot], -1)
+        self._values[slot] = value
+        self._track_reference(value, 1)
+
+    def _track_reference(self, value, count):
+        """Update the referrers of a component that is added to (count = 1)
+        or removed from (count = -1) the property.
+        """
+
+        if value is not None and self.owner is not None and self.prop_name != "parameters" and \
+                isinstance(value, BaseComponent):
+            referrers = value._referrers[self.prop_name]
+            ref_count = referrers.get(self.owner, 0) + count
+            if ref_count > 0:
+                referrers[self.owner] = ref_count
+            else:
+                referrers.pop(self.owner, None)
 
     def _update(self, kwargs):
 
         non_registered_keys = [key for key in kwargs if key not in self]  # List of invalid keys
         if len(non_registered_keys) == 0:  # If no invalid key was entered
-            super(_ComponentProperty, self).update(kwargs)
+            self._within_method = True
+            try:
+                for key, value in kwargs.items():
+                    self[key] = value
+            finally:
+                self._within_method = False
         else:
             raise KeyError("The keys '{}' are ".format(', '.join(non_registered_keys)) + \
                            "not among the registered keys: {}.".format(', '.join(self.keys())))
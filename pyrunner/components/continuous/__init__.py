@@ -0,0 +1,12 @@
+"""
+This package contains the continuous-time components and the state vector
+that holds their states while a diagram runs.
+"""
+
+__all__ = ["Integrator",
+           "StateSpace",
+           "StateVector"]
+
+from .integrator import Integrator
+from .state_space import StateSpace
+from .state_vector import StateVector
@@ -0,0 +1,68 @@
+"""
+This module holds the base class for continuous-time components.
+"""
+
+__all__ = ["BaseContinuous"]
+
+
+from abc import abstractmethod
+
+import numpy as np
+
+from .. import base_comp
+
+
+def _to_code(value):
+    """Write an array-like parameter as code that creates the array."""
+
+    return "np.array({!r})".format(np.asarray(value, dtype=float).tolist())
+
+
+class BaseContinuous(base_comp.BaseComponent):
+    """Base class for continuous-time components.
+
+    The states of these components are held in the state vector of their
+    diagram, which integrates them with the diagram's solver (see the
+    StateVector class). A continuous component only has to describe its block
+    of the state vector through the get_state_block method.
+
+    The output of a continuous component only depends on its states, so these
+    components are not direct feedthrough. Their outputs are computed by the
+    diagram at the start of every step, before any other component is
+    evaluated, which is why they only have Set Up code.
+    """
+
+    __slots__ = ("state_index",)
+
+    _LIB_DEPS = {"numpy": "np"}
+
+    def __init__(self, sys_obj, name=None, **parameters):
+
+        super(BaseContinuous, self).__init__(sys_obj, name, **parameters)
+
+        self.state_index = None  # Index of the component's block in the state vector (set by the diagram)
+        self._sample_time = 1  # The states change on every step
+        self._lib_deps = self._LIB_DEPS
+
+    @abstractmethod
+    def get_state_block(self):
+        """Return the initial states and the state, input and output matrices
+        of the component's block (see the StateVector class).
+
+        The matrices can be None.
+        """
+
+    def generate_code_string(self):
+
+        if self.state_index is None:  # The component is not evaluated
+            return
+
+        initial_state, state_matrix, input_matrix, output_matrix = self.get_state_block()
+
+        add_str = "_states.add({}, {}".format(self.state_index, _to_code(initial_state))
+        for matrix_name, matrix in (("state_matrix", state_matrix), ("input_matrix", input_matrix),
+                                    ("output_matrix", output_matrix)):
+            if matrix is not None:
+                add_str += ", {}={}".format(matrix_name, _to_code(matrix))
+
+        self.code_str["Set Up"] = add_str + ")"
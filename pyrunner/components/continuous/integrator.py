@@ -0,0 +1,51 @@
+from .base_cont import BaseContinuous
+from .. import base_comp
+
+
+class Integrator(BaseContinuous):
+    """A component that integrates its input over time.
+
+    This component performs the same operation as Simulink's Integrator
+    block. Its output is the integral of its input, starting from the initial
+    condition.
+
+    Parameters
+    ----------
+
+    - name : str
+        Name of the component. The default is None and this will generate a name
+        for the component since it was not given one.
+
+    - initial_condition : scalar or array-like
+        Initial value of the output. Its shape determines the shape of the
+        output. The default is 0.0.
+
+    Inputs
+    ------
+
+    - input: The derivative of the output. It must be a scalar or have the same
+      amount of elements as the initial condition.
+
+    Outputs
+    -------
+
+    - The integral of the input.
+    """
+
+    __slots__ = ()
+
+    default_name = base_comp.generate_default_name("integ")
+
+    direct_feedthrough = base_comp.generate_direct_feedthrough(False)
+
+    prop_info = base_comp.generate_prop_info(
+        {
+            "inputs": ({"input"}, {"input"}),
+            "outputs": ({}, {}),
+            "parameters": ({}, {"initial_condition": 0.0})
+        }
+    )
+
+    def get_state_block(self):
+
+        return self.parameters["initial_condition"], None, None, None
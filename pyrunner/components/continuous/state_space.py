@@ -0,0 +1,94 @@
+import numpy as np
+
+from .base_cont import BaseContinuous
+from .. import base_comp
+
+
+class StateSpace(BaseContinuous):
+    """A component that implements a linear state-space system.
+
+    This component performs the same operation as Simulink's State-Space
+    block without a feedthrough matrix (i.e. D = 0):
+
+        dx/dt = A x + B u
+        y = C x
+
+    Since the output does not depend directly on the input, this component
+    can break feedback loops.
+
+    Parameters
+    ----------
+
+    - name : str
+        Name of the component. The default is None and this will generate a name
+        for the component since it was not given one.
+
+    - A : array-like
+        State matrix with shape (n, n), where n is the amount of states. This
+        is a required parameter.
+
+    - B : array-like
+        Input matrix with shape (n, m), where m is the amount of inputs. This
+        is a required parameter.
+
+    - C : array-like
+        Output matrix with shape (p, n), where p is the amount of outputs. This
+        is a required parameter.
+
+    - initial_condition : array-like
+        Initial states with n elements. The default is None and this will start
+        every state at zero.
+
+    Inputs
+    ------
+
+    - input: A scalar or an array with m elements.
+
+    Outputs
+    -------
+
+    - An array with p elements.
+    """
+
+    __slots__ = ()
+
+    default_name = base_comp.generate_default_name("state_space")
+
+    direct_feedthrough = base_comp.generate_direct_feedthrough(False)
+
+    prop_info = base_comp.generate_prop_info(
+        {
+            "inputs": ({"input"}, {"input"}),
+            "outputs": ({}, {}),
+            "parameters": ({"A", "B", "C"}, {"A": None, "B": None, "C": None, "initial_condition": None})
+        }
+    )
+
+    def get_state_block(self):
+
+        state_matrix = self.parameters["A"]
+        initial_state = self.parameters["initial_condition"]
+        if initial_state is None:
+            initial_state = np.zeros(np.shape(state_matrix)[0])
+
+        return initial_state, state_matrix, self.parameters["B"], self.parameters["C"]
+
+    def verify_properties(self):
+
+        super(StateSpace, self).verify_properties()
+
+        state_shape = np.shape(self.parameters["A"])
+        input_shape = np.shape(self.parameters["B"])
+        output_shape = np.shape(self.parameters["C"])
+        if len(state_shape) != 2 or state_shape[0] != state_shape[1]:
+            raise ValueError('The parameter "A" must be a square matrix.')
+
+        state_len = state_shape[0]
+        if len(input_shape) != 2 or input_shape[0] != state_len:
+            raise ValueError('The parameter "B" must be a matrix with {} rows.'.format(state_len))
+        if len(output_shape) != 2 or output_shape[1] != state_len:
+            raise ValueError('The parameter "C" must be a matrix with {} columns.'.format(state_len))
+
+        initial_state = self.parameters["initial_condition"]
+        if initial_state is not None and np.size(initial_state) != state_len:
+            raise ValueError('The parameter "initial_condition" must have {} elements.'.format(state_len))
@@ -0,0 +1,255 @@
+"""
+This module contains the state vector of a diagram's continuous components.
+
+The states of every continuous component in a diagram are packed into a single
+contiguous array, so a fixed-step solver updates all of them with a handful of
+array operations per step, regardless of the amount of states. Each component
+owns a block (a slice) of the array and it's described by the following
+matrices:
+
+    - State matrix (A): The derivative of the block's states depends on its
+      states through this matrix. If it's None, the derivative only depends
+      on the block's input (like an integrator.)
+
+    - Input matrix (B): The derivative of the block's states depends on its
+      input through this matrix. If it's None, the input is the derivative.
+
+    - Output matrix (C): The output of the block is computed from its states
+      through this matrix. If it's None, the output is the states themselves.
+
+That is, the states x of a block follow dx/dt = A x + B u, and its output is
+y = C x. The inputs are held constant during a step.
+
+The input of a block without input matrix can also be a scalar, which is
+broadcast to every state of the block.
+
+The matrices of the blocks with the same shapes are stacked into a single
+array when the states are packed, along with the positions of their states,
+inputs and outputs in the packed arrays. This way, a step takes one matrix
+product per stack instead of one per block, and the inputs are gathered with a
+single array conversion, so the time spent in the interpreter does not grow
+with the amount of blocks (like thousands of scalar integrators.)
+"""
+
+import numpy as np
+
+
+class StateVector(object):
+    """Contiguous vector with the states of a diagram's continuous components.
+
+    The blocks are added with the add method in the Set Up code of the
+    diagram. Afterwards, the get_outputs method returns the outputs of the
+    blocks at the start of each step and the step method advances every state
+    by one step of the solver at the end of it.
+    """
+
+    SOLVERS = ("euler", "rk4")  # Available fixed-step solvers
+
+    def __init__(self, step_size, solver="rk4"):
+
+        if solver not in self.SOLVERS:
+            raise ValueError('The solver must be one of these: {}'.format(", ".join(self.SOLVERS)))
+
+        self.step_size = step_size  # Time between each step
+        self.solver = solver  # Solver used to integrate the states
+        self.values = None  # Packed states of every block
+
+        self._blocks = {}  # Maps the index of each block to its initial states and matrices
+        self._input_size = 0  # Amount of elements of all the inputs
+        self._input_shapes = []  # Shape of the input of each block (in index order)
+        self._output_size = 0  # Amount of elements of all the outputs
+        self._output_shapes = []  # Shape of the output of each block (in index order)
+        self._output_splits = []  # Positions where the packed outputs are split into the outputs of each block
+        self._common_shape = None  # Shape of the outputs when every block has the same output shape
+        self._direct_inputs = None  # Positions of the states and the inputs of the blocks without input matrix
+        self._direct_outputs = None  # Positions of the outputs and the states of the blocks without output matrix
+        self._state_stacks = []  # Positions of the states (twice) and the stacked state matrices
+        self._input_stacks = []  # Positions of the states, the inputs and the stacked input matrices
+        self._output_stacks = []  # Positions of the outputs, the states and the stacked output matrices
+        self._forcing = None  # Part of the derivative that depends on the inputs (B u)
+
+    def add(self, index, initial_state, state_matrix=None, input_matrix=None, output_matrix=None):
+        """Add the block of a continuous component with the given index."""
+
+        self._blocks[index] = (np.asarray(initial_state, dtype=float), state_matrix, input_matrix, output_matrix)
+        self.values = None  # Pack the states again
+
+    def get_outputs(self):
+        """Return the outputs of every block for the current step (in index
+        order.)
+        """
+
+        if self.values is None:
+            self._pack()
+
+        # The states are never modified in place (see step), so views can be returned
+        outputs = _apply_stacks(self.values, self._output_size, self._direct_outputs, self._output_stacks)
+        if self._common_shape is not None:  # The outputs are split by iterating over the rows of an array
+            return list(outputs.reshape((len(self._output_shapes),) + self._common_shape))
+        return [part[0] if shape == () else part.reshape(shape)
+                for part, shape in zip(np.split(outputs, self._output_splits), self._output_shapes)]
+
+    def step(self, inputs):
+        """Advance the states by one step with the given inputs.
+
+        The inputs are given in the same order as the blocks' indexes. The
+        inputs of the blocks without input matrix are broadcast to the shape
+        of their states.
+        """
+
+        if self.values is None:
+            self._pack()
+
+        self._forcing = _apply_stacks(self._gather_inputs(inputs), self.values.size, self._direct_inputs,
+                                      self._input_stacks)
+
+        # The new states are a new array, so the outputs of the previous step are never modified
+        step_size = self.step_size
+        states = self.values
+        if self.solver == "euler" or not self._state_stacks:  # Without state matrices, RK4 equals Euler
+            self.values = states + step_size * self._get_derivative(states)
+        else:
+            k_1 = self._get_derivative(states)
+            k_2 = self._get_derivative(states + (step_size / 2) * k_1)
+            k_3 = self._get_derivative(states + (step_size / 2) * k_2)
+            k_4 = self._get_derivative(states + step_size * k_3)
+            self.values = states + (step_size / 6) * (k_1 + 2 * k_2 + 2 * k_3 + k_4)
+
+    def _gather_inputs(self, inputs):
+        """Pack the inputs of every block into a single array."""
+
+        try:  # Inputs with the same shapes are converted at once
+            packed_inputs = np.array(inputs, dtype=float).ravel()
+        except ValueError:
+            packed_inputs = None
+        if packed_inputs is None or packed_inputs.size != self._input_size:  # Some inputs must be broadcast
+            packed_inputs = np.concatenate([np.broadcast_to(input_, shape).ravel()
+                                            for input_, shape in zip(inputs, self._input_shapes)]) \
+                if inputs else np.zeros(0)
+        return packed_inputs
+
+    def _get_derivative(self, states):
+
+        if not self._state_stacks:
+            return self._forcing
+
+        derivative = self._forcing.copy()
+        for state_positions, _, state_matrices in self._state_stacks:
+            derivative[state_positions] += _stacked_dot(state_matrices, states[state_positions])
+        return derivative
+
+    def _pack(self):
+        """Pack the initial states of every block into a single array and
+        stack the matrices of the blocks with the same shapes.
+        """
+
+        initial_states = []
+        direct_inputs = ([], [])
+        direct_outputs = ([], [])
+        state_stacks = {}
+        input_stacks = {}
+        output_stacks = {}
+        self._input_shapes = []
+        self._output_shapes = []
+        output_stops = []
+
+        state_start = input_start = output_start = 0
+        for index in range(len(self._blocks)):
+            initial_state, state_matrix, input_matrix, output_matrix = self._blocks[index]
+            state_positions = np.arange(state_start, state_start + initial_state.size)
+            initial_states.append(initial_state.ravel())
+
+            if state_matrix is not None:
+                _add_to_stack(state_stacks, state_matrix, state_positions)
+
+            input_size = initial_state.size if input_matrix is None else np.shape(input_matrix)[1]
+            input_positions = np.arange(input_start, input_start + input_size)
+            self._input_shapes.append(initial_state.shape if input_matrix is None else (input_size,))
+            if input_matrix is None:
+                direct_inputs[0].append(state_positions)
+                direct_inputs[1].append(input_positions)
+            else:
+                _add_to_stack(input_stacks, input_matrix, state_positions, input_positions)
+
+            output_size = initial_state.size if output_matrix is None else np.shape(output_matrix)[0]
+            output_positions = np.arange(output_start, output_start + output_size)
+            if output_matrix is None:
+                direct_outputs[0].append(output_positions)
+                direct_outputs[1].append(state_positions)
+                self._output_shapes.append(initial_state.shape)
+            else:
+                _add_to_stack(output_stacks, output_matrix, output_positions, state_positions)
+                self._output_shapes.append((output_size,))
+
+            state_start += initial_state.size
+            input_start += input_size
+            output_start += output_size
+            output_stops.append(output_start)
+
+        self._input_size = input_start
+        self._output_size = output_start
+        self._output_splits = output_stops[:-1]
+        self._common_shape = self._output_shapes[0] if len(set(self._output_shapes)) == 1 else None
+        self._direct_inputs = _pack_positions(direct_inputs, state_start, input_start)
+        self._direct_outputs = _pack_positions(direct_outputs, output_start, state_start)
+        self._state_stacks = _pack_stacks(state_stacks)
+        self._input_stacks = _pack_stacks(input_stacks)
+        self._output_stacks = _pack_stacks(output_stacks)
+        self.values = np.concatenate(initial_states) if initial_states else np.zeros(0)
+
+
+# Packing helpers
+
+def _add_to_stack(stacks, matrix, target_positions, source_positions=None):
+
+    matrix = np.asarray(matrix, dtype=float)
+    stack = stacks.setdefault(matrix.shape, ([], [], []))
+    stack[0].append(target_positions)
+    stack[1].append(target_positions if source_positions is None else source_positions)
+    stack[2].append(matrix)
+
+
+def _pack_positions(positions, size, source_size):
+    """Concatenate the target and source positions of the blocks that copy
+    their values. Returns None if every value is copied to the same position
+    (i.e. the array is the same as the source array.)
+    """
+
+    target_positions, source_positions = (np.concatenate(block_positions) if block_positions else
+                                          np.zeros(0, dtype=int) for block_positions in positions)
+    if size == source_size and np.array_equal(target_positions, np.arange(size)) and \
+            np.array_equal(source_positions, target_positions):
+        return None
+    return target_positions, source_positions
+
+
+def _pack_stacks(stacks):
+    """Turn the blocks of each stack into arrays with a row per block."""
+
+    return [(np.array(target_positions), np.array(source_positions), np.array(matrices))
+            for target_positions, source_positions, matrices in stacks.values()]
+
+
+# Step helpers
+
+def _stacked_dot(matrices, vectors):
+    """Multiply each matrix of a stack by the vector in the same row."""
+
+    return np.matmul(matrices, vectors[..., np.newaxis])[..., 0]
+
+
+def _apply_stacks(values, size, direct_positions, stacks):
+    """Compute an array with the given size from the values of every block.
+
+    The blocks without a matrix copy their values from the source positions
+    to the target positions and the rest multiply them by their matrices.
+    """
+
+    if direct_positions is None:  # Every value is copied to the same position
+        return values
+
+    result = np.zeros(size)
+    result[direct_positions[0]] = values[direct_positions[1]]
+    for target_positions, source_positions, matrices in stacks:
+        result[target_positions] = _stacked_dot(matrices, values[source_positions])
+    return result
@@ -4,6 +4,8 @@ from .. import base_comp
 
 class Abs(base_comp.BaseComponent):
 
+    __slots__ = ()
+
     default_name = base_comp.generate_default_name("absolute")
 
     direct_feedthrough = base_comp.generate_direct_feedthrough(True)
@@ -27,3 +29,9 @@ class Abs(base_comp.BaseComponent):
     def generate_code_string(self):
 
         self.code_str['Execution'] = '{} = np.abs({})'.format(self.name, self.inputs["input"].name)
+
+    def generate_buffered_code_string(self, buffer_name):
+
+        # Passing out=None to a ufunc is slower than leaving it out, which matters for scalars
+        return '{0} = np.abs({1}) if {2} is None else np.abs({1}, out={2})'.format(self.name, self.inputs["input"].name,
+                                                                                   buffer_name)
@@ -17,14 +17,14 @@ from .. import base_comp
 
 # Function helpers
 
-def _generate_string_for_normal_addition(inputs, parameters):
+def _generate_string_for_normal_addition(input_names, parameters):
 
     comp_signs = parameters["comp_signs"]
 
     # Generate the sum
     sum_str = ""
-    for comp, comp_sign in zip(inputs, comp_signs):
-        sum_str += comp_sign + comp.name
+    for input_name, comp_sign in zip(input_names, comp_signs):
+        sum_str += comp_sign + input_name
 
     # Eliminate plus if the sum starts with it
     if sum_str.startswith("+"):
@@ -33,18 +33,52 @@ def _generate_string_for_normal_addition(inputs, parameters):
     return sum_str
 
 
-def _generate_string_for_dimension_sum(inputs, parameters):
+def _generate_string_for_buffered_addition(inputs, parameters, buffer_name):
+
+    comp_signs = parameters["comp_signs"]
+
+    # The first term is written into the buffer only if it must be negated
+    sum_str = inputs[0].name
+    if comp_signs[0].strip() == '-':
+        sum_str = "np.negative({},out={})".format(sum_str, buffer_name)
+
+    # Accumulate the rest of the terms in the buffer
+    for comp, comp_sign in zip(inputs[1:], comp_signs[1:]):
+        ufunc_name = "np.add" if comp_sign.strip() == '+' else "np.subtract"
+        sum_str = "{}({},{},out={})".format(ufunc_name, sum_str, comp.name, buffer_name)
+
+    return sum_str
+
+
+def _generate_string_for_batched_addition(inputs, parameters, batched_inputs, aligned_name):
+
+    # The batch axes of the inputs are aligned first, so the inputs of each scenario broadcast on their own
+    input_names = [comp.name for comp in inputs]
+    align_str = "{} = _batching.align(({}), ({}))".format(
+        aligned_name, ", ".join(input_names), ", ".join(str(comp in batched_inputs) for comp in inputs))
+    aligned_names = ["{}[{}]".format(aligned_name, index) for index in range(len(inputs))]
+
+    return align_str, _generate_string_for_normal_addition(aligned_names, parameters)
 
-    sum_str = "np.sum({}".format(inputs[0].name)
+
+def _generate_string_for_dimension_sum(inputs, parameters, batched=False):
+
+    input_name = inputs[0].name
+    sum_str = "np.sum({}".format(input_name)
 
     # Sum negative sign
     comp_sign = parameters["comp_signs"][0].strip()
     if comp_sign == '-':
         sum_str = '-' + sum_str
 
-    # Write dimension parameter
+    # Write dimension parameter (the leading batch axis is skipped for batched inputs)
     dim = parameters['dimension']
-    if dim is not None:
+    if batched:
+        if dim is None:
+            sum_str += ",axis=tuple(range(1,np.ndim({})))".format(input_name)
+        else:
+            sum_str += ",axis={}".format(dim + 1)
+    elif dim is not None:
         sum_str += ",axis={}".format(dim)
 
     # Sum dytpe parameter
@@ -137,8 +171,17 @@ class Sum(base_comp.BaseComponent):
     - The sum of the inputs if there is more than input. Otherwise, it will be
       the sum of the elements in a specified dimension or all the elements of
       the given input.
+
+    When the diagram is built in batch mode, the sum over the elements of an
+    input that carries the batch axis is done per scenario, so the dimension
+    parameter still refers to the dimensions of a single scenario. The sum of
+    several inputs aligns their batch axes first (see the batching module of
+    the utilities), so inputs with different amounts of dimensions are added
+    per scenario too.
     """
 
+    __slots__ = ()
+
     default_name = base_comp.generate_default_name("add")
 
     direct_feedthrough = base_comp.generate_direct_feedthrough(True)
@@ -157,13 +200,30 @@ class Sum(base_comp.BaseComponent):
         start_str = self.name + " = "
         inputs = self.inputs.sort()
 
+        diagram = self.sys.diagram
         if len(inputs) == 1:
-            sum_str = _generate_string_for_dimension_sum(inputs, self.parameters)
+            batched = diagram.carries_batch_axis(inputs[0])
+            sum_str = _generate_string_for_dimension_sum(inputs, self.parameters, batched)
+        elif any(diagram.carries_batch_axis(comp) for comp in inputs):
+            batched_inputs = [comp for comp in inputs if diagram.carries_batch_axis(comp)]
+            align_str, sum_str = _generate_string_for_batched_addition(inputs, self.parameters, batched_inputs,
+                                                                       "_{}_inputs".format(self.name))
+            start_str = align_str + "\n" + start_str
         else:
-            sum_str = _generate_string_for_normal_addition(inputs, self.parameters)
+            sum_str = _generate_string_for_normal_addition([comp.name for comp in inputs], self.parameters)
 
         self.code_str["Execution"] = start_str + sum_str
 
+    def generate_buffered_code_string(self, buffer_name):
+
+        inputs = self.inputs.sort()
+        if len(inputs) == 1:  # Sums along a dimension reduce the shape of their input
+            return None
+
+        sum_str = _generate_string_for_normal_addition([comp.name for comp in inputs], self.parameters)
+        buffered_sum_str = _generate_string_for_buffered_addition(inputs, self.parameters, buffer_name)
+        return "{} = {} if {} is None else {}".format(self.name, sum_str, buffer_name, buffered_sum_str)
+
     def verify_properties(self):
 
         super(Sum, self).verify_properties()
@@ -40,6 +40,8 @@ class Tag(base_comp.BaseComponent):
       the correct variable names.
     """
 
+    __slots__ = ()
+
     default_name = base_comp.generate_default_name("")
 
     direct_feedthrough = base_comp.generate_direct_feedthrough(True)
@@ -1,9 +1,15 @@
 
+import math
+
 from .. import base_comp
 
 
 class Constant(base_comp.BaseComponent):
 
+    __slots__ = ()
+
+    _LITERAL_TYPES = (type(None), bool, int, float, complex, str)  # Values that are written as code
+
     default_name = base_comp.generate_default_name("const")
 
     direct_feedthrough = base_comp.generate_direct_feedthrough(False)
@@ -19,12 +25,23 @@ class Constant(base_comp.BaseComponent):
     def __init__(self, sys_obj, name=None, lib_deps=None, **parameters):
 
         super(Constant, self).__init__(sys_obj, name, **parameters)
+        self._sample_time = math.inf  # The value never changes, so it does not follow any rate
         if lib_deps is not None:
             self._lib_deps = lib_deps
 
+    def collect_bindings(self):
+
+        value = self.parameters['value']
+        if not isinstance(value, self._LITERAL_TYPES):
+            self.sys.diagram.bind(value)
+
     def generate_code_string(self):
 
-        self.code_str['Set Up'] = '{} = '.format(self.name) + str(self.parameters['value'])
+        value = self.parameters['value']
+        if isinstance(value, self._LITERAL_TYPES):  # Strings are code (like "np.zeros(3)")
+            self.code_str['Set Up'] = '{} = '.format(self.name) + str(value)
+        else:  # Other objects (like arrays) are referenced from the namespace of the code
+            self.code_str['Set Up'] = '{} = {}'.format(self.name, self.sys.diagram.bind(value))
 
     def verify_properties(self):
 
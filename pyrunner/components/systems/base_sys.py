@@ -2,6 +2,7 @@ __all__ = ["BaseSystem",
            "BaseSubsystem"]
 
 from abc import abstractmethod
+from array import array
 
 from ..base_comp import BaseComponent
 from ...utils.cls_prop import abstractclassproperty
@@ -16,6 +17,8 @@ class BaseSystem(BaseComponent):
     method through super.
     """
 
+    __slots__ = ("comps", "diagram", "organizer")
+
     def __init__(self, sys_obj, name=None, **parameters):
 
         self.comps = []  # List with components within the system
@@ -39,16 +42,44 @@ class BaseSystem(BaseComponent):
     def clear(self):
         """Remove all components in the system and its subsystems."""
 
-        for comp in self.comps.copy():
+        # Unregister from the last component, so no names are shifted while clearing the system
+        for comp in reversed(self.comps):
             if comp.is_system():
                 comp.clear()
             self.diagram.unregister_component_name(comp)
-            self.remove_component(comp)
+        self._remove_all_components()
+
+    def adjacency(self, fan_out=False):
+        """Return the connections between the system's components as
+        compressed sparse row (CSR) arrays.
+
+        The components are identified by their index in the comps attribute.
+        The inputs of the i-th component (or its consumers if fan_out is True)
+        are the components in indices[indptr[i]:indptr[i + 1]]. A component
+        appears once per property entry it fills, and the connections with
+        components outside of the system are left out.
+        """
+
+        comp_ids = dict((comp, comp_id) for comp_id, comp in enumerate(self.comps))
+        indptr = array("l", [0])
+        indices = array("l")
+        for comp in self.comps:
+            if fan_out:
+                neighbours = ((reader, count) for reader, count in comp._referrers["inputs"].items())
+            else:
+                neighbours = ((input_comp, 1) for input_comp in comp.inputs.values())
+            for neighbour, count in neighbours:
+                if neighbour in comp_ids:
+                    indices.extend([comp_ids[neighbour]] * count)
+            indptr.append(len(indices))
+
+        return indptr, indices
 
     def generate_code_string(self):
         """Generate the code string for all the system's components."""
 
         for comp in self.comps:
+            comp.code_str = {"Set Up": None, "Execution": None}  # Discard the code from previous builds
             comp.generate_code_string()
 
     def organize(self):
@@ -60,13 +91,26 @@ class BaseSystem(BaseComponent):
         so it can also organize the components within the subsystem.
         """
 
+        # Start from a fresh order, since the components might have changed since the last build
         self.organizer.define_sys_info(self.comps)
+        self.organizer.ordered_comps = []
+        for comp in self.comps:
+            comp.is_not_mapped = True
+
+        self.organizer.build_system_order(self.comps, self.adjacency())
         for comp in self.comps:
-            if comp.is_not_mapped:
-                self.organizer.build_system_order(comp)
             if comp.is_system():
                 comp.organize()
 
+    def walk(self):
+        """Iterate over every component in the system and its subsystems."""
+
+        for comp in self.comps:
+            yield comp
+            if comp.is_system():
+                for sub_comp in comp.walk():
+                    yield sub_comp
+
     def search_component_name(self, name):
         """Return a set of components that match the given name."""
 
@@ -89,7 +133,7 @@ class BaseSystem(BaseComponent):
     def unregister_all_components(self):
         """Unregister all component names in the system from name registry."""
 
-        for comp in self.comps:
+        for comp in reversed(self.comps):  # No names are shifted when unregistering from the last component
             if comp.is_system():
                 comp.unregister_all_components()
             self.diagram.unregister_component_name(comp)
@@ -105,23 +149,60 @@ class BaseSystem(BaseComponent):
         return self.diagram.register_component_name(comp, name)
 
     def remove_component(self, input_comp):
-        """Removes component from the system."""
+        """Removes component from the system.
 
-        # Remove component from inputs and outputs from all components within a system
-        for comp in self.comps:
-            comp.inputs.remove(input_comp)
-            comp.outputs.remove(input_comp)
-            if comp.is_system():
-                comp.remove_component(input_comp)
+        The component is removed from the inputs and outputs of every
+        component that references it, which are found with its referrers
+        (so the rest of the components are not visited.)
+        """
+
+        self._detach_component(input_comp)
+        self._discard_components([input_comp])
+
+    def _detach_component(self, input_comp):
+
+        for prop_name in ("inputs", "outputs"):
+            for comp in list(input_comp._referrers[prop_name]):
+                getattr(comp, prop_name).remove(input_comp)
+            for comp in getattr(input_comp, prop_name).values():  # The removed component is no longer a referrer
+                if comp is not None:
+                    comp._referrers[prop_name].pop(input_comp, None)
+
+    def _discard_components(self, comps):
+        """Remove the given components from the component lists of their
+        systems.
 
-        # Remove component from system components if present
-        if input_comp in self.comps:
-            self.comps.remove(input_comp)
+        The list of each system is rebuilt once, so removing k components
+        from a system with n components takes O(n + k) time instead of the
+        O(n k) time of removing them one by one.
+        """
+
+        removed_comps = {}  # Maps the systems to the components that are removed from them
+        for comp in comps:
+            removed_comps.setdefault(comp.sys, set()).add(comp)
+
+        for sys_comp, sys_removed_comps in removed_comps.items():
+            kept_comps = []
+            for comp in sys_comp.comps:
+                if comp in sys_removed_comps:
+                    self.diagram.mark_component_dirty(comp, reorder=True)
+                else:
+                    kept_comps.append(comp)
+            sys_comp.comps[:] = kept_comps
+
+    def _remove_all_components(self):
+
+        for comp in self.comps:
+            self._detach_component(comp)
+            self.diagram.mark_component_dirty(comp, reorder=True)
+        self.comps.clear()
 
 
 class BaseSubsystem(BaseSystem):
     """Base class for systems within a block diagram."""
 
+    __slots__ = ()
+
     def __init__(self, sys_obj, name=None, **parameters):
 
         super(BaseSubsystem, self).__init__(sys_obj, name, **parameters)
@@ -1,51 +1,23 @@
 __all__ = ["BlockDiagram"]
 
 
+import bisect
 import re
-from copy import copy
-from functools import wraps
 
 from ..base_comp import *
 from .base_sys import BaseSystem
-from ...utils.file_find import find_module
+from ..continuous import StateVector
+from ..continuous.base_cont import BaseContinuous
+from ...runners import executors
+from ...runners.registry import get_runner
+from ...utils.bindings import get_binding_key
+from ...utils.build_cache import BuildCache, fingerprint
+from ...optimizers import buffers, cse, dead_comps, invariants
 
 
 # BlockDiagram definition and helpers
 
 
-def _shiftmethod(func):
-    """Decorator that enables component name shifting.
-
-    This is done by finding the components that share the same basename as the
-    component being used as a reference. Every time one of these components is
-    found, the wrapped shift function is called to rename the similarly named
-    component, if necessary.
-    """
-
-    @wraps(func)
-    def method_wrapper(diagram, comp, comp_name=None):
-
-        # Get component attributes
-        if comp_name is None:
-            basename, name_index = _NameManager.get_name_attrs(comp.name)
-        else:
-            basename, name_index = _NameManager.get_name_attrs(comp_name)
-
-        # Perform shifting with wrapped function
-        basename_count = diagram._name_mgr.get_name_count(basename)  # Gets registered count for the basename
-        similar_comps = diagram.search_component_name(basename)  # List components with similar names
-        for similar_comp in similar_comps:
-            _, similar_name_index = _NameManager.get_name_attrs(similar_comp.name)
-            similar_name_match = similar_comp is not comp \
-                                 and basename_count > similar_name_index \
-                                 and re.match(basename + '(_[1-9][0-9]*)?', similar_comp.name)
-
-            if similar_name_match:
-                func(diagram, basename, name_index, similar_comp, similar_name_index)
-
-    return method_wrapper
-
-
 class BlockDiagram(BaseSystem):
     """The component that acts as the main container for all other components.
 
@@ -86,9 +58,28 @@ class BlockDiagram(BaseSystem):
 
         try:
             self.diagram = self  # State you're the diagram for your subsystems
-            self.runner, self.runner_name = find_module(runner_name, "runners")  # Runner object
+            self.runner, self.runner_name = get_runner(runner_name)  # Runner object
 
             self._name_mgr = _NameManager()  # A "namespace" to register components
+            self.batch_mode = False  # Indicates if the code evaluates a batch of scenarios per step
+            self.instrumented = False  # Indicates if the code measures the time of each component
+            self.sample_times = {}  # Sample time of each component in the order of execution
+            self.step_size = 0.001  # Time between each step for the continuous components
+            self.solver = "rk4"  # Solver that integrates the states of the continuous components
+            self.state_comps = []  # Continuous components whose states are in the state vector
+            self.pruned_comps = []  # Components removed by the dead component elimination in the last build
+            self.hoisted_comps = []  # Components moved to the set up code by the constant folding in the last build
+            self.shared_exprs = {}  # Subexpressions shared by the common subexpression elimination in the last build
+            self.buffered_comps = {}  # Components that write into preallocated buffers and their buffer variables
+            self.bindings = {}  # Objects that the code refers to by name (see the bind method)
+            self._bound_objects = {}  # Maps the ids of the bound objects to their names and the objects
+            self._binding_keys = {}  # Maps the content keys of the bound objects to their names
+            self._batched_comps = set()  # Components whose values carry the leading batch axis
+            self._dirty_comps = set()  # Components that changed since the last build
+            self._needs_reorder = True  # Indicates if the order of execution changed since the last build
+            self._built_options = None  # Build options of the last build (None if it can't be rebuilt incrementally)
+            self.frozen = False  # Indicates if the build state was released (see the freeze method)
+            self._executor = None  # Executor that the code of the last build registered
 
             self._DIAGRAMS.append(self)  # Register diagram in class
 
@@ -97,9 +88,33 @@ class BlockDiagram(BaseSystem):
 
         super(BlockDiagram, self).__init__(self, name)
 
-        self._lib_deps = {"pyrunner.runners.{}".format(self.runner_name): self.runner_name}
+        self._lib_deps = {self.runner.__name__: self.runner_name}
+
+    def bind(self, value):
+        """Bind an object to the generated code and return its name.
+
+        The code refers to the object by the returned name, and the object is
+        placed in the namespace where the code runs, so it's neither copied
+        nor written as code. The same object is always bound to the same
+        name, and so are arrays with the same contents.
+        """
+
+        if id(value) in self._bound_objects:
+            return self._bound_objects[id(value)][0]
+
+        key = get_binding_key(value)
+        name = self._binding_keys.get(key) if key is not None else None
+        if name is None:
+            name = "_{}_bind_{}".format(self.name, len(self.bindings))
+            self.bindings[name] = value
+            if key is not None:
+                self._binding_keys[key] = name
+        self._bound_objects[id(value)] = (name, value)  # Holds the object, so its id is not reused
+
+        return name
 
-    def build(self, file_path=None, create_code=True, namespace=None):
+    def build(self, file_path=None, create_code=True, namespace=None, batch=False, cache=None, prune=False,
+              fold_constants=False, share_exprs=False, preallocate=False, instrument=False, incremental=False):
         """Builds up the BlockDiagram object.
 
         This method will do the following to accomplish this:
@@ -108,20 +123,113 @@ class BlockDiagram(BaseSystem):
           criteria established by each component, respectively.
 
         - It will determine in what order the system will execute each
-          component.
+          component and how often each one of them is evaluated (see the
+          components' sample_time attribute).
 
         - Pass the default parameters to its respective components.
 
         - It will generate the code string for the system.
-        """
 
-        self.verify_properties()  # Check if everything in the components was entered correctly
+        If batch is True, the code is generated so every input of the diagram
+        carries a leading batch axis, so a single step evaluates all the
+        scenarios in the batch at once (see the executor's run_batch method).
+
+        If a cache (a directory path or a BuildCache object) is given, the
+        generated code is stored in it under a fingerprint of the diagram's
+        structure. If an identical diagram was built before with the same
+        cache, the steps above are skipped and the cached code is loaded
+        instead.
+
+        If prune is True, the components whose values never reach the
+        diagram's outputs (or a Tag with an input) are dropped from the order
+        of execution. The removed components are stored in the pruned_comps
+        attribute.
+
+        If fold_constants is True, the components whose values only depend on
+        Constant components are computed once in the set up code instead of
+        on every step, and their values are written as literals when they are
+        plain Python numbers. The moved components are stored in the
+        hoisted_comps attribute.
+
+        If share_exprs is True, the subexpressions that are repeated in the
+        code of a step (like the same function call or the same leading terms
+        of a sum in different components) are computed once and stored in a
+        variable. The variables and their expressions are stored in the
+        shared_exprs attribute.
+
+        If preallocate is True, the components that support it write their
+        array values into buffers that are allocated once instead of creating
+        new arrays on every step. Components whose values are not alive at the
+        same time share their buffers. The buffered components are stored in
+        the buffered_comps attribute.
+
+        If instrument is True, the code measures the time that the Execution
+        code of each component takes on every step. The timings can be read
+        through the executor's get_timings and format_timings methods. When
+        it's False, the code is not changed at all.
+
+        If incremental is True and the diagram was built before with the same
+        options, only the components that changed since the last build (see
+        the mark_dirty method of the components) are verified and set up, and
+        only their code and the code of the components that depend on them is
+        generated again. The components are only reordered if the connections
+        between them changed. The code of the other components is reused. The
+        passes that rewrite the code of the components (prune, fold_constants,
+        share_exprs and preallocate) always need a full build.
+        """
 
-        self.setup()
-        self.organize()
-        self.generate_code_string()
+        self._check_if_not_frozen()
+        builder = self.runner.Builder
+        if cache is not None and create_code:
+            if not isinstance(cache, BuildCache):
+                cache = BuildCache(cache)
+            cache_key = fingerprint(self, runner=self.runner.__name__, batch=batch, prune=prune,
+                                    fold_constants=fold_constants, share_exprs=share_exprs,
+                                    preallocate=preallocate, instrument=instrument)
+            cache_entry = cache.load(cache_key)
+            if cache_entry is not None:  # Skip straight to loading the cached code
+                code, compiled_code = cache_entry
+                self.batch_mode = batch
+                self.instrumented = instrument
+                self._built_options = None  # The components were not organized nor generated
+                self._collect_bindings()
+                self._release_executor(file_path)
+                builder.load_code(code, file_path, namespace, compiled_code, self.bindings)
+                self._track_executor(file_path)
+                return
+
+        build_options = (batch, prune, fold_constants, share_exprs, preallocate)
+        if incremental and self._built_options == build_options and not any(build_options[1:]) and \
+                not any(comp.is_system() for comp in self._dirty_comps if comp is not self):
+            self._rebuild_dirty_components()
+        else:
+            self.verify_properties()  # Check if everything in the components was entered correctly
+
+            self.setup()
+            self.organize()
+            self.sample_times = {}
+            self.organizer.propagate_sample_times(self.sample_times)
+            self.pruned_comps = dead_comps.eliminate_dead_components(self) if prune else []
+            self.batch_mode = batch
+            self._batched_comps = self._find_batched_components() if batch else set()
+            self.generate_code_string()
+            self.hoisted_comps = invariants.hoist_invariant_components(self) if fold_constants else []
+            self.shared_exprs = cse.eliminate_common_subexpressions(self) if share_exprs else {}
+            self.buffered_comps = buffers.preallocate_buffers(self) if preallocate else {}
+        self._dirty_comps = set()
+        self._needs_reorder = False
+        self._built_options = build_options
+        self.instrumented = instrument
         if create_code:
-            self.runner.Builder.create_code([self], file_path, namespace)
+            self._release_executor(file_path)
+            if cache is None:
+                builder.create_code([self], file_path, namespace)
+            else:
+                code = builder.create_code_string([self])
+                compiled_code = builder.compile_code(code, self.name)
+                cache.store(cache_key, code, compiled_code)
+                builder.load_code(code, file_path, namespace, compiled_code, self.bindings)
+            self._track_executor(file_path)
 
     @classmethod
     def build_diagrams(cls, file_path=None, namespace=None):
@@ -136,7 +244,20 @@ class BlockDiagram(BaseSystem):
         # It doesn't matter what Builder is used to create the final code since the method
         # create_code will invoke each diagram's builder to create that diagram's code
         builder = diagram.runner.Builder  # Grab the last builder (it could've any other one from the list of diagrams)
+        for diagram in cls._DIAGRAMS:
+            diagram._release_executor(file_path)
         builder.create_code(cls._DIAGRAMS, file_path, namespace)
+        for diagram in cls._DIAGRAMS:
+            diagram._track_executor(file_path)
+
+    def carries_batch_axis(self, comp):
+        """Verify if the value of a component carries the leading batch axis.
+
+        This is only the case when the diagram is built in batch mode and the
+        component depends on at least one of the diagram's inputs.
+        """
+
+        return comp in self._batched_comps
 
     def clear_diagram(self):
         """Remove all the components directly in the block diagram.
@@ -147,11 +268,79 @@ class BlockDiagram(BaseSystem):
         registry empty.
         """
 
-        for comp in copy(self.comps):
+        # Unregister from the last component, so no names are shifted while clearing the diagram
+        for comp in reversed(self.comps):
             if comp.is_system():
                 comp.unregister_all_components()
             self.unregister_component_name(comp)
-            self.remove_component(comp)
+        self._remove_all_components()
+
+    def freeze(self):
+        """Release the state that is only needed to build the diagram.
+
+        Once a diagram is built, its executor runs on its own, so the name
+        registry, the code strings, the organizers and the results of the
+        last build are dropped. The diagram is also removed from the
+        registered diagrams, so it can be garbage collected as soon as it's no
+        longer referenced while its executor stays in the executors pool.
+
+        A frozen diagram keeps its components, but it can no longer be built
+        nor can components be added to it.
+        """
+
+        for comp in self.walk():
+            comp.code_str = None
+            if comp.is_system():
+                comp.organizer = None
+        self.code_str = None
+        self.organizer = None
+
+        self._name_mgr = None
+        self.sample_times = {}
+        self.state_comps = []
+        self.pruned_comps = []
+        self.hoisted_comps = []
+        self.shared_exprs = {}
+        self.buffered_comps = {}
+        self.bindings = {}
+        self._bound_objects = {}
+        self._binding_keys = {}
+        self._batched_comps = set()
+        self._dirty_comps = set()
+        self._built_options = None
+        self.frozen = True
+
+        if self in self._DIAGRAMS:
+            self._DIAGRAMS.remove(self)
+
+    def generate_code_string(self):
+        """Generate the code string for all the diagram's components.
+
+        If the diagram has continuous components, the states of all of them
+        are packed into a single state vector (see the StateVector class.) The
+        diagram creates the state vector in its Set Up code, computes the
+        outputs of the continuous components at the start of each step (Step
+        Start code) and advances every state at the end of each step with its
+        solver (Step End code).
+
+        The objects that the code refers to by name are bound first (see the
+        bind method.)
+        """
+
+        self._collect_bindings()
+        self._assign_state_indices()
+        super(BlockDiagram, self).generate_code_string()
+        self._generate_state_code()
+
+    def mark_component_dirty(self, comp, reorder=False):
+        """Flag a component of the diagram as changed since the last build.
+
+        If reorder is True, the components are organized again in the next
+        incremental build.
+        """
+
+        self._dirty_comps.add(comp)
+        self._needs_reorder = self._needs_reorder or reorder
 
     def pass_imports(self, lib_deps):
         """Update diagram imports with its components libraries."""
@@ -173,12 +362,15 @@ class BlockDiagram(BaseSystem):
           component and it is registered in the name registry.
         """
 
+        self._check_if_not_frozen()
         if name is None:
-            return self._name_mgr.register_name(comp.generate_name())
+            name = self._name_mgr.register_name(comp.generate_name())
+        else:
+            self._name_mgr.register_custom_name(name)
+            if self._name_mgr.get_name_count(name) > 1:  # Perform right shift if custom name is not unique
+                self._shift_component_names(name, 1)
 
-        self._name_mgr.register_custom_name(name)
-        if self._name_mgr.get_name_count(name) > 1:  # Perform right shift if custom name is not unique
-            self._shift_component_names_right(comp, name)
+        self._name_mgr.index_component(comp, name)
         return name
 
     def remove_components(self, *comps):
@@ -186,11 +378,17 @@ class BlockDiagram(BaseSystem):
 
         The component(s) can directly be in the BlockDiagram object or they can
         reside in a system component within the BlockDiagram object.
+
+        The names of the components are unregistered together and the list of
+        components of each system is rebuilt once, so removing many components
+        does not rename or scan the other components once per component.
         """
 
+        comps = list(dict.fromkeys(comps))  # Remove duplicates but keep the order
+        self._unregister_component_names(comps)
         for comp in comps:
-            self.unregister_component_name(comp)
-            self.remove_component(comp)
+            self._detach_component(comp)
+        self._discard_components(comps)
 
     def unregister_component_name(self, comp):
         """Unregister a component from the block diagram's name registry.
@@ -205,30 +403,183 @@ class BlockDiagram(BaseSystem):
         this when you are going to remove a component from the block diagram.
         """
 
+        self._check_if_not_frozen()
         if self._name_mgr.is_name_registered(comp.name):
-            self._shift_component_names_left(comp)
+            self._name_mgr.unindex_component(comp)
+            self._shift_component_names(comp.name, -1)
             self._name_mgr.unregister_name(comp.name)
 
-    @_shiftmethod
-    def _shift_component_names_left(self, basename, name_index, similar_comp, similar_name_index):
-        """Shift component names to the left."""
+    def _check_if_not_frozen(self):
+
+        if self.frozen:
+            raise AttributeError('The diagram "{}" is frozen, so it can no longer be built '.format(self.name) +
+                                 "or modified. Create a new diagram instead.")
+
+    def _assign_state_indices(self):
+        """Give a block of the state vector to each continuous component that
+        is evaluated.
 
-        if similar_name_index > name_index:
-            if similar_name_index == 1:
-                similar_comp._name = basename
+        Returns the continuous components whose blocks changed.
+        """
+
+        if self.solver not in StateVector.SOLVERS:
+            raise ValueError('The solver must be one of these: {}'.format(", ".join(StateVector.SOLVERS)))
+
+        prev_indices = {}
+        for comp in self.walk():
+            if isinstance(comp, BaseContinuous):
+                prev_indices[comp] = comp.state_index
+                comp.state_index = None
+        self.state_comps = []
+        self._find_state_components(self)
+        for state_index, comp in enumerate(self.state_comps):
+            comp.state_index = state_index
+
+        return [comp for comp, prev_index in prev_indices.items() if comp.state_index != prev_index]
+
+    def _generate_state_code(self):
+
+        self.code_str = {"Set Up": None, "Execution": None, "Step Start": None, "Step End": None}
+        if self.state_comps:
+            output_str = ", ".join(comp.name for comp in self.state_comps)
+            input_str = "".join(comp.inputs["input"].name + ", " for comp in self.state_comps).rstrip(" ")
+            if len(self.state_comps) == 1:  # Unpack the single output from the list
+                output_str += ","
+            self.pass_imports({"pyrunner.components.continuous": "_continuous"})
+            self.code_str["Set Up"] = '_states = _continuous.StateVector({!r}, "{}")'.format(self.step_size, self.solver)
+            self.code_str["Step Start"] = "{} = _states.get_outputs()".format(output_str)
+            self.code_str["Step End"] = "_states.step(({}))".format(input_str)
+
+    def _find_state_components(self, system):
+
+        for comp in system.organizer.ordered_comps:
+            if comp.is_system():
+                self._find_state_components(comp)
+            elif isinstance(comp, BaseContinuous):
+                self.state_comps.append(comp)
+
+    def _collect_bindings(self):
+        """Bind the objects of every component again, so the bindings of
+        the removed components or the previous values are dropped.
+        """
+
+        self.bindings = {}
+        self._bound_objects = {}
+        self._binding_keys = {}
+        for comp in self.walk():
+            comp.collect_bindings()
+
+    def _release_executor(self, file_path):
+        """Drop the executor of the previous build from the executors pool.
+
+        Executing the code of a build registers the diagram's executor, so the
+        executor of the previous build must be dropped before the code runs
+        again. The code that is written to a script does not register it.
+        """
+
+        if file_path is None and self._executor is not None:
+            executors.discard(self.name, self._executor)
+            self._executor.close()
+            self._executor = None
+
+    def _track_executor(self, file_path):
+
+        if file_path is None:
+            self._executor = executors.get(self.name)
+
+    def _find_batched_components(self):
+        """Find the components that depend on the diagram's inputs."""
+
+        return self._find_downstream_components([comp for comp in self.inputs.values() if comp is not None])
+
+    def _find_downstream_components(self, comps):
+        """Find the given components and the components that depend on them."""
+
+        downstream_comps = set()
+        pending_comps = list(comps)
+        while pending_comps:
+            comp = pending_comps.pop()
+            if comp not in downstream_comps:
+                downstream_comps.add(comp)
+                pending_comps.extend(comp._referrers["inputs"])
+
+        downstream_comps.discard(self)  # The diagram reads its own inputs
+        return downstream_comps
+
+    def _rebuild_dirty_components(self):
+        """Build the diagram again by only processing the components that
+        changed since the last build and the components that depend on them.
+        """
+
+        dirty_comps = [comp for comp in self.walk() if comp in self._dirty_comps]  # Drops the removed components
+        for comp in dirty_comps:
+            comp.verify_properties()
+        for comp in dirty_comps:
+            comp.pass_default_parameters()
+            self.pass_imports(comp.lib_deps)
+
+        if self._needs_reorder:
+            self.organize()
+        self.sample_times = {}
+        self.organizer.propagate_sample_times(self.sample_times)
+        if self.batch_mode:
+            self._batched_comps = self._find_batched_components()
+
+        # Only the affected components generate their code again (the bindings of the others are kept by name)
+        affected_comps = self._find_downstream_components(dirty_comps + self._assign_state_indices())
+        for comp in self.walk():
+            if comp in affected_comps:
+                comp.code_str = {"Set Up": None, "Execution": None}
+                comp.generate_code_string()
+        self._generate_state_code()
+
+    def _unregister_component_names(self, comps):
+        """Unregister the names of many components at once.
+
+        Unregistering a name shifts the generated names with greater indices
+        to the left, so unregistering the names one at a time renames O(n)
+        components per name. The generated names of each basename are
+        unregistered together instead, which renames each of the remaining
+        components at most once and gives them the same names. The basenames
+        that have other names (like custom indexed names) are unregistered one
+        name at a time.
+        """
+
+        self._check_if_not_frozen()
+        basename_comps = {}  # Maps each basename to the components whose names use it
+        for comp in comps:
+            if self._name_mgr.is_name_registered(comp.name):
+                basename, _ = self._name_mgr.get_name_attrs(comp.name)
+                basename_comps.setdefault(basename, []).append(comp)
+
+        for basename, similar_comps in basename_comps.items():
+            if all(self._name_mgr.is_generated_name(comp.name) for comp in similar_comps):
+                for similar_comp, new_name in self._name_mgr.unregister_generated_names(basename, similar_comps):
+                    similar_comp._name = new_name
+                    similar_comp.mark_dirty()
             else:
-                similar_comp._name = basename + '_' + str(similar_name_index - 1)
+                for comp in similar_comps:
+                    self.unregister_component_name(comp)
+
+    def _shift_component_names(self, name, shift):
+        """Rename the components that share the basename of the given name.
 
-    @_shiftmethod
-    def _shift_component_names_right(self, basename, name_index, similar_comp, similar_name_index):
-        """Shift component names to the right"""
+        To shift the names to the right (shift = 1), the components whose
+        indices are the same or greater than the name's index are moved one
+        index up. To shift them to the left (shift = -1), the ones whose
+        indices are greater than the name's index are moved one index down.
+        """
 
-        if similar_name_index >= name_index:
-            similar_comp._name = basename + '_' + str(similar_name_index + 1)
+        for similar_comp, new_name in self._name_mgr.shift_indexed_components(name, shift):
+            similar_comp._name = new_name
+            similar_comp.mark_dirty()
 
 
 # Name manager definition
 
+_INDEX_REGEX = re.compile("(_[1-9][0-9]*)+$")  # Index at the end of a name
+
+
 class _NameManager:
     """A class that behaves like a namespace for BlockDiagram objects.
 
@@ -264,13 +615,14 @@ class _NameManager:
     def __init__(self):
 
         self._registry = {}  # Name registry for a BlockDiagram object
+        self._indexed_comps = {}  # Maps each basename to the components that use it by their name indices
 
     @staticmethod
     def get_name_attrs(name):
         """Get a name's basename and index."""
 
         try:
-            basename, name_index, _ = re.split("(_[1-9][0-9]*)+$", name)
+            basename, name_index, _ = _INDEX_REGEX.split(name)
             name_index = int(name_index.split('_')[1])
         except ValueError:  # This only happens if there's no index at the end
             name_index = 0
@@ -291,6 +643,55 @@ class _NameManager:
             return self._registry[basename]
         return 0
 
+    def index_component(self, comp, name):
+        """Record the component that holds a registered name.
+
+        The components are indexed by the basename and the index of their
+        names, so the components that must be renamed when a name is
+        registered or unregistered can be found without searching the whole
+        diagram.
+        """
+
+        basename, name_index = self.get_name_attrs(name)
+        self._indexed_comps.setdefault(basename, {})[name_index] = comp
+
+    def unindex_component(self, comp):
+        """Remove a component from the component index."""
+
+        basename, name_index = self.get_name_attrs(comp.name)
+        indexed_comps = self._indexed_comps.get(basename, {})
+        if indexed_comps.get(name_index) is comp:
+            del indexed_comps[name_index]
+            if not indexed_comps:
+                del self._indexed_comps[basename]
+
+    def shift_indexed_components(self, name, shift):
+        """Move the indexed components that share the basename of a name one
+        index up (shift = 1) or down (shift = -1.)
+
+        Only the indices from the name's index up to the registered count of
+        the basename are moved (the name's index itself is only moved up.)
+        Returns a list with the moved components and their new names.
+        """
+
+        basename, name_index = self.get_name_attrs(name)
+        indexed_comps = self._indexed_comps.get(basename, {})
+        basename_count = self.get_name_count(basename)
+        if shift > 0:  # Start from the last index, so the moved components do not overwrite the next ones
+            indices = range(basename_count - 1, name_index - 1, -1)
+        else:
+            indices = range(name_index + 1, basename_count)
+
+        moved_comps = []
+        for index in indices:
+            comp = indexed_comps.pop(index, None)
+            if comp is not None:
+                new_index = index + shift
+                indexed_comps[new_index] = comp
+                moved_comps.append((comp, basename if new_index == 0 else basename + '_' + str(new_index)))
+
+        return moved_comps
+
     def is_name_registered(self, name):
         """Verify if name is registered in the name registry."""
 
@@ -312,7 +713,7 @@ class _NameManager:
           name the same way it was entered.
         """
 
-        if re.search("(_[1-9][0-9]*)+$", name):  # Verify if name has indexed format
+        if _INDEX_REGEX.search(name):  # Verify if name has indexed format
             if self._is_explicitly_registered(name):
                 raise NameError("{} is already registered and no duplicate indexed names".format(name) +
                                 " are allowed in the name registry.")
@@ -368,6 +769,47 @@ class _NameManager:
             basename, _ = self.get_name_attrs(name)
             self._registry[basename] -= 1
 
+    def is_generated_name(self, name):
+        """Verify if name is a registered basename or a name generated from
+        it (i.e. an implicitly registered name without its own entry.)"""
+
+        basename, _ = self.get_name_attrs(name)
+        if name == basename:
+            return self._is_explicitly_registered(name)
+        return not self._is_explicitly_registered(name) and self._is_implicitly_registered(name)
+
+    def unregister_generated_names(self, basename, comps):
+        """Unregister the generated names of the given components, which
+        share the given basename.
+
+        This gives the same result as unregistering the names one at a time
+        and shifting the indexed components to the left after each of them:
+        every indexed component below the registered count of the basename is
+        moved down by the amount of unregistered indices below its index.
+        Returns a list with the moved components and their new names.
+        """
+
+        removed_indices = []
+        for comp in comps:
+            self.unindex_component(comp)
+            removed_indices.append(self.get_name_attrs(comp.name)[1])
+        removed_indices.sort()
+
+        basename_count = self._registry[basename]
+        indexed_comps = self._indexed_comps.get(basename, {})
+        moved_comps = []
+        for index in sorted(index for index in indexed_comps if removed_indices[0] < index < basename_count):
+            comp = indexed_comps.pop(index)
+            new_index = index - bisect.bisect_left(removed_indices, index)
+            indexed_comps[new_index] = comp
+            moved_comps.append((comp, basename if new_index == 0 else basename + '_' + str(new_index)))
+
+        if basename_count == len(removed_indices):
+            del self._registry[basename]
+        else:
+            self._registry[basename] -= len(removed_indices)
+        return moved_comps
+
     def _is_explicitly_registered(self, name):
         """Verify if name is explicitly registered in the name registry.
 
@@ -0,0 +1,13 @@
+"""This package contains the passes that optimize a diagram when it is built.
+
+These passes run after the components of a diagram have been organized, so
+they can rearrange or drop the components in the organizers' ordered lists (or
+rewrite their code strings) before the runner's builder creates the code of the
+diagram. They are enabled through the arguments of the BlockDiagram's build
+method.
+"""
+
+__all__ = ["buffers", "cse", "dead_comps", "invariants"]
+
+
+from . import buffers, cse, dead_comps, invariants
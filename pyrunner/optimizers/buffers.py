@@ -0,0 +1,183 @@
+"""
+This module contains the buffer preallocation pass.
+
+Most components compute their values with expressions like "a+b-c" or
+"np.abs(x)", which allocate a new array on every step. For large arrays, the
+allocations (and the garbage collection of the arrays from the previous step)
+can take longer than the arithmetic itself. The pass rewrites the code of the
+components that support it so they write their values into buffers with
+NumPy's "out" arguments instead.
+
+The shapes and types of the values are not known until the system runs, so
+the buffers are claimed at run time:
+
+    - The first step (or warm up step) runs the original code of the
+      components. After each buffered component computes its value, the value
+      is claimed as the component's buffer.
+
+    - The following steps run the buffered code, which writes into the claimed
+      buffers. If the shapes or types of the system's inputs change, the warm
+      up step runs again to claim new buffers.
+
+Components whose values are not alive at the same time share the same buffer
+slot, so the amount of buffers is the maximum amount of values that are alive
+at any point of a step rather than the amount of components.
+"""
+
+__all__ = ["claim", "get_signature", "preallocate_buffers"]
+
+
+import re
+
+import numpy as np
+
+
+_BUFFER_NAME = "_buf_{}"  # Name of the buffer variables
+_POOL_NAME = "_buffer_pool"  # Name of the dictionary with the buffers of each slot
+_LIB_DEPS = {"numpy": "np", "pyrunner.optimizers.buffers": "_buffers"}  # Imports for the buffered code
+
+_ALIAS_REGEX = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]* = (?P<value>[a-zA-Z_][a-zA-Z0-9_]*)$")  # Variable copy
+_NAME_REGEX = re.compile(r"(?<![a-zA-Z0-9_.])[a-zA-Z_][a-zA-Z0-9_]*(?![a-zA-Z0-9_(])")  # Variable in an expression
+
+
+# Run time functions
+
+def claim(pool, slot, value):
+    """Return the buffer that a component writes its value into.
+
+    The value computed in the warm up step is reused as the buffer, unless
+    another value in the same slot was already claimed with the same shape
+    and type. Returns None if the value is not an array that can be written
+    into (e.g. a scalar), so the component allocates its value as usual.
+    """
+
+    if not isinstance(value, np.ndarray) or value.ndim == 0 or value.base is not None or \
+            not value.flags.writeable:
+        return None
+
+    buffer = pool.get(slot)
+    if buffer is None:
+        pool[slot] = value
+    elif buffer.shape == value.shape and buffer.dtype == value.dtype:
+        return buffer
+    return value
+
+
+def get_signature(values):
+    """Return the types and shapes of the given values."""
+
+    return tuple((type(value), np.shape(value), getattr(value, "dtype", None)) for value in values)
+
+
+# Build time functions
+
+def preallocate_buffers(diagram):
+    """Rewrite the code of the diagram's components to write into buffers.
+
+    The diagram's code strings must be generated before running this pass.
+    The original code of a buffered component is kept under the "Warm Up" key
+    of its code string and the buffered code replaces its execution code.
+
+    A component is buffered if its generate_buffered_code_string method
+    returns some code and its value is not:
+
+        - An output of the diagram (since the next step would overwrite it.)
+
+        - Copied to another variable (like a Tag does.)
+
+        - Read before it's assigned in a step (i.e. it's used in the next
+          step.)
+
+        - Evaluated less often than on every step (since its value is held
+          between its evaluations.)
+
+    The buffered code is generated from the inputs of a component, so it
+    does not keep the changes that other passes made to the execution code
+    (like the subexpressions shared by the common subexpression elimination.)
+    The values are kept alive until the last step that reads them in either
+    code, so no buffer is reused while the buffered code still reads it.
+
+    Returns a dictionary that maps the buffered components to their buffer
+    variables.
+    """
+
+    exec_comps = []
+    _collect_execution_components(diagram, exec_comps)
+    if diagram.code_str.get("Step End") is not None:  # The diagram's code reads values at the end of each step
+        exec_comps.append(diagram)
+
+    # Find where each value is assigned and used within a step
+    assigned_steps = {}
+    last_used_steps = {}
+    excluded_names = set(output.name for output in diagram.outputs.values() if output is not None)
+    for step, comp in enumerate(exec_comps):
+        exec_str = comp.code_str["Step End" if comp is diagram else "Execution"]
+        alias_match = _ALIAS_REGEX.match(exec_str)
+        if alias_match is not None:
+            excluded_names.add(alias_match.group("value"))
+            excluded_names.add(comp.name)
+        for var_name in _find_read_names(exec_str) | _find_buffered_read_names(comp, diagram):
+            if var_name not in assigned_steps:  # Value of the previous step (or a value that comes from Set Up)
+                excluded_names.add(var_name)
+            last_used_steps[var_name] = step
+        assigned_steps.setdefault(comp.name, step)
+
+    # Give slots to the values, so the ones that are alive at the same time do not share a slot
+    buffered_comps = {}
+    free_slots = []
+    busy_slots = []  # Pairs with the last step where the slot is used and the slot
+    slot_count = 0
+    for step, comp in enumerate(exec_comps):
+        if comp is diagram or comp.name in excluded_names or "\n" in comp.code_str["Execution"] or \
+                diagram.sample_times.get(comp, 1) != 1:
+            continue
+        buffer_name = _BUFFER_NAME.format(len(buffered_comps))
+        buffered_code = comp.generate_buffered_code_string(buffer_name)
+        if buffered_code is None:
+            continue
+
+        for busy_slot in [busy_slot for busy_slot in busy_slots if busy_slot[0] < step]:
+            busy_slots.remove(busy_slot)
+            free_slots.append(busy_slot[1])
+        if free_slots:
+            free_slots.sort()
+            slot = free_slots.pop(0)
+        else:
+            slot = slot_count
+            slot_count += 1
+        busy_slots.append((max(step, last_used_steps.get(comp.name, step)), slot))
+
+        comp.code_str["Warm Up"] = comp.code_str["Execution"] + \
+            "\n{0} = _buffers.claim({1}, {2}, {3})".format(buffer_name, _POOL_NAME, slot, comp.name)
+        comp.code_str["Execution"] = buffered_code
+        buffered_comps[comp] = buffer_name
+
+    if buffered_comps:
+        diagram.pass_imports(_LIB_DEPS)
+    return buffered_comps
+
+
+def _find_read_names(exec_str):
+    """Find the variables that some execution code reads."""
+
+    return set(_NAME_REGEX.findall(exec_str.split(" = ", 1)[-1] if "\n" not in exec_str else exec_str))
+
+
+def _find_buffered_read_names(comp, diagram):
+    """Find the variables that the buffered code of a component reads."""
+
+    if comp is diagram:
+        return set()
+    buffered_code = comp.generate_buffered_code_string(_BUFFER_NAME.format(""))
+    if buffered_code is None:
+        return set()
+    return _find_read_names(buffered_code) - {_BUFFER_NAME.format("")}
+
+
+def _collect_execution_components(system, exec_comps):
+
+    for comp in system.organizer.ordered_comps:
+        if comp.is_system():
+            _collect_execution_components(comp, exec_comps)
+        elif comp.code_str["Execution"] is not None:
+            exec_comps.append(comp)
@@ -0,0 +1,232 @@
+"""
+This module contains the common subexpression elimination pass.
+
+Diagrams that are assembled from templates tend to compute the same
+expressions many times per step (e.g. several Sum components that subtract the
+same pair of signals or that sum the same array.) The pass finds these
+repeated subexpressions in the execution code of the components, computes each
+one of them once in a temporary variable and rewrites the code that used them
+to read the variable instead.
+
+Two kinds of subexpressions are shared:
+
+    - Function calls, like "np.sum(x)" or "np.abs(x)". These are found with
+      the regexes from the expression optimizer utilities.
+
+    - The leading terms of an addition, like the "a-b" in "a-b+c". Python
+      adds the terms of these expressions from left to right, so replacing the
+      leading terms with a variable computes exactly the same value.
+"""
+
+__all__ = ["eliminate_common_subexpressions"]
+
+
+import re
+
+from ..utils.expr_optimizer.regex_generator import create_match_regexes
+
+
+_TEMP_NAME = "_cse_{}"  # Name of the temporary variables
+
+_ASSIGN_REGEX = re.compile(r"^(?P<target>[a-zA-Z_][a-zA-Z0-9_]*) = (?P<expr>[^\n]+)$")  # Single assignment
+_NAME_REGEX = re.compile(r"(?<![a-zA-Z0-9_.])[a-zA-Z_][a-zA-Z0-9_]*(?![a-zA-Z0-9_(])")  # Variable in an expression
+_EXP_REGEX = re.compile(r"(?<![a-zA-Z0-9_.])[0-9]+\.?[0-9]*[eE]$")  # Number before the sign of its exponent
+
+
+class _Assignment(object):
+    """Execution code of a component that assigns an expression to a variable."""
+
+    def __init__(self, comp, step, sample_time, target, expr):
+
+        self.comp = comp  # Component that owns the code
+        self.step = step  # Position of the code within a step
+        self.sample_time = sample_time  # Amount of steps between the evaluations of the code
+        self.target = target  # Variable that is assigned
+        self.expr = expr  # Expression that is assigned
+        self.temps = []  # Temporary variables ([name, expression] pairs) that are computed before the expression
+
+    def get_exprs(self):
+        """Return the expressions in the order they are evaluated."""
+
+        return [temp[1] for temp in self.temps] + [self.expr]
+
+    def set_expr(self, index, expr):
+
+        if index < len(self.temps):
+            self.temps[index][1] = expr
+        else:
+            self.expr = expr
+
+    def generate_code_string(self):
+
+        lines = ["{} = {}".format(name, expr) for name, expr in self.temps]
+        lines.append("{} = {}".format(self.target, self.expr))
+        return "\n".join(lines)
+
+
+def eliminate_common_subexpressions(diagram):
+    """Share the repeated subexpressions in the execution code of a diagram.
+
+    The diagram's code strings must be generated before running this pass.
+    Only single line assignments (the code most components generate) are
+    rewritten. A subexpression is shared when it appears at least twice, all
+    the variables it reads are assigned before its first appearance and every
+    appearance has the same sample time, so they all evaluate to the same
+    value.
+
+    Returns a dictionary that maps the temporary variables to the expressions
+    they hold.
+    """
+
+    assignments = []
+    assigned_steps = {}  # Maps the variables that are assigned on every step to their positions in the step
+    _collect_assignments(diagram, diagram, assignments, assigned_steps)
+    if not assignments:
+        return {}
+
+    func_expr_regex = create_match_regexes("\n".join(assignment.expr for assignment in assignments))[0]
+
+    # Count the appearances of every subexpression
+    candidates = {}  # Maps each subexpression to its appearance count and whether it's the leading terms of a sum
+    for assignment in assignments:
+        for call in _find_calls(func_expr_regex, assignment.expr):
+            candidates[call] = (candidates.get(call, (0, False))[0] + 1, False)
+        term_ends = _get_term_ends(assignment.expr)
+        if term_ends is not None:
+            for term_end in term_ends[1:]:
+                prefix = assignment.expr[:term_end]
+                candidates[prefix] = (candidates.get(prefix, (0, True))[0] + 1, True)
+
+    # Longer subexpressions save more work, so they are shared first
+    shared_exprs = {}
+    comp_names = set(comp.name for comp in diagram.walk())
+    for candidate in sorted(candidates, key=lambda expr: (-len(expr), expr)):
+        count, is_prefix = candidates[candidate]
+        if count >= 2:
+            temp_name = _share_expression(candidate, is_prefix, assignments, assigned_steps, comp_names, shared_exprs)
+            if temp_name is not None:
+                shared_exprs[temp_name] = candidate
+
+    for assignment in assignments:
+        assignment.comp.code_str["Execution"] = assignment.generate_code_string()
+
+    return shared_exprs
+
+
+def _collect_assignments(diagram, system, assignments, assigned_steps):
+
+    for comp in system.organizer.ordered_comps:
+        if comp.is_system():
+            _collect_assignments(diagram, comp, assignments, assigned_steps)
+        elif comp.code_str["Execution"] is not None:
+            step = len(assigned_steps)
+            assigned_steps[comp.name] = step
+            match = _ASSIGN_REGEX.match(comp.code_str["Execution"])
+            if match is not None:
+                sample_time = diagram.sample_times.get(comp, 1)
+                assignments.append(_Assignment(comp, step, sample_time, match.group("target"), match.group("expr")))
+
+
+def _share_expression(candidate, is_prefix, assignments, assigned_steps, comp_names, shared_exprs):
+    """Compute the candidate once and rewrite the expressions that use it.
+
+    Returns the name of the variable that holds the candidate, or None if it
+    cannot be shared.
+    """
+
+    if is_prefix:
+        def replace(expr, name):
+            return name + expr[len(candidate):]
+
+        def count_appearances(expr):
+            is_leading = expr.startswith(candidate) and (len(expr) == len(candidate) or expr[len(candidate)] in "+-")
+            return int(is_leading and _get_term_ends(expr) is not None)
+    else:
+        call_regex = re.compile(r"(?<![a-zA-Z0-9_.])" + re.escape(candidate))
+
+        def replace(expr, name):
+            return call_regex.sub(lambda _: name, expr)
+
+        def count_appearances(expr):
+            return len(call_regex.findall(expr))
+
+    appearances = []
+    appearance_count = 0
+    for assignment in assignments:
+        for index, expr in enumerate(assignment.get_exprs()):
+            expr_count = count_appearances(expr)
+            if expr_count:
+                appearances.append((assignment, index))
+                appearance_count += expr_count
+    if appearance_count < 2:
+        return None  # The other appearances were replaced by a longer subexpression
+
+    # Every variable in the candidate must hold the same value in all the appearances
+    first_assignment, first_index = appearances[0]
+    if any(assignment.sample_time != first_assignment.sample_time for assignment, _ in appearances):
+        return None
+    for var_name in _NAME_REGEX.findall(candidate):
+        if assigned_steps.get(var_name, -1) >= first_assignment.step:
+            return None
+
+    # Reuse the assigned variable when the candidate is the whole expression of its first appearance
+    if first_index == len(first_assignment.temps) and first_assignment.expr == candidate:
+        name = first_assignment.target
+        appearances = appearances[1:]
+    else:
+        temp_index = 0
+        while _TEMP_NAME.format(temp_index) in comp_names or _TEMP_NAME.format(temp_index) in shared_exprs:
+            temp_index += 1
+        name = _TEMP_NAME.format(temp_index)
+        first_assignment.temps.insert(0, [name, candidate])  # Shorter subexpressions go before the longer ones
+        appearances = [(assignment, index + 1 if assignment is first_assignment else index)
+                       for assignment, index in appearances]
+
+    for assignment, index in appearances:
+        assignment.set_expr(index, replace(assignment.get_exprs()[index], name))
+
+    return name
+
+
+def _find_calls(func_expr_regex, expr):
+    """Find the function calls in an expression (including the nested ones)."""
+
+    calls = []
+    for match in func_expr_regex.finditer(expr):
+        start = match.start()
+        while start > 0 and (expr[start - 1].isalnum() or expr[start - 1] in "_."):  # Include the module name
+            start -= 1
+        calls.append(expr[start:match.end()])
+
+        call_str = match.group()
+        calls.extend(_find_calls(func_expr_regex, call_str[call_str.index("(") + 1:-1]))
+
+    return calls
+
+
+def _get_term_ends(expr):
+    """Find where each term of an addition ends.
+
+    Returns None if the expression is not a sequence of terms that are joined
+    by + and - signs.
+    """
+
+    term_ends = []
+    nested_lvl = 0
+    prev_char = ""
+    for i, char in enumerate(expr):
+        if char in "([{":
+            nested_lvl += 1
+        elif char in ")]}":
+            nested_lvl -= 1
+        elif nested_lvl == 0:
+            if char in "+-":
+                is_binary = prev_char.isalnum() or prev_char in "_.)]}"
+                if is_binary and not _EXP_REGEX.search(expr[:i]):
+                    term_ends.append(i)
+            elif not (char.isalnum() or char in "_."):  # Any other operator changes the order of evaluation
+                return None
+        prev_char = char
+
+    term_ends.append(len(expr))
+    return term_ends
@@ -0,0 +1,60 @@
+"""
+This module contains the dead component elimination pass.
+
+A component is dead if its value never reaches the diagram's outputs or a Tag
+that writes to an external source (i.e. a Tag with an input.) These components
+still run on every step, so the pass removes them from the order of execution
+of their systems.
+"""
+
+__all__ = ["eliminate_dead_components"]
+
+
+from ..components.signal_routers import Tag
+
+
+def eliminate_dead_components(diagram):
+    """Remove the dead components from the order of execution of a diagram.
+
+    The diagram must be organized before running this pass. The pass walks
+    backwards from the outputs of the diagram and its output tags through the
+    inputs of each component. Every component that is not reached is dropped
+    from its system's ordered components. Systems are kept as long as they
+    contain a reached component.
+
+    Returns the list of removed components.
+    """
+
+    live_comps = set()  # Components whose values reach an output
+    pending_comps = [comp for comp in diagram.outputs.values() if comp is not None]
+    pending_comps.extend(comp for comp in diagram.walk() if isinstance(comp, Tag) and comp.inputs["input"] is not None)
+    while pending_comps:
+        comp = pending_comps.pop()
+        if comp not in live_comps:
+            live_comps.add(comp)
+            pending_comps.extend(input_comp for input_comp in comp.inputs.values() if input_comp is not None)
+            if comp.is_system():  # The values of a system come from its outputs
+                pending_comps.extend(output for output in comp.outputs.values() if output is not None)
+
+    dead_comps = []
+    _remove_dead_components(diagram, live_comps, dead_comps)
+    return dead_comps
+
+
+def _remove_dead_components(system, live_comps, dead_comps):
+    """Remove the dead components from a system's order and return if any of
+    its components is still alive.
+    """
+
+    ordered_comps = []
+    for comp in system.organizer.ordered_comps:
+        is_alive = comp in live_comps
+        if comp.is_system():
+            is_alive = _remove_dead_components(comp, live_comps, dead_comps) or is_alive
+        if is_alive:
+            ordered_comps.append(comp)
+        else:
+            dead_comps.append(comp)
+
+    system.organizer.ordered_comps = ordered_comps
+    return len(ordered_comps) != 0
@@ -0,0 +1,137 @@
+"""
+This module contains the loop-invariant hoisting and constant folding pass.
+
+A component is invariant if all the values it depends on are constant, i.e.
+its inputs are Constant components or other invariant components. The value
+of these components is the same on every step, so the pass moves their code
+from the Execution section (which runs on every step) to the Set Up section
+(which only runs once.) If the value of a hoisted component can be computed
+while building the diagram and it is a plain Python number, the pass folds it
+into a literal value.
+"""
+
+__all__ = ["hoist_invariant_components"]
+
+
+import math
+
+from ..components.sources import Constant
+
+
+_FOLDABLE_TYPES = (bool, int, float, complex)  # Types of the values that can be written as literals
+
+
+def hoist_invariant_components(diagram):
+    """Move the code of the invariant components to the Set Up section.
+
+    The diagram's code strings must be generated before running this pass.
+    Only the components in the organizers' ordered components are moved, and
+    they keep their order, so the Set Up section still computes the inputs of
+    a component before the component itself.
+
+    Returns the list of hoisted components.
+    """
+
+    invariant_comps = _find_invariant_components(diagram)
+
+    hoisted_comps = []
+    _hoist_system_components(diagram, invariant_comps, hoisted_comps)
+    _fold_hoisted_components(diagram, hoisted_comps)
+    return hoisted_comps
+
+
+def _find_invariant_components(diagram):
+    """Find the components whose values only depend on Constant components."""
+
+    invariant_comps = {}  # Maps each visited component to a boolean that indicates if it's invariant
+    for root_comp in diagram.walk():
+        pending_comps = [root_comp]
+        visiting_comps = set()  # Components whose inputs are being visited
+        while pending_comps:
+            comp = pending_comps[-1]
+            if comp in invariant_comps:
+                pending_comps.pop()
+                continue
+
+            input_comps = [input_comp for input_comp in comp.inputs.values() if input_comp is not None]
+            if isinstance(comp, Constant):
+                invariant_comps[comp] = True
+            elif comp.is_system() or not comp.direct_feedthrough or len(input_comps) == 0:
+                invariant_comps[comp] = False  # Systems, stateful components and external inputs are never invariant
+            elif comp in visiting_comps:  # Every input was visited
+                invariant_comps[comp] = all(invariant_comps.get(input_comp, False) for input_comp in input_comps)
+            else:
+                visiting_comps.add(comp)
+                pending_comps.extend(input_comp for input_comp in input_comps
+                                     if input_comp not in invariant_comps and input_comp not in visiting_comps)
+
+    return set(comp for comp, is_invariant in invariant_comps.items() if is_invariant)
+
+
+def _hoist_system_components(system, invariant_comps, hoisted_comps):
+
+    for comp in system.organizer.ordered_comps:
+        if comp.is_system():
+            _hoist_system_components(comp, invariant_comps, hoisted_comps)
+        elif comp in invariant_comps and comp.code_str["Execution"] is not None:
+            set_up_str = comp.code_str["Set Up"]
+            if set_up_str is None:
+                comp.code_str["Set Up"] = comp.code_str["Execution"]
+            else:
+                comp.code_str["Set Up"] = set_up_str + "\n" + comp.code_str["Execution"]
+            comp.code_str["Execution"] = None
+            hoisted_comps.append(comp)
+
+
+def _fold_hoisted_components(diagram, hoisted_comps):
+    """Replace the code of the hoisted components with literal values when
+    their values are plain Python numbers.
+
+    Only the Set Up code of the hoisted components and of the Constant
+    components they depend on is evaluated, in a separate namespace (along
+    with the diagram's bindings.) The rest of the Set Up code only runs when
+    the diagram's code runs. If the code of a component cannot be evaluated,
+    the component (and the ones that depend on it) is only hoisted.
+    """
+
+    if not hoisted_comps:
+        return
+
+    evaluated_comps = set(hoisted_comps)
+    pending_comps = list(hoisted_comps)
+    while pending_comps:
+        for input_comp in pending_comps.pop().inputs.values():
+            if isinstance(input_comp, Constant) and input_comp not in evaluated_comps:
+                evaluated_comps.add(input_comp)
+                pending_comps.append(input_comp)
+
+    namespace = dict(diagram.bindings)
+    try:
+        exec(diagram.runner.Builder._create_imports(diagram, set()), namespace)
+    except Exception:  # The values are computed when the diagram's code runs instead
+        return
+    _execute_set_up_code(diagram, evaluated_comps, namespace)
+
+    for comp in hoisted_comps:
+        value = namespace.get(comp.name)
+        if type(value) in _FOLDABLE_TYPES and _is_finite(value):
+            comp.code_str["Set Up"] = "{} = {!r}".format(comp.name, value)
+
+
+def _execute_set_up_code(system, evaluated_comps, namespace):
+
+    for comp in system.organizer.ordered_comps:
+        if comp.is_system():
+            _execute_set_up_code(comp, evaluated_comps, namespace)
+        elif comp in evaluated_comps and comp.code_str["Set Up"] is not None:
+            try:
+                exec(comp.code_str["Set Up"], namespace)
+            except Exception:  # The names it assigns stay undefined, so it's not folded
+                pass
+
+
+def _is_finite(value):
+
+    if isinstance(value, complex):
+        return math.isfinite(value.real) and math.isfinite(value.imag)
+    return math.isfinite(value)
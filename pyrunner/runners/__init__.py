@@ -13,11 +13,29 @@ objects. Runners are composed of three parts:
     - Executer: This object contains the instructions of how to run the
       set of functions based on the connections of the system. This is
       the object that will be returned for users to run.
+
+The runners that diagrams can use are looked up in the registry module, where
+runners from other packages can also be registered.
 """
 
 __all__ = ["executors",
-           "base_runner"]
+           "base_runner",
+           "registry"]
+
+
+import importlib
+
+
+def __getattr__(name):
+
+    # The modules are imported when they're first accessed, so a process that only needs a runner module (like
+    # the workers of the mp runner) does not import the rest
+    if name in __all__:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module '{}' has no attribute '{}'".format(__name__, name))
+
 
+def __dir__():
 
-from . import executors, base_runner
+    return sorted(set(globals()) | set(__all__))
 
@@ -6,10 +6,18 @@ __all__ = ["BaseBuilder",
 
 import os
 import re
+import math
 from abc import abstractmethod
+from array import array
+from collections import deque
 
 from . import executors
 from ..utils.type_abc import TypeABC
+from ..utils.bindings import create_binding_code
+
+
+_INSTRUMENT_LIB_DEPS = {"time": "_time", "pyrunner.utils.profiling": "_profiling"}  # Imports of instrumented code
+_BATCH_LIB_DEPS = {"pyrunner.utils.batching": "_batching"}  # Imports of the code built in batch mode
 
 
 class BaseExecutor(TypeABC):
@@ -17,14 +25,34 @@ class BaseExecutor(TypeABC):
 
     def __init__(self, name, evaluators):
 
+        self.name = name  # Name of the system the executor runs
         self.evaluators = evaluators  # Object(s) that are used to run the system
 
         executors.add(name, self)  # Store executor
 
+    def close(self):
+        """Release the resources of the executor (like worker processes).
+
+        This is called when a diagram is built again and its new executor
+        replaces this one. By default, there's nothing to release.
+        """
+
     @abstractmethod
     def run(self, inputs=None):
         pass
 
+    def stream(self, inputs):
+        """Run a step for each input record of an iterable and lazily yield
+        the outputs.
+
+        Runners can override this to bind the objects they need once instead
+        of doing it on every step.
+        """
+
+        run = self.run
+        for record in inputs:
+            yield run(record)
+
 
 class BaseBuilder(TypeABC):
 
@@ -36,13 +64,17 @@ class BaseBuilder(TypeABC):
     @classmethod
     def create_code(cls, diagrams, file_path=None, namespace=None):
 
-        code = cls._create_code_string(diagrams)
-        if file_path is None:
-            if namespace is None:
-                namespace = globals()
-            exec(code, namespace)
-        else:
-            cls._create_script(file_path, code)
+        code = cls.create_code_string(diagrams)
+        bindings = {}
+        for diagram in diagrams:
+            bindings.update(diagram.bindings)
+        cls.load_code(code, file_path, namespace, bindings=bindings)
+
+    @staticmethod
+    def compile_code(code, name):
+        """Compile the generated code of a system into a code object."""
+
+        return compile(code, "<pyrunner:{}>".format(name), "exec")
 
     @abstractmethod
     def create_diagram_code(self, diagram):
@@ -51,25 +83,58 @@ class BaseBuilder(TypeABC):
         """
 
     @staticmethod
-    def _create_code_string(diagrams):
+    def create_code_string(diagrams):
+        """Create the code string with the imports and the code of the given
+        diagrams.
+        """
 
-        code = ''
-        imports = ''
+        code = []
+        imports = []
         all_imports = set()
         for diagram in diagrams:
             builder = diagram.runner.Builder()
-            code += builder.create_diagram_code(diagram)
-            imports += builder._create_imports(diagram, all_imports)
+            code.append(builder.create_diagram_code(diagram))
+            imports.append(builder._create_imports(diagram, all_imports))
+
+        return ''.join(imports + code)
 
-        return imports + code
+    @classmethod
+    def load_code(cls, code, file_path=None, namespace=None, compiled_code=None, bindings=None):
+        """Execute the generated code or write it to a script.
+
+        If the code was previously compiled (with the compile_code method),
+        the code object is executed instead of the code string.
+
+        The bindings are the objects that the code refers to by name (see the
+        bind method of the diagrams.) They are placed in the namespace before
+        the code is executed, or they are defined at the top of the script
+        (see the bindings module.)
+        """
+
+        if file_path is None:
+            if namespace is None:
+                namespace = globals()
+            if bindings:
+                namespace.update(bindings)
+            if compiled_code is None:
+                compiled_code = cls.compile_code(code, "diagrams")
+            exec(compiled_code, namespace)
+        else:
+            cls._create_script(file_path, code, bindings)
 
     @staticmethod
     def _create_imports(diagram, all_imports):
 
+        lib_deps = diagram.lib_deps
+        if diagram.batch_mode:  # Only the code of these builds imports their helpers
+            lib_deps = dict(lib_deps, **_BATCH_LIB_DEPS)
+        if diagram.instrumented:
+            lib_deps = dict(lib_deps, **_INSTRUMENT_LIB_DEPS)
+
         imports = ""
-        for lib_name, alt_name in diagram.lib_deps.items():
-            if lib_name not in all_imports:
-                all_imports.add(lib_name)
+        for lib_name, alt_name in lib_deps.items():
+            if (lib_name, alt_name) not in all_imports:  # A module can be imported under several names
+                all_imports.add((lib_name, alt_name))
                 imports += "import " + lib_name
                 if alt_name is not None:
                     imports += " as " + alt_name
@@ -78,7 +143,7 @@ class BaseBuilder(TypeABC):
         return imports
 
     @staticmethod
-    def _create_script(file_path, code):
+    def _create_script(file_path, code, bindings=None):
 
         dir_path, filename = os.path.split(file_path)
         if not os.path.isdir(dir_path):
@@ -86,9 +151,10 @@ class BaseBuilder(TypeABC):
         if not re.match("^[_a-zA-Z][_a-zA-Z0-9]+\.py$", filename):
             raise NameError("The filename must be a valid python filename.")
 
-        # Create script with the generated code
+        # Create script with the generated code (and the arrays it loads next to it)
+        binding_code = create_binding_code(bindings, file_path)
         with open(file_path, mode="w") as script:
-            script.write(code)
+            script.write(binding_code + code)
 
     @staticmethod
     @abstractmethod
@@ -102,8 +168,8 @@ class BaseOrganizer(TypeABC):
     def __init__(self):
 
         self.sys_info = None
-        self._sys_trail = []   # Store components in trail to detect if the system is cyclic (has a feedback loop)
         self.ordered_comps = []
+        self.feedback_loops = []  # Components of each feedback loop in the system
 
     @abstractmethod
     def map_component(self, comp):
@@ -146,57 +212,241 @@ class BaseOrganizer(TypeABC):
             sys_info[comp] = {'inputs': [value for value in comp.inputs.values() if value is not None]}
         self.sys_info = sys_info
 
-    def build_system_order(self, comp):
+    def propagate_sample_times(self, sample_times):
+        """Find the sample time of each component in the order of execution.
 
-        self._sys_trail.append(comp)  # Record component in the trail
+        The sample times are stored in the given dictionary, which is shared
+        with the organizers of the subsystems, so the components can inherit
+        the sample times of inputs that are in other systems. A component
+        without a sample time inherits the greatest common divisor of the
+        sample times of its inputs, so it's evaluated whenever one of them
+        changes. Inputs that are evaluated later in the order (i.e. the ones
+        in a feedback loop) are not considered, since their sample times are
+        not known yet.
 
-        comp_inputs = self.sys_info[comp]['inputs']
-        for input_comp in comp_inputs:
-            if input_comp in self._sys_trail:  # There's a feedback loop in your system (system is cyclic)
-                self._sever_system_loop(input_comp)
-            if input_comp.is_not_mapped:
-                self.build_system_order(input_comp)
-
-        if comp.is_not_mapped:
-            self.map_component(comp)
-            comp.is_not_mapped = False
-            if comp in self._sys_trail:  # Remove component from trail after finishing
-                self._sys_trail.remove(comp)
-
-    def _sever_system_loop(self, comp):
-        """
-        Split the system loop by removing the input component to a component
-        that is non-direct feedthrough, where both components are within the
-        loop.
+        Constant values have an infinite sample time, so they never set the
+        rate of the components that use them.
         """
 
-        non_direct_comp, loop_input_comp = self._get_loop_components(comp)
-        self.sys_info[non_direct_comp]['inputs'].remove(loop_input_comp)
-
-        self._sys_trail.clear()
-
-    def _get_loop_components(self, comp):
+        for comp in self.ordered_comps:
+            if comp.is_system():
+                comp.organizer.propagate_sample_times(sample_times)
+                continue
+
+            input_times = [(input_comp, sample_times[input_comp]) for input_comp in comp.inputs.values()
+                           if input_comp in sample_times]
+            sample_time = comp.sample_time
+            if sample_time is None:
+                if len(input_times) == 0:  # Components without inputs are evaluated on every step
+                    sample_time = 1
+                else:
+                    sample_time = math.inf
+                    for _, input_time in input_times:
+                        if input_time != math.inf:
+                            sample_time = input_time if sample_time == math.inf else math.gcd(sample_time, input_time)
+            else:
+                for input_comp, input_time in input_times:
+                    if input_time != math.inf and max(sample_time, input_time) % min(sample_time, input_time) != 0:
+                        raise ValueError('The sample time of "{}" ({}) and the sample '.format(comp, sample_time) +
+                                         'time of its input "{}" ({}) must be multiples '.format(input_comp, input_time) +
+                                         'of each other.')
+
+            sample_times[comp] = sample_time
+
+    def build_system_order(self, comps, adjacency=None):
+        """Find the order of execution of the given components.
+
+        The components are ordered with a variant of Kahn's algorithm: every
+        component keeps a count of its inputs that have not been mapped yet.
+        The components are scanned in the given order and the ones whose
+        count is zero are mapped (with the map_component method). A component
+        that was skipped by the scan is mapped as soon as its last input is
+        mapped, so the order only differs from the given one where it must.
+        The components are referred to by their indices in the given sequence,
+        so the ordering takes O(V+E) time and it does not recurse, regardless
+        of how deep the system is.
+
+        The connections are read from the compressed sparse row arrays of the
+        inputs of the components (see the adjacency method of the systems.)
+        If they are not given, they are created from the system info.
+
+        The feedback loops are cut up front: if a non-direct feedthrough
+        component is an input of a component within the same loop, that input
+        is removed from the system info, since the value of a non-direct
+        feedthrough component is available before its inputs are evaluated.
+        If some components still cannot be mapped, they form algebraic loops,
+        which are all reported in the same error.
         """
-        Gets non-direct feedthrough component and its input component in the
-        loop.
+
+        comps = list(comps)
+        if adjacency is None:
+            adjacency = self._create_adjacency(comps)
+        indptr, indices = self._sever_system_loops(comps, *adjacency)
+
+        # Count the inputs of each component and find which components read them
+        indegrees = [indptr[index + 1] - indptr[index] for index in range(len(comps))]
+        reader_indptr, reader_indices = _transpose(indptr, indices)
+
+        ready_comps = deque()
+        for index in range(len(comps)):
+            if indegrees[index] != 0:  # It's mapped once its last input is mapped
+                continue
+            ready_comps.append(index)
+            while ready_comps:
+                ready_index = ready_comps.popleft()
+                self.map_component(comps[ready_index])
+                comps[ready_index].is_not_mapped = False
+                for reader_index in reader_indices[reader_indptr[ready_index]:reader_indptr[ready_index + 1]]:
+                    indegrees[reader_index] -= 1
+                    if indegrees[reader_index] == 0 and reader_index < index:  # Later ones are found by the scan
+                        ready_comps.append(reader_index)
+
+        if any(comp.is_not_mapped for comp in comps):
+            loop_ids = _find_strongly_connected_components(indptr, indices)
+            algebraic_loops = _group_loops(comps, indptr, indices, loop_ids)  # Loops that are left after the cuts
+            raise Exception("System cannot process algebraic loops. There needs to be "
+                            "a non-direct feedthrough component in each of these feedback loops: " +
+                            "; ".join("[{}]".format(", ".join(comp.name for comp in loop)) for loop in algebraic_loops))
+
+    def _create_adjacency(self, comps):
+        """Create the compressed sparse row arrays of the inputs of the given
+        components from the system info.
         """
 
-        input_index = self._sys_trail.index(comp)
-        sys_loop = self._sys_trail[input_index:]  # Gets the loop portion in the recorded trail
+        comp_indices = dict((comp, index) for index, comp in enumerate(comps))
+        indptr = array("l", [0])
+        indices = array("l")
+        for comp in comps:  # Inputs from other systems are ignored
+            indices.extend(comp_indices[input_comp] for input_comp in self.sys_info[comp]['inputs']
+                           if input_comp in comp_indices)
+            indptr.append(len(indices))
 
-        for loop_comp_index, loop_comp in enumerate(sys_loop):
-            loop_input_comp = self._get_component_input_in_loop(loop_comp_index, sys_loop)
-            if not loop_input_comp.direct_feedthrough:
-                return loop_comp, loop_input_comp
+        return indptr, indices
 
-        raise Exception("System cannot process algebraic loops. There needs to be "
-                        "a non-direct feedthrough component in your feedback loop.")
+    def _sever_system_loops(self, comps, indptr, indices):
+        """
+        Split the system loops by removing the inputs of the components that
+        are non-direct feedthrough components within the same loop.
 
-    @staticmethod
-    def _get_component_input_in_loop(loop_comp_index, sys_loop):
-        """Get loop component's input within a system loop."""
+        All the loops are found with a single pass over the system and they
+        are stored in the feedback_loops attribute. Returns the compressed
+        sparse row arrays of the inputs that are left.
+        """
 
-        try:  # Normally, next element in sys_loop is the input
-            return sys_loop[loop_comp_index + 1]
-        except IndexError:  # If loop_comp is the last element, its input is first comp in sys_loop
-            return sys_loop[0]
+        loop_ids = _find_strongly_connected_components(indptr, indices)
+        self.feedback_loops = _group_loops(comps, indptr, indices, loop_ids)
+        if not self.feedback_loops:
+            return indptr, indices
+
+        kept_indptr = array("l", [0])
+        kept_indices = array("l")
+        for index, comp in enumerate(comps):
+            for input_index in indices[indptr[index]:indptr[index + 1]]:
+                if loop_ids[input_index] == loop_ids[index] and not comps[input_index].direct_feedthrough:
+                    self.sys_info[comp]['inputs'].remove(comps[input_index])
+                else:
+                    kept_indices.append(input_index)
+            kept_indptr.append(len(kept_indices))
+
+        return kept_indptr, kept_indices
+
+
+def _transpose(indptr, indices):
+    """Return the compressed sparse row arrays of the reversed graph (i.e.
+    the readers of each node.)
+
+    The readers of each node are sorted by their indices.
+    """
+
+    node_count = len(indptr) - 1
+    reader_indptr = array("l", [0] * (node_count + 1))
+    for input_index in indices:
+        reader_indptr[input_index + 1] += 1
+    for index in range(node_count):
+        reader_indptr[index + 1] += reader_indptr[index]
+
+    reader_indices = array("l", [0] * len(indices))
+    positions = reader_indptr[:-1]  # Next free position in the readers of each node
+    for index in range(node_count):
+        for input_index in indices[indptr[index]:indptr[index + 1]]:
+            reader_indices[positions[input_index]] = index
+            positions[input_index] += 1
+
+    return reader_indptr, reader_indices
+
+
+def _group_loops(comps, indptr, indices, loop_ids):
+    """Return the components of each loop of a graph.
+
+    A loop is a strongly connected component with more than one node or a
+    node that is its own input. The loops and their components are sorted by
+    their positions in the given components.
+    """
+
+    loop_sizes = [0] * len(comps)
+    for loop_id in loop_ids:
+        loop_sizes[loop_id] += 1
+
+    loops = {}
+    for index, loop_id in enumerate(loop_ids):
+        if loop_sizes[loop_id] > 1 or index in indices[indptr[index]:indptr[index + 1]]:
+            loops.setdefault(loop_id, []).append(comps[index])
+
+    return list(loops.values())
+
+
+def _find_strongly_connected_components(indptr, indices):
+    """Find the strongly connected components (i.e. the loops) of a graph.
+
+    The graph is given as the compressed sparse row arrays of the inputs of
+    each node.
+    This uses an iterative version of Tarjan's algorithm and returns a list
+    with the id of the strongly connected component of each node. Nodes that
+    are not in a loop get an id of their own.
+    """
+
+    node_count = len(indptr) - 1
+    visit_order = [None] * node_count  # Position of each node in the depth first search
+    low_links = [0] * node_count  # Lowest position that can be reached from each node
+    on_stack = [False] * node_count
+    loop_ids = [None] * node_count
+
+    stack = []
+    visit_count = 0
+    loop_count = 0
+    for root in range(node_count):
+        if visit_order[root] is not None:
+            continue
+
+        pending = [(root, None)]  # Nodes in the search path and the position of the next input to visit
+        while pending:
+            node, input_pos = pending.pop()
+            if input_pos is None:  # First visit to the node
+                visit_order[node] = low_links[node] = visit_count
+                visit_count += 1
+                stack.append(node)
+                on_stack[node] = True
+                input_pos = indptr[node]
+            else:  # Returning from the input that was visited last
+                low_links[node] = min(low_links[node], low_links[indices[input_pos - 1]])
+
+            inputs_end = indptr[node + 1]
+            while input_pos < inputs_end:
+                input_node = indices[input_pos]
+                input_pos += 1
+                if visit_order[input_node] is None:
+                    pending.append((node, input_pos))
+                    pending.append((input_node, None))
+                    break
+                if on_stack[input_node]:
+                    low_links[node] = min(low_links[node], visit_order[input_node])
+            else:
+                if low_links[node] == visit_order[node]:  # Node is the root of a loop
+                    loop_node = None
+                    while loop_node != node:
+                        loop_node = stack.pop()
+                        on_stack[loop_node] = False
+                        loop_ids[loop_node] = loop_count
+                    loop_count += 1
+
+    return loop_ids
@@ -17,10 +17,36 @@ def add(name, executor_obj):
     _POOL[name] = executor_obj
 
 
-def run(name, inputs=None):
-    """Run an executor object/system from the executor pool."""
+def discard(name, executor_obj):
+    """Remove an executor object/system from the executor pool if it's the
+    one registered under the given name.
+    """
+
+    if _POOL.get(name) is executor_obj:
+        del _POOL[name]
+
+
+def get(name):
+    """Get an executor object/system from the executor pool."""
 
     executor = _POOL.get(name)
     if executor is None:
         raise NameError("A system by the name of '{}' has not been registered".format(name))
-    return executor.run(inputs)
+    return executor
+
+
+def run(name, inputs=None):
+    """Run an executor object/system from the executor pool."""
+
+    return get(name).run(inputs)
+
+
+def stream(name, inputs):
+    """Stream an iterable of inputs through an executor object/system from
+    the executor pool.
+
+    The executor is looked up once and a generator that yields the outputs
+    of each step is returned.
+    """
+
+    return get(name).stream(inputs)
@@ -0,0 +1,124 @@
+"""
+This module contains a runner that shards independent executions of a system
+across a pool of processes.
+
+The system code is generated in the same manner as in the seq runner, but the
+executor also keeps the source code of the system. Every worker process in the
+pool runs this source once, when the worker starts, and then it creates a new
+system from the resulting function for every task it receives, so no state
+(like the states of continuous components or preallocated buffers) carries
+over between tasks. The results are gathered in the same order as the inputs
+were given.
+"""
+
+import multiprocessing
+from functools import partial
+
+from . import seq_runner
+
+
+_WORKER_SYSTEMS = {}  # Functions that create the systems within a worker process
+
+
+# Worker process functions
+
+def _init_worker(name, source, input_order, bindings=None):
+    """Run the source code of the system within a worker process."""
+
+    namespace = dict(bindings or {})  # Objects that the source refers to by name
+    exec(source, namespace)
+    _WORKER_SYSTEMS[name] = (namespace[name], input_order)
+
+
+def _run_in_worker(name, inputs):
+    """Run a step of a new system within the worker process."""
+
+    system_func, input_order = _WORKER_SYSTEMS[name]
+    evaluators = system_func()
+    next(evaluators)  # Initialize system
+    if inputs is None:  # This is for systems that do not have any inputs
+        return evaluators.send(None)
+    return evaluators.send([inputs[var] for var in input_order])
+
+
+# Runner definition
+
+class Builder(seq_runner.Builder):
+
+    def create_diagram_code(self, diagram):
+
+        function_code = self._create_function_code(diagram)
+        source = self._create_imports(diagram, set()) + function_code  # Code the workers use to rebuild the system
+
+        return function_code + self._generate_executor_str(diagram, source) + '\n\n'
+
+    @staticmethod
+    def _generate_executor_str(diagram, source=''):
+
+        executor_args = str([str(comp) for comp in diagram.inputs.sort()]) + ', ' + repr(source)
+        if diagram.batch_mode:
+            executor_args += ', batched=True'
+        if diagram.instrumented:
+            executor_args += ', profile={}_profile'.format(diagram.name)
+        if diagram.bindings:  # The workers receive the bound objects along with the source
+            executor_args += ', bindings={' + ', '.join('"{0}": {0}'.format(name) for name in diagram.bindings) + '}'
+
+        return '\n\n\n' + '{0}_exec = {1}.Executor("{0}", {0}(), '.format(diagram.name, diagram.runner_name) + \
+                        executor_args + ')'
+
+
+class Executor(seq_runner.Executor):
+    """Executor that can run many independent executions of a system in
+    parallel.
+
+    The run method executes the system within the current process, like the
+    seq runner does. The run_many method distributes the given inputs across
+    a pool of processes. Each execution runs the first step of a new copy of
+    the system, so the results do not depend on the previous executions or
+    on how they are distributed across the processes.
+
+    The amount of worker processes is controlled by the processes attribute.
+    By default, it uses as many processes as CPUs are available.
+
+    For instrumented systems, the timings only include the steps that were
+    run within the current process.
+
+    The objects that the source refers to by name (see the bind method of the
+    diagrams) are sent to the worker processes when they start.
+    """
+
+    def __init__(self, name, evaluators, input_order, source, batched=False, profile=None, bindings=None):
+
+        super(Executor, self).__init__(name, evaluators, input_order, batched, profile)
+
+        self.source = source  # Code that the worker processes use to rebuild the system
+        self.bindings = bindings  # Objects that the source refers to by name
+        self.processes = None  # Amount of worker processes in the pool
+        self._pool = None
+
+    def close(self):
+        """Shut down the worker processes of the executor."""
+
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def run_many(self, inputs, chunksize=None):
+        """Run an independent execution for each of the given inputs.
+
+        The executions are sharded across the worker processes in chunks of
+        the given size and the list of outputs is returned in the same order
+        as the inputs.
+        """
+
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.processes, _init_worker,
+                                              (self.name, self.source, self.input_order, self.bindings))
+        return self._pool.map(partial(_run_in_worker, self.name), inputs, chunksize)
+
+
+class Organizer(seq_runner.Organizer):
+    """Organizer for the mp runner, which orders the components in the same
+    manner as the seq runner.
+    """
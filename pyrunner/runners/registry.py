@@ -0,0 +1,132 @@
+"""
+A registry of the runners that block diagrams can use.
+
+A runner is a module with the Organizer, Builder and Executor classes (see the
+runners package.) The registry finds the runners once, the first time a runner
+is requested, and then it only works with the modules it keeps in memory, so
+creating diagrams does not touch the file system. The runners come from:
+
+    - The modules in this package whose names end with "_runner" (except the
+      base runner.) These can be requested by their module names or by the
+      names without the suffix, like "seq" for the seq_runner module.
+
+    - The modules of the "pyrunner.runners" entry point group of the
+      installed distributions, which lets other packages provide runners.
+      The name of the entry point is the name of the runner, so it must be a
+      valid Python identifier.
+
+    - The modules that are registered with the register function.
+
+The modules are only imported when their runners are requested.
+"""
+
+__all__ = ["ENTRY_POINT_GROUP",
+           "get_runner",
+           "get_runner_names",
+           "register"]
+
+
+import pkgutil
+import importlib
+from types import ModuleType
+
+
+ENTRY_POINT_GROUP = "pyrunner.runners"  # Entry point group of the runner plugins
+
+_RUNNER_SUFFIX = "_runner"
+_RUNNERS = {}  # Maps the runner names to their modules (or what's needed to import them)
+_ALIASES = {}  # Maps the alternative names of the runners to their names
+_discovered = False  # Indicates if the runners were discovered
+
+
+def get_runner(name):
+    """Get a runner module by its name or one of its aliases.
+
+    It returns the module object along with the runner's name, which is the
+    name the generated code uses for the module.
+    """
+
+    if not isinstance(name, str):
+        raise TypeError("The name of a runner must be a string.")
+    if not _discovered:
+        _discover_runners()
+
+    name = _ALIASES.get(name, name)
+    if name not in _RUNNERS:
+        raise ModuleNotFoundError("No runner could be found using the name {}".format(name))
+
+    runner = _RUNNERS[name]
+    if isinstance(runner, str):  # Name of a module that has not been imported yet
+        runner = _RUNNERS[name] = importlib.import_module(runner)
+    elif not isinstance(runner, ModuleType):  # Entry point of a plugin
+        runner = _RUNNERS[name] = runner.load()
+    return runner, name
+
+
+def get_runner_names():
+    """Get the names of the available runners."""
+
+    if not _discovered:
+        _discover_runners()
+    return sorted(_RUNNERS)
+
+
+def register(name, runner, aliases=()):
+    """Register a runner under the given name.
+
+    The runner can be a module object or the import path of a module (which
+    is imported when the runner is first requested.) The name must be a valid
+    Python identifier, since the generated code imports the runner module
+    under this name.
+    """
+
+    _verify_runner_name(name)
+    if not _discovered:
+        _discover_runners()
+
+    for runner_name in (name,) + tuple(aliases):
+        registered_name = _ALIASES.get(runner_name, runner_name)
+        if registered_name in _RUNNERS and not _is_same_runner(_RUNNERS[registered_name], runner):
+            raise NameError("A runner by the name of '{}' has already been registered".format(runner_name))
+
+    _RUNNERS[name] = runner
+    for alias in aliases:
+        _ALIASES[alias] = name
+
+
+def _discover_runners():
+
+    global _discovered
+
+    # Runners of this package
+    for module_info in pkgutil.iter_modules(importlib.import_module(__package__).__path__):
+        module_name = module_info.name
+        if module_name.endswith(_RUNNER_SUFFIX) and module_name != "base" + _RUNNER_SUFFIX:
+            _RUNNERS[module_name] = "{}.{}".format(__package__, module_name)
+            _ALIASES[module_name[:-len(_RUNNER_SUFFIX)]] = module_name
+
+    # Runners of other distributions (the metadata module is slow to import, so it's only imported here)
+    from importlib import metadata
+    try:
+        entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except TypeError:  # Python versions before 3.10 return a dictionary with every group
+        entry_points = metadata.entry_points().get(ENTRY_POINT_GROUP, ())
+    for entry_point in entry_points:
+        _verify_runner_name(entry_point.name)
+        _RUNNERS.setdefault(entry_point.name, entry_point)
+    _discovered = True  # Set last, so an invalid entry point raises its error on every lookup
+
+
+def _verify_runner_name(name):
+
+    # The generated code imports the runner module under its name
+    if not isinstance(name, str) or not name.isidentifier():
+        raise ValueError('The runner name "{}" must be a valid Python identifier.'.format(name))
+
+
+def _is_same_runner(registered_runner, runner):
+
+    if isinstance(registered_runner, str) or isinstance(runner, str):
+        registered_name = getattr(registered_runner, "__name__", registered_runner)
+        return registered_name == getattr(runner, "__name__", runner)
+    return registered_runner is runner
@@ -1,58 +1,219 @@
 
-from . import base_runner
+import math
+from operator import itemgetter
 
+import numpy as np
 
-class Builder(base_runner.BaseBuilder):
-
-    def create_diagram_code(self, diagram):
+from . import base_runner, executors
 
-        self.inits = ""
-        self.processes = ""
 
-        self.processes += "\n\t" "while True:"
-        self.inits += "\n\n" "def {}():".format(diagram.name)
-        self._merge_component_code(diagram)
+class Builder(base_runner.BaseBuilder):
 
-        self.inits += '\n\t' + self._build_yield(diagram, enable_output=False)
-        self.processes += '\n\t\t' + self._build_yield(diagram) + self._generate_executor_str(diagram)
+    def create_diagram_code(self, diagram):
 
-        return self.inits + self.processes + '\n\n'
+        return self._create_function_code(diagram) + self._generate_executor_str(diagram) + '\n\n'
 
     @staticmethod
     def _build_yield(diagram, enable_output=True):
 
         yield_str = 'yield '
         if len(diagram.inputs) != 0:
-            yield_str = ', '.join(input_.name for input_ in diagram.inputs.sort()) + ' = ' + yield_str
+            input_str = ', '.join(input_.name for input_ in diagram.inputs.sort())
+            if len(diagram.inputs) == 1:  # Unpack the single input from the sent list
+                input_str += ','
+            yield_str = input_str + ' = ' + yield_str
         if enable_output and len(diagram.outputs) != 0:
             yield_str += '{' + ', '.join('"{0}": {0}'.format(output.name) for output in diagram.outputs.sort()) + '}'
         return yield_str
 
+    def _create_function_code(self, diagram):
+        """Create the code of the generator function that runs the diagram.
+
+        The lines of the function are collected in lists and joined once at
+        the end, so the time to generate the code grows linearly with the
+        amount of components in the diagram.
+
+        If the diagram has preallocated buffers, the loop runs a warm up step
+        with the original code of the components to claim the buffers. Then,
+        an inner loop runs the buffered code until the types or shapes of the
+        inputs change.
+
+        If some components are not evaluated on every step, the function
+        counts the steps and each group of consecutive components with the
+        same sample time only runs on the steps that are multiples of it.
+
+        The diagram's own code goes around the code of its components: its
+        Set Up code goes first, and its Step Start and Step End code go at the
+        start and at the end of each step (e.g. to compute the outputs and to
+        advance the states of the continuous components.)
+
+        If the diagram is instrumented, the function measures the time of the
+        Execution code of each component (and the diagram's Step Start and
+        Step End code, under the diagram's name) and accumulates it in a
+        Profile object that is created next to the function.
+        """
+
+        self.inits = ["", "", "def {}():".format(diagram.name)]
+        if diagram.code_str["Set Up"] is not None:
+            self._add_code_lines(self.inits, diagram.code_str["Set Up"], "\t")
+        self.exec_comps = []
+        self._merge_component_code(diagram)
+
+        self.profile_index = None  # Index of the diagram's timings in the profile (None if it's not instrumented)
+        profile_lines = []
+        if diagram.instrumented:
+            self.profile_index = len(self.exec_comps)
+            profile_names = [comp.name for comp in self.exec_comps]
+            if diagram.code_str.get("Step Start") is not None or diagram.code_str.get("Step End") is not None:
+                profile_names.append(diagram.name)
+            profile_lines = ["", "", "{}_profile = _profiling.Profile({!r})".format(diagram.name, profile_names)]
+            self.inits.append("\t_elapsed, _calls = {0}_profile.elapsed, {0}_profile.calls".format(diagram.name))
+            self.inits.append("\t_perf_counter_ns = _time.perf_counter_ns")
+
+        sample_times = [diagram.sample_times.get(comp, 1) for comp in self.exec_comps]
+        tick_lines = []
+        if any(sample_time != 1 for sample_time in sample_times):  # Count the steps for multi-rate diagrams
+            self.inits.append("\t" "_tick = 0")
+            tick_lines.append("_tick += 1")
+        self.inits.append('\t' + self._build_yield(diagram, enable_output=False))
+
+        self.processes = ["\t" "while True:"]
+        if diagram.buffered_comps:
+            input_tuple = "(" + "".join(input_.name + ", " for input_ in diagram.inputs.sort()).rstrip(" ") + ")"
+            self.processes.append("\t\t" "_buffer_pool = {}")
+            self._add_diagram_lines(diagram, self.processes, "Step Start", "\t\t")
+            self._add_execution_lines(self.processes, "Warm Up", "\t\t", sample_times)
+            self._add_diagram_lines(diagram, self.processes, "Step End", "\t\t")
+            self.processes.append("\t\t" "_signature = _buffers.get_signature({})".format(input_tuple))
+            self.processes.extend("\t\t" + tick_line for tick_line in tick_lines)
+            self.processes.append('\t\t' + self._build_yield(diagram))
+            self.processes.append("\t\t" "while _buffers.get_signature({}) == _signature:".format(input_tuple))
+            indent = "\t\t\t"
+        else:
+            indent = "\t\t"
+        self._add_diagram_lines(diagram, self.processes, "Step Start", indent)
+        self._add_execution_lines(self.processes, "Execution", indent, sample_times)
+        self._add_diagram_lines(diagram, self.processes, "Step End", indent)
+        self.processes.extend(indent + tick_line for tick_line in tick_lines)
+        self.processes.append(indent + self._build_yield(diagram))
+
+        return "\n".join(profile_lines + self.inits + self.processes)
+
+    @staticmethod
+    def _add_code_lines(lines, code_str, indent):
+        """Add the lines of a component's code string with the given
+        indentation.
+
+        Every line of the code string is indented, so any tabs within the
+        string are kept relative to the section it is placed in.
+        """
+
+        if "\n" in code_str:
+            lines.extend(indent + line for line in code_str.split("\n"))
+        else:
+            lines.append(indent + code_str)
+
+    def _add_execution_lines(self, lines, code_key, indent, sample_times):
+        """Add the code that is evaluated on each step.
+
+        Consecutive components with the same sample time are placed under the
+        same guard. Components with constant values (an infinite sample time)
+        are only evaluated on the first step.
+        """
+
+        guard_time = 1  # Sample time of the current guard
+        for comp_index, (comp, sample_time) in enumerate(zip(self.exec_comps, sample_times)):
+            if sample_time != guard_time:
+                guard_time = sample_time
+                if sample_time == math.inf:
+                    lines.append(indent + "if _tick == 0:")
+                elif sample_time != 1:
+                    lines.append(indent + "if _tick % {} == 0:".format(sample_time))
+
+            code_str = comp.code_str.get(code_key, comp.code_str["Execution"])
+            self._add_timed_code_lines(lines, code_str, indent if guard_time == 1 else indent + "\t", comp_index)
+
+    def _add_diagram_lines(self, diagram, lines, code_key, indent):
+
+        if diagram.code_str.get(code_key) is not None:
+            self._add_timed_code_lines(lines, diagram.code_str[code_key], indent, self.profile_index)
+
+    def _add_timed_code_lines(self, lines, code_str, indent, profile_index):
+        """Add the lines of a code string and, if the diagram is instrumented,
+        the lines that measure its time.
+        """
+
+        if self.profile_index is None:
+            self._add_code_lines(lines, code_str, indent)
+        else:
+            lines.append(indent + "_start = _perf_counter_ns()")
+            self._add_code_lines(lines, code_str, indent)
+            lines.append(indent + "_elapsed[{}] += _perf_counter_ns() - _start".format(profile_index))
+            lines.append(indent + "_calls[{}] += 1".format(profile_index))
+
     def _merge_component_code(self, system):
 
         for comp in system.organizer.ordered_comps:
             if comp.code_str["Set Up"] is not None:  # Build Set Up
-                self.inits += "\n\t" + comp.code_str['Set Up'].replace('\t', '\t\t')
-            if comp.code_str["Execution"] is not None:  # Build process
-                self.processes += '\n\t\t' + comp.code_str['Execution'].replace('\t', '\t\t')
+                self._add_code_lines(self.inits, comp.code_str['Set Up'], '\t')
+            if comp.code_str["Execution"] is not None:  # Gather the components that are evaluated on each step
+                self.exec_comps.append(comp)
             if comp.is_system():  # Get code from subsystem
                 self._merge_component_code(comp)
 
     @staticmethod
     def _generate_executor_str(diagram):
 
+        executor_args = str([str(comp) for comp in diagram.inputs.sort()])
+        if diagram.batch_mode:
+            executor_args += ', batched=True'
+        if diagram.instrumented:
+            executor_args += ', profile={}_profile'.format(diagram.name)
+
         return '\n\n\n' + '{0}_exec = {1}.Executor("{0}", {0}(), '.format(diagram.name, diagram.runner_name) + \
-                        str([str(comp) for comp in diagram.inputs.sort()]) + ')'
+                        executor_args + ')'
 
 
 class Executor(base_runner.BaseExecutor):
 
-    def __init__(self, name, evaluators, input_order):
+    def __init__(self, name, evaluators, input_order, batched=False, profile=None):
 
         super(Executor, self).__init__(name, evaluators)
 
         next(self.evaluators)  # Initialize system
         self.input_order = input_order  # Order in which the inputs are entered in the system
+        self.batched = batched  # Indicates if the system was built to evaluate a batch of scenarios per step
+        self.profile = profile  # Timings of the components (only for systems built with instrument=True)
+
+    def get_timings(self, per_call=False):
+        """Return a dictionary with the time (in nanoseconds) spent in each
+        component of the system since it was built or since the timings were
+        reset.
+
+        If per_call is True, the mean time per evaluation of each component is
+        returned instead of the total time. This only works for systems built
+        with build(instrument=True).
+        """
+
+        profile = self._get_profile()
+        return profile.get_per_call_times() if per_call else profile.get_cumulative_times()
+
+    def format_timings(self):
+        """Return a table with the timings of the system's components."""
+
+        return self._get_profile().format_table()
+
+    def reset_timings(self):
+        """Clear the timings of the system's components."""
+
+        self._get_profile().reset()
+
+    def _get_profile(self):
+
+        if self.profile is None:
+            raise AttributeError('The system "{}" was not instrumented. '.format(self.name) +
+                                 'Build it with "instrument=True" to time its components.')
+        return self.profile
 
     def run(self, inputs=None):
 
@@ -61,6 +222,96 @@ class Executor(base_runner.BaseExecutor):
         sys_inputs = [inputs[var] for var in self.input_order]  # Pass inputs in the order the system requires it
         return self.evaluators.send(sys_inputs)
 
+    def stream(self, inputs, ordered=False):
+        """Run a step for each input record of an iterable and lazily yield
+        the outputs.
+
+        The generator and the input order are bound once for the whole
+        stream. If ordered is True, each record must already be a sequence
+        with the values in the order given by the input_order attribute, so
+        the records are sent to the system as they are.
+        """
+
+        send = self.evaluators.send
+        if len(self.input_order) == 0:  # This is for systems that do not have any inputs
+            for _ in inputs:
+                yield send(None)
+        elif ordered:
+            for record in inputs:
+                yield send(record)
+        elif len(self.input_order) == 1:
+            input_name = self.input_order[0]
+            for record in inputs:
+                yield send((record[input_name],))
+        else:
+            get_inputs = itemgetter(*self.input_order)  # Gathers the inputs in the order the system requires it
+            for record in inputs:
+                yield send(get_inputs(record))
+
+    def run_batch(self, inputs):
+        """Run a batch of independent scenarios in a single step.
+
+        Every input must carry a leading batch axis with the same length (the
+        amount of scenarios in the batch). The values in the returned output
+        dictionary carry the same leading axis if they depend on the inputs.
+        This only works for systems built with build(batch=True).
+        """
+
+        if not self.batched:
+            raise AttributeError('The system "{}" was not built in batch mode. '.format(self.name) +
+                                 'Build it with "batch=True" to run batches of scenarios.')
+        if len(self.input_order) == 0:
+            raise ValueError("Only systems with inputs can run a batch of scenarios.")
+
+        sys_inputs = [np.asarray(inputs[var]) for var in self.input_order]
+        batch_lens = set(value.shape[0] if value.ndim > 0 else None for value in sys_inputs)
+        if len(batch_lens) != 1 or None in batch_lens:
+            raise ValueError("Every input must carry a leading batch axis of the same length.")
+        return self.evaluators.send(sys_inputs)
+
+
+class AsyncExecutor(object):
+    """Asynchronous counterpart of a seq runner executor.
+
+    It wraps an existing executor (or the name of one in the executor pool),
+    so the system can be run from a coroutine without blocking calls being
+    moved to other threads. The steps are still evaluated by the generator
+    of the wrapped executor, so the generated code does not change.
+    """
+
+    def __init__(self, executor):
+
+        if isinstance(executor, str):
+            executor = executors.get(executor)
+        self.executor = executor  # Executor that evaluates the system
+
+    async def run(self, inputs=None):
+        """Run a step of the system."""
+
+        return self.executor.run(inputs)
+
+    async def astream(self, inputs):
+        """Run a step of the system for each input record of an asynchronous
+        iterable and yield the outputs as they are evaluated.
+
+        An asyncio queue can be turned into an asynchronous iterable with the
+        iterate_queue function.
+        """
+
+        run = self.executor.run
+        async for record in inputs:
+            yield run(record)
+
+
+async def iterate_queue(queue, sentinel=None):
+    """Yield the items of an asyncio queue until the sentinel is received."""
+
+    while True:
+        item = await queue.get()
+        if item is sentinel:
+            return
+        yield item
+
 
 class Organizer(base_runner.BaseOrganizer):
 
@@ -0,0 +1,42 @@
+"""
+This module contains the run time helpers of the code of diagrams that are
+built in batch mode.
+
+In batch mode, the values that depend on the diagram's inputs carry a leading
+batch axis, so they have one more dimension than the value of a single
+scenario. NumPy broadcasts arrays by lining up their trailing dimensions, so
+the batch axis of a value is only kept apart from the dimensions of the other
+operands when all of them have the same amount of dimensions per scenario.
+For example, the sum over the elements of a vector is a scalar per scenario
+(with shape (N,) for N scenarios), and adding it to an unbatched vector with
+shape (k,) would pair each scenario with an element of the vector instead of
+adding the scalar to the whole vector.
+"""
+
+__all__ = ["align"]
+
+
+import numpy as np
+
+
+def align(values, batched):
+    """Align the batch axes of the operands of an element-wise operation.
+
+    The batched flags indicate which values carry the batch axis. New axes
+    are inserted right after the batch axis of the batched values, so all of
+    them have as many dimensions per scenario as the operand with the most
+    dimensions. The values of each scenario are then broadcast as if the
+    scenario was evaluated on its own. Returns a list with the aligned values.
+    """
+
+    scenario_ndims = [np.ndim(value) - is_batched for value, is_batched in zip(values, batched)]
+    ndim = max(scenario_ndims)
+
+    aligned_values = []
+    for value, is_batched, scenario_ndim in zip(values, batched, scenario_ndims):
+        if is_batched and scenario_ndim < ndim:
+            shape = np.shape(value)
+            value = np.reshape(value, shape[:1] + (1,) * (ndim - scenario_ndim) + shape[1:])
+        aligned_values.append(value)
+
+    return aligned_values
@@ -0,0 +1,69 @@
+"""
+This module contains the helpers for the objects that the generated code of a
+diagram refers to by name (its bindings.)
+
+Some values cannot be written as code efficiently, like large NumPy arrays,
+whose representations are slow to create and parse and are truncated beyond
+NumPy's print thresholds. Instead, the components bind these values to their
+diagram (see BlockDiagram.bind), the generated code refers to them by name,
+and the objects themselves are placed in the namespace where the code is
+executed, so they are neither copied nor parsed.
+
+When the code is written to a script, the bindings are defined at the top of
+the script. Large arrays are saved next to the script as .npy files, which the
+script memory-maps when it's imported.
+"""
+
+__all__ = ["INLINE_SIZE", "create_binding_code", "get_binding_key"]
+
+
+import os
+import hashlib
+
+import numpy as np
+
+
+INLINE_SIZE = 64  # Arrays with more elements than this are saved to .npy files when writing a script
+
+
+def get_binding_key(value):
+    """Return a key that is shared by the values with the same contents.
+
+    Only arrays are compared by their contents, since hashing them is cheap
+    compared to storing them twice. Returns None for any other value, so it's
+    only shared with itself.
+    """
+
+    if isinstance(value, np.ndarray) and not value.dtype.hasobject:
+        contents = hashlib.sha1(np.ascontiguousarray(value).data).hexdigest()
+        return type(value), value.dtype.str, value.shape, contents
+    return None
+
+
+def create_binding_code(bindings, file_path):
+    """Create the code that defines the bindings at the top of a script.
+
+    The arrays with more than INLINE_SIZE elements are saved in the script's
+    directory, in .npy files named after the script and the binding. The
+    rest of the values are written with their representations, so they must
+    be valid code.
+    """
+
+    if not bindings:
+        return ""
+
+    dir_path, filename = os.path.split(file_path)
+    script_name = os.path.splitext(filename)[0]
+    lines = ["import os as _os", "import numpy as _np", "", "",
+             "_bindings_dir = _os.path.dirname(_os.path.abspath(__file__))"]
+    for name, value in bindings.items():
+        if isinstance(value, np.ndarray) and value.size > INLINE_SIZE and not value.dtype.hasobject:
+            array_filename = script_name + name + ".npy"
+            np.save(os.path.join(dir_path, array_filename), value, allow_pickle=False)
+            lines.append('{} = _np.load(_os.path.join(_bindings_dir, "{}"), mmap_mode="r")'.format(name, array_filename))
+        elif isinstance(value, np.ndarray):
+            lines.append("{} = _np.array({!r}, dtype={!r})".format(name, value.tolist(), value.dtype.str))
+        else:
+            lines.append("{} = {!r}".format(name, value))
+
+    return "\n".join(lines) + "\n\n\n"
@@ -0,0 +1,195 @@
+"""
+This module contains an on-disk cache for the code generated by BlockDiagram
+objects.
+
+Building a diagram verifies, organizes and generates the code of every one of
+its components, which can take a while for large diagrams. Since the code only
+depends on the structure of a diagram, the cache stores the generated code
+string and its compiled code object under a fingerprint of that structure. A
+later build of an identical diagram can then load the code directly.
+
+The fingerprint is computed over the following:
+
+    - The type of every component (and the modification time of the module
+      that defines it, so editing a component class invalidates its entries.)
+
+    - The modification times of the modules that generate the code: the
+      modules of the base classes of the components, the modules of the
+      runner's Builder and Organizer classes (and their base classes) and the
+      modules of the optimization passes. Editing the code generator or an
+      optimization pass invalidates every entry.
+
+    - The name, inputs, outputs, parameters, library dependencies and sample
+      time of every component.
+
+    - The step size and solver of the diagram's continuous components.
+
+    - The options given to the build and the Python version, since code
+      objects can only be loaded by the same Python version that compiled
+      them (like the files in __pycache__.)
+
+Each entry is stored as a single file in the cache directory. When the size of
+all the entries goes beyond the cache's maximum size, the least recently used
+entries are evicted.
+"""
+
+import os
+import sys
+import marshal
+import hashlib
+import importlib
+
+
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024  # Default maximum size of a cache directory (in bytes)
+
+_ENTRY_EXT = ".pyrunner-cache"  # Extension of the cache entry files
+_MODULE_STAMPS = {}  # Memoized modification times of the modules that generate the code
+_CODEGEN_MODULES = ("pyrunner.optimizers.buffers",
+                    "pyrunner.optimizers.cse",
+                    "pyrunner.optimizers.dead_comps",
+                    "pyrunner.optimizers.invariants",
+                    "pyrunner.utils.expr_optimizer.regex_generator")  # Modules of the optimization passes
+
+
+# Fingerprint functions
+
+def fingerprint(diagram, **build_options):
+    """Compute the structural fingerprint of a diagram.
+
+    The build options that change the generated code must be given as keyword
+    arguments, so they are part of the fingerprint.
+    """
+
+    sha = hashlib.sha256()
+    sha.update(sys.implementation.cache_tag.encode())
+    sha.update(repr(sorted(build_options.items())).encode())
+    sha.update("\0{!r}\0{}".format(diagram.step_size, diagram.solver).encode())
+
+    _update_with_component(sha, diagram)
+    comp_types = {type(diagram)}
+    for comp in diagram.walk():
+        _update_with_component(sha, comp)
+        comp_types.add(type(comp))
+    _update_with_codegen_modules(sha, diagram, comp_types)
+
+    return sha.hexdigest()
+
+
+def _update_with_component(sha, comp):
+
+    comp_type = type(comp)
+    sha.update("\0{}.{}@{}".format(comp_type.__module__, comp_type.__qualname__,
+                                   _get_module_stamp(comp_type.__module__)).encode())
+    sha.update("\0{}\0{}\0{!r}\0{!r}".format(comp.sys.name, comp.name, comp.lib_deps, comp.sample_time).encode())
+
+    for prop_name in ("inputs", "outputs", "parameters"):
+        sha.update(("\0" + prop_name).encode())
+        for key, value in getattr(comp, prop_name).items():
+            sha.update("\0{}=".format(key).encode())
+            sha.update(_get_value_token(value, prop_name))
+
+
+def _update_with_codegen_modules(sha, diagram, comp_types):
+
+    module_names = set(_CODEGEN_MODULES)
+    for cls in list(comp_types) + [diagram.runner.Builder, diagram.runner.Organizer]:
+        module_names.update(base.__module__ for base in cls.__mro__)
+
+    for module_name in sorted(module_names):
+        sha.update("\0{}@{}".format(module_name, _get_module_stamp(module_name)).encode())
+
+
+def _get_module_stamp(module_name):
+
+    if module_name not in _MODULE_STAMPS:
+        try:
+            _MODULE_STAMPS[module_name] = os.stat(importlib.import_module(module_name).__file__).st_mtime_ns
+        except (ImportError, AttributeError, OSError, TypeError):  # Module without a source file
+            _MODULE_STAMPS[module_name] = None
+    return _MODULE_STAMPS[module_name]
+
+
+def _get_value_token(value, prop_name):
+
+    if value is None:
+        return b"None"
+    if prop_name != "parameters":  # Inputs and outputs are components, which are identified by their names
+        return value.name.encode()
+
+    # Arrays are hashed by their contents since their representations are truncated
+    if hasattr(value, "tobytes") and hasattr(value, "dtype"):
+        return "{}{}{}".format(type(value).__name__, value.dtype.str, value.shape).encode() + value.tobytes()
+    return "{}:{!r}".format(type(value).__name__, value).encode()
+
+
+# Cache definition
+
+class BuildCache(object):
+    """Size-bounded directory of generated code entries.
+
+    Each entry holds the generated code string of a diagram (which is what
+    is written when building a diagram into a script) and its compiled code
+    object (which is what is executed otherwise.)
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+
+        self.cache_dir = cache_dir  # Directory where the entries are stored
+        self.max_size = max_size  # Maximum size of all the entries in bytes
+
+    def load(self, key):
+        """Return the code string and the code object stored under the key.
+
+        Returns None if there is no entry with the given key.
+        """
+
+        entry_path = self._get_entry_path(key)
+        try:
+            with open(entry_path, "rb") as entry_file:
+                code, compiled_code = marshal.load(entry_file)
+        except (OSError, EOFError, ValueError, TypeError):  # Missing or corrupted entry
+            return None
+
+        os.utime(entry_path)  # Mark entry as recently used
+        return code, compiled_code
+
+    def store(self, key, code, compiled_code):
+        """Store the code string and the code object under the key."""
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file first, so other processes never load a partially written entry
+        entry_path = self._get_entry_path(key)
+        temp_path = "{}.{}.tmp".format(entry_path, os.getpid())
+        with open(temp_path, "wb") as entry_file:
+            marshal.dump((code, compiled_code), entry_file)
+        os.replace(temp_path, entry_path)
+
+        self.evict()
+
+    def evict(self):
+        """Remove the least recently used entries until the size of the cache
+        is within its maximum size.
+        """
+
+        entries = []
+        cache_size = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(_ENTRY_EXT):
+                entry_stat = entry.stat()
+                entries.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+                cache_size += entry_stat.st_size
+
+        entries.sort()  # Least recently used entries go first
+        for _, entry_size, entry_path in entries:
+            if cache_size <= self.max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:  # Entry was removed by another process
+                pass
+            cache_size -= entry_size
+
+    def _get_entry_path(self, key):
+
+        return os.path.join(self.cache_dir, key + _ENTRY_EXT)
@@ -44,38 +44,7 @@ class classproperty(object):
     def persistent(name, value, doc=None):
         """Constructor that returns an immutable classproperty."""
 
-        # Generate classproperty's fget, fset, and fdel
-
-        def read_only_setter(*args):  # This prevents  user from changing the value
-            raise AttributeError('Class attribute "' + name + '" cannot change its value')
-
-        def constant_getter(_):  # This will always get a constant value
-            return value
-
-        def read_only_deleter(_):  # This prevents a user from deleting the value
-            raise AttributeError('Class attribute "' + name + '" cannot be deleted')
-
-        # Define classproperty object
-
-        const_cls_prop = classproperty(constant_getter, read_only_setter, read_only_deleter, doc)
-        const_cls_prop.name = name  # Set property name
-
-        # Define protocol blocker to prevent user from directly changing the accessor decorators
-
-        def _create_protocol_block(protocol_name):
-
-            def blocker(*args):
-                raise AttributeError("Cannot modify class attribute's" + protocol_name)
-
-            return blocker
-
-        # Restrict user from changing classproperty's fget, fset, and fdel
-
-        const_cls_prop.getter = _create_protocol_block("getter")
-        const_cls_prop.setter = _create_protocol_block("setter")
-        const_cls_prop.deleter = _create_protocol_block("deleter")
-
-        return const_cls_prop
+        return _persistent_classproperty(name, value, doc)
 
     def __get__(self, obj, cls=None):
 
@@ -140,6 +109,49 @@ class classproperty(object):
         return obj, type(obj)
 
 
+class _persistent_classproperty(classproperty):
+    """Immutable classproperty that always returns the same value.
+
+    Every component class creates a few of these when it's defined, so the
+    value is kept in a slot and the accessors are methods of this class
+    instead of functions created for each classproperty.
+    """
+
+    __slots__ = ("name", "value")
+
+    def __init__(self, name, value, doc=None):
+
+        super(_persistent_classproperty, self).__init__(doc=doc)
+        self.name = name  # Set property name
+        self.value = value
+
+    def __get__(self, obj, cls=None):
+
+        return self.value
+
+    def __set__(self, obj, value):  # This prevents the user from changing the value
+
+        raise AttributeError('Class attribute "' + self.name + '" cannot change its value')
+
+    def __delete__(self, obj):  # This prevents the user from deleting the value
+
+        raise AttributeError('Class attribute "' + self.name + '" cannot be deleted')
+
+    # Restrict user from changing classproperty's fget, fset, and fdel
+
+    def getter(self, fget=None):
+
+        raise AttributeError("Cannot modify class attribute's getter")
+
+    def setter(self, fset=None):
+
+        raise AttributeError("Cannot modify class attribute's setter")
+
+    def deleter(self, fdel=None):
+
+        raise AttributeError("Cannot modify class attribute's deleter")
+
+
 class CPEnabledMeta(type):
     """
     A metaclass to ensure classproperty objects work as intended when used with
@@ -174,14 +186,13 @@ class CPEnabledMeta(type):
         super(CPEnabledMeta, cls).__delattr__(name)  # Proceed to delete class attribute
 
 
-class CPEnabled(object):
+class CPEnabled(metaclass=CPEnabledMeta):
     """
     A helper class for CPMeta that enables class properties by inheriting from
     this class directly.
     """
 
     __slots__ = ()
-    __metaclass__ = CPEnabledMeta
 
 
 class abstractclassproperty(classproperty):
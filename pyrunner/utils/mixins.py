@@ -13,11 +13,10 @@ class CPEnabledTypeABCMeta(CPEnabledMeta, TypeABCMeta):
     """
 
 
-class CPEnabledTypeABC(object):
+class CPEnabledTypeABC(metaclass=CPEnabledTypeABCMeta):
     """
     A helper class for CPEnabledTypeABCMeta that enables using classproperties
     and type checking for ABCs just by inhereting from this class directly.
     """
 
     __slots__ = ()
-    __metaclass__ = CPEnabledTypeABCMeta
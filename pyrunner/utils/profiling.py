@@ -0,0 +1,69 @@
+"""
+This module contains the timing tables of instrumented systems.
+
+When a diagram is built with instrument=True, the generated code measures the
+time (with time.perf_counter_ns) that each component's Execution code takes
+on every step and accumulates it in a Profile object. The executor of the
+system gives access to this object, so the components that make a step slow
+can be found.
+"""
+
+__all__ = ["Profile"]
+
+
+class Profile(object):
+    """Cumulative timings of the components of an instrumented system.
+
+    The elapsed times (in nanoseconds) and the amount of calls of each
+    component are stored in lists that the generated code updates in place.
+    """
+
+    def __init__(self, names):
+
+        self.names = list(names)  # Names of the timed components (in order of execution)
+        self.elapsed = [0] * len(self.names)  # Total time spent in each component (in nanoseconds)
+        self.calls = [0] * len(self.names)  # Amount of times each component was evaluated
+
+    def get_cumulative_times(self):
+        """Return a dictionary with the total time spent in each component
+        (in nanoseconds.)
+        """
+
+        return dict(zip(self.names, self.elapsed))
+
+    def get_per_call_times(self):
+        """Return a dictionary with the mean time each component takes per
+        evaluation (in nanoseconds.)
+
+        Components that were never evaluated are left out.
+        """
+
+        return dict((name, elapsed / calls) for name, elapsed, calls in zip(self.names, self.elapsed, self.calls)
+                    if calls > 0)
+
+    def format_table(self):
+        """Return a table with the timings of the components, where the
+        slowest components go first.
+        """
+
+        total_time = sum(self.elapsed) or 1
+        rows = sorted(zip(self.names, self.elapsed, self.calls), key=lambda row: row[1], reverse=True)
+
+        name_width = max([len("component")] + [len(name) for name in self.names])
+        lines = ["{:<{}}  {:>10}  {:>12}  {:>13}  {:>6}".format("component", name_width, "calls", "total (ms)",
+                                                                "per call (us)", "%")]
+        for name, elapsed, calls in rows:
+            per_call = elapsed / calls / 1e3 if calls > 0 else 0.0
+            lines.append("{:<{}}  {:>10}  {:>12.3f}  {:>13.3f}  {:>6.1f}".format(name, name_width, calls, elapsed / 1e6,
+                                                                                 per_call, 100 * elapsed / total_time))
+        return "\n".join(lines)
+
+    def reset(self):
+        """Clear the timings.
+
+        The lists are cleared in place, since the generated code holds
+        references to them.
+        """
+
+        self.elapsed[:] = [0] * len(self.names)
+        self.calls[:] = [0] * len(self.names)
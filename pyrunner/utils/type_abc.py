@@ -23,6 +23,9 @@ from abc import ABCMeta
 from inspect import isabstract
 
 
+_CONSISTENT_TYPES = set()  # Pairs of method and abstract method types that were already verified
+
+
 class TypeABCMeta(ABCMeta):
     """Metaclass that verifies if an ABC's descendant classes were overriden
     with the same types (in their methods and properties) as the original ABC.
@@ -53,14 +56,24 @@ class TypeABCMeta(ABCMeta):
     @classmethod
     def _verify_type_override(mcls, cls, abs_cls):
 
+        # An ABC that declares its own abstract methods can leave the ones it inherits to its descendant classes
+        extends_interface = any(getattr(value, "__isabstractmethod__", False) for value in cls.__dict__.values())
         for abs_method_name in abs_cls.__abstractmethods__:
             method = cls.__dict__.get(abs_method_name)
-            abs_method = abs_cls.__dict__[abs_method_name]
+            abs_method = mcls._find_abstract_method(abs_cls, abs_method_name)
             if method is None:
-                mcls._raise_standard_abc_error(cls, abs_cls)
+                if not extends_interface:
+                    mcls._raise_standard_abc_error(cls, abs_cls)
             else:
                 mcls._check_type_consistency(method, abs_method, abs_method_name)
 
+    @staticmethod
+    def _find_abstract_method(abs_cls, abs_method_name):
+
+        for base_cls in abs_cls.__mro__:  # The abstract method might be inherited from another ABC
+            if abs_method_name in base_cls.__dict__:
+                return base_cls.__dict__[abs_method_name]
+
     @staticmethod
     def _raise_standard_abc_error(cls, abs_cls):
 
@@ -73,13 +86,16 @@ class TypeABCMeta(ABCMeta):
 
         method_type = type(method)
         abs_method_type = type(abs_method)
-        if all(method_type is not cls for cls in abs_method_type.__mro__ if cls is not object):
+        if (method_type, abs_method_type) in _CONSISTENT_TYPES:  # The result only depends on the types
+            return
+        if all(not issubclass(method_type, cls) for cls in abs_method_type.__mro__ if cls is not object):
             possible_types = [cls.__name__ for cls in abs_method_type.__mro__ if cls is not object]
             raise TypeError('The method "{}" must be '.format(abs_method_name) +
                             'one of the following types: {}.'.format(", ".join(possible_types)))
+        _CONSISTENT_TYPES.add((method_type, abs_method_type))
 
 
-class TypeABC:
+class TypeABC(metaclass=TypeABCMeta):
     """Helper class for the TypeABCMeta metaclass.
 
     It enables ABCs that verify if its child classes have overridden the
@@ -88,4 +104,3 @@ class TypeABC:
     """
 
     __slots__ = ()
-    __metaclass__ = TypeABCMeta
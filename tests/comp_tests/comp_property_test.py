@@ -0,0 +1,97 @@
+import pytest
+
+from pyrunner.components import *
+
+
+# Global test components definitions and set-ups
+
+MAIN_SYS = systems.BlockDiagram("comp_property_sys", "seq")
+
+consts = [sources.Constant(MAIN_SYS, value=i) for i in range(4)]
+
+
+# Test functions
+
+def test_order_invariant_property():
+
+    adder = math_op.Sum(MAIN_SYS, comp_signs="++++")
+    adder.inputs.add(consts[0], consts[1], consts[0], consts[2])
+
+    assert list(adder.inputs) == ["inputs_1", "inputs_2", "inputs_3", "inputs_4"]
+    assert adder.inputs == {"inputs_1": consts[0], "inputs_2": consts[1], "inputs_3": consts[0],
+                            "inputs_4": consts[2]}
+    assert adder.inputs["inputs_2"] is consts[1] and "inputs_5" not in adder.inputs
+
+    # Deleting an entry shifts the values after it to the left
+    assert adder.inputs.pop("inputs_2") is consts[1]
+    assert adder.inputs.sort() == [consts[0], consts[0], consts[2]]
+    assert adder.inputs.popitem() == ("inputs_3", consts[2])
+
+    # Every entry with the value is removed
+    adder.inputs.remove(consts[0])
+    assert len(adder.inputs) == 0 and consts[0].consumers == []
+
+    adder.inputs.add(consts[3])
+    adder.inputs.update(inputs_1=consts[1])
+    assert dict(adder.inputs.items()) == {"inputs_1": consts[1]}
+    assert consts[1].consumers == [adder] and consts[3].consumers == []
+
+    with pytest.raises(AttributeError):
+        adder.inputs["inputs_1"] = consts[2]  # Entries are only modified through the methods
+    with pytest.raises(KeyError):
+        adder.inputs.update(inputs_2=consts[2])
+    with pytest.raises(TypeError):
+        adder.inputs.add(1)
+
+    MAIN_SYS.remove_components(adder)  # Tear down test components
+
+
+def test_guarded_item_methods():
+
+    adder = math_op.Sum(MAIN_SYS, comp_signs="++")
+
+    # The public methods write and delete the entries through the item methods, which check every entry
+    with pytest.raises(TypeError):
+        adder.inputs.add(consts[0], 1)
+    assert len(adder.inputs) == 0
+    adder.inputs.add(consts[0])
+    with pytest.raises(TypeError):
+        adder.inputs.update(inputs_1=1)
+
+    # The item methods are locked again after every method, even if it failed
+    with pytest.raises(AttributeError):
+        adder.inputs["inputs_1"] = consts[1]
+    with pytest.raises(AttributeError):
+        del adder.inputs["inputs_1"]
+    with pytest.raises(AttributeError):
+        adder.inputs.setdefault("inputs_2", consts[1])  # The other MutableMapping methods are locked too
+
+    adder.inputs.add(consts[1], consts[2])
+    assert adder.inputs.pop("inputs_1") is consts[0] and adder.inputs.popitem() == ("inputs_2", consts[2])
+    assert adder.inputs == {"inputs_1": consts[1]} and consts[0].consumers == []
+
+    MAIN_SYS.remove_components(adder)  # Tear down test components
+
+
+def test_order_dependent_property():
+
+    absolute = math_op.Abs(MAIN_SYS)
+    absolute_1 = math_op.Abs(MAIN_SYS)
+    assert absolute.inputs == {"input": None}
+    assert absolute.inputs._slots is absolute_1.inputs._slots  # The slots of the same variables are shared
+
+    absolute.inputs.add(input=consts[0])
+    assert list(absolute.inputs.values()) == [consts[0]]
+
+    # Removing a value leaves its variable empty
+    absolute.inputs.remove(consts[0])
+    assert absolute.inputs == {"input": None}
+
+    with pytest.raises(KeyError):
+        absolute.inputs.add(other=consts[0])
+    with pytest.raises(AttributeError):
+        absolute.inputs.pop("input")
+    with pytest.raises(AttributeError):
+        absolute.inputs.sort()
+
+    MAIN_SYS.remove_components(absolute, absolute_1)  # Tear down test components
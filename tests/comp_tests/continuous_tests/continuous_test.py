@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+
+def test_integrator():
+
+    diagram = systems.BlockDiagram("integ_sys", "seq")
+    diagram.step_size = 0.5
+
+    x = signal_routers.Tag(diagram, "x")
+    integ = continuous.Integrator(diagram, initial_condition=[1.0, -1.0])
+    integ.inputs.add(input=x)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(integ)
+    diagram.build()
+
+    # The output of each step is the integral up to the start of the step
+    assert np.array_equal(executors.run("integ_sys", {"x": 2.0})["integ"], [1.0, -1.0])
+    assert np.array_equal(executors.run("integ_sys", {"x": [4.0, 2.0]})["integ"], [2.0, 0.0])
+    assert np.array_equal(executors.run("integ_sys", {"x": 0.0})["integ"], [4.0, 1.0])
+
+
+def test_feedback_loop():
+
+    # Exponential decay (dy/dt = -y) with an integrator and with a state-space component
+    diagram = systems.BlockDiagram("decay_sys", "seq")
+    diagram.step_size = 0.01
+
+    integ = continuous.Integrator(diagram, initial_condition=1.0)
+    neg_integ = math_op.Sum(diagram, comp_signs="-")
+    neg_integ.inputs.add(integ)
+    integ.inputs.add(input=neg_integ)
+
+    zero = sources.Constant(diagram, value=0.0)
+    state_space = continuous.StateSpace(diagram, A=[[-1.0, 0.0], [0.0, -2.0]], B=[[1.0], [1.0]],
+                                        C=[[1.0, 0.0], [0.0, 1.0]], initial_condition=[1.0, 1.0])
+    state_space.inputs.add(input=zero)
+
+    diagram.outputs.add(integ, state_space)
+    diagram.build()
+
+    for _ in range(100):
+        outputs = executors.run("decay_sys")
+
+    # The inputs are held during each step, so the loop through the integrator follows Euler's method
+    time = 99 * diagram.step_size
+    assert outputs["integ"] == pytest.approx((1 - diagram.step_size) ** 99)
+    assert np.allclose(outputs["state_space"], np.exp([-time, -2 * time]), rtol=1e-8)
+
+
+def test_euler_solver():
+
+    diagram = systems.BlockDiagram("euler_sys", "seq")
+    diagram.step_size = 0.1
+    diagram.solver = "euler"
+
+    one = sources.Constant(diagram, value=1.0)
+    state_space = continuous.StateSpace(diagram, A=[[-1.0]], B=[[1.0]], C=[[2.0]])
+    state_space.inputs.add(input=one)
+
+    diagram.outputs.add(state_space)
+    diagram.build()
+
+    outputs = [executors.run("euler_sys")["state_space"][0] for _ in range(3)]
+    assert outputs == pytest.approx([0.0, 0.2, 0.38])
+
+
+def test_state_space_errors():
+
+    diagram = systems.BlockDiagram("bad_ss_sys", "seq")
+
+    one = sources.Constant(diagram, value=1.0)
+    state_space = continuous.StateSpace(diagram, A=[[-1.0, 0.0]], B=[[1.0]], C=[[1.0]])
+    state_space.inputs.add(input=one)
+
+    with pytest.raises(ValueError):  # The state matrix is not square
+        diagram.build()
+
+
+def test_stacked_blocks():
+
+    # Blocks with the same shapes share a stack, so a step does not loop over the blocks
+    states = continuous.StateVector(0.01)
+    for index in range(50):
+        states.add(index, [float(index)], np.array([[-1.0]]), np.array([[2.0]]), np.array([[0.5]]))
+    states.add(50, [1.0, 2.0])
+    states.add(51, 3.0)
+
+    outputs = states.get_outputs()
+    assert len(states._state_stacks) == 1 and states._state_stacks[0][2].shape == (50, 1, 1)
+    assert outputs[49] == pytest.approx([24.5]) and np.array_equal(outputs[50], [1.0, 2.0]) and outputs[51] == 3.0
+
+    inputs = [np.ones(1)] * 50 + [[1.0, -1.0], 2.0]
+    states.step(inputs)
+    outputs = states.get_outputs()
+    time = states.step_size
+    assert outputs[49] == pytest.approx([0.5 * (2 + 47 * np.exp(-time))])  # dx/dt = -x + 2 from x = 49
+    assert np.allclose(outputs[50], [1.01, 1.99]) and outputs[51] == pytest.approx(3.02)
+
+
+@pytest.mark.parametrize("solver", ["euler", "rk4"])
+def test_scalar_input_blocks(solver):
+
+    # A scalar input is broadcast to every state of its block, even when the block shares the state vector
+    diagram = systems.BlockDiagram("scalar_input_{}_sys".format(solver), "seq")
+    diagram.step_size = 0.5
+    diagram.solver = solver
+
+    x = signal_routers.Tag(diagram, "x")
+    integ = continuous.Integrator(diagram, initial_condition=[1.0, -1.0])
+    integ.inputs.add(input=x)
+    integ_1 = continuous.Integrator(diagram, initial_condition=0.0)
+    integ_1.inputs.add(input=x)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(integ, integ_1)
+    diagram.build()
+
+    executors.run(diagram.name, {"x": 2.0})
+    executors.run(diagram.name, {"x": 4.0})
+    outputs = executors.run(diagram.name, {"x": 0.0})
+    assert np.array_equal(outputs["integ"], [4.0, 2.0]) and outputs["integ_1"] == 3.0
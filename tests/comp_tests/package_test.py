@@ -0,0 +1,31 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+import pyrunner.components as comps
+
+
+# Test functions
+
+def test_lazy_imports():
+
+    # The subpackages (and NumPy) are only imported when they are accessed
+    code = ("import sys, pyrunner.components as comps, pyrunner.runners as runners\n"
+            "assert 'numpy' not in sys.modules and 'pyrunner.components.sources' not in sys.modules\n"
+            "assert 'pyrunner.runners.registry' not in sys.modules\n"
+            "assert comps.Constant is comps.sources.Constant and 'pyrunner.components.systems' not in sys.modules\n"
+            "assert runners.executors.run is not None\n")
+    root_dir = os.path.dirname(os.path.dirname(comps.__path__[0]))
+    subprocess.run([sys.executable, "-c", code], cwd=root_dir, check=True)
+
+
+def test_exported_names():
+
+    assert comps.BlockDiagram is comps.systems.BlockDiagram
+    assert comps.generate_prop_info is comps.base_comp.generate_prop_info
+    assert set(comps.__all__) <= set(dir(comps))
+
+    with pytest.raises(AttributeError):
+        comps.Unknown
@@ -1,4 +1,10 @@
+import gc
+import weakref
+
+import pytest
+
 import pyrunner.components as comps
+from pyrunner.runners import executors
 
 
 class TestSystem(comps.systems.BaseSubsystem):
@@ -135,6 +141,124 @@ def _test_block_diagram_unregister_component_name():
     print(const, const_2, const_3)  # This should be "const, const_1, const_2"
 
 
+def test_block_diagram_name_index():
+
+    diagram = comps.systems.BlockDiagram("name_index_sys", "seq")
+
+    consts = [comps.sources.Constant(diagram) for _ in range(5)]
+    constant = comps.sources.Constant(diagram, "constant_2")  # Shares the prefix, but not the basename
+    sub_sys = TestSystem(diagram)
+    sub_const = comps.sources.Constant(sub_sys)  # Named after its subsystem, so it does not share the basename
+
+    # A custom name that was already generated shifts the names with greater or equal indices to the right
+    custom_const = comps.sources.Constant(diagram, "const_2")
+    assert [comp.name for comp in consts] == ["const", "const_1", "const_3", "const_4", "const_5"]
+    assert custom_const.name == "const_2"
+
+    # Removing a component shifts the names with greater indices to the left
+    diagram.remove_components(consts[0])
+    assert [comp.name for comp in consts[1:] + [custom_const]] == ["const", "const_2", "const_3", "const_4", "const_1"]
+    assert (constant.name, sub_const.name) == ("constant_2", "test_const")
+
+    # The names that are left are still shifted correctly
+    diagram.remove_components(custom_const)
+    assert [comp.name for comp in consts[1:]] == ["const", "const_1", "const_2", "const_3"]
+    new_const = comps.sources.Constant(diagram)
+    assert new_const.name == "const_4"
+
+
+def test_block_diagram_remove_many_components():
+
+    diagram = comps.systems.BlockDiagram("remove_many_sys", "seq")
+    single_diagram = comps.systems.BlockDiagram("remove_single_sys", "seq")
+
+    consts = [comps.sources.Constant(diagram) for _ in range(10)] + [comps.sources.Constant(diagram, "const_20")]
+    single_consts = [comps.sources.Constant(single_diagram) for _ in range(10)] + \
+        [comps.sources.Constant(single_diagram, "const_20")]
+    diagram._dirty_comps.clear()
+
+    # Removing the components at once (even twice) gives the same names as removing them one at a time
+    removed = [7, 3, 4]
+    diagram.remove_components(*[consts[index] for index in removed] + [consts[3]])
+    for index in removed:
+        single_diagram.remove_components(single_consts[index])
+    assert [comp.name for comp in diagram.comps] == [comp.name for comp in single_diagram.comps]
+    assert [comp.name for comp in diagram.comps] == ["const", "const_1", "const_2", "const_3", "const_4", "const_5",
+                                                     "const_6", "const_20"]
+    assert diagram._name_mgr._registry == {"remove_many_sys": 1, "const": 7, "const_20": 1}
+
+    # Only the renamed components are marked dirty, besides the removed ones
+    assert all(consts[index] not in diagram.comps for index in removed)
+    assert sorted(comp.name for comp in diagram._dirty_comps if comp in diagram.comps) == \
+        ["const_3", "const_4", "const_5", "const_6"]
+    assert comps.sources.Constant(diagram).name == "const_7"
+
+
+def test_block_diagram_consumers():
+
+    diagram = comps.systems.BlockDiagram("consumers_sys", "seq")
+
+    const = comps.sources.Constant(diagram, value=1)
+    const_1 = comps.sources.Constant(diagram, value=2)
+    adder = comps.math_op.Sum(diagram, comp_signs="++-")
+    adder.inputs.add(const, const_1, const)
+    absolute = comps.math_op.Abs(diagram)
+    absolute.inputs.add(input=adder)
+    diagram.outputs.add(absolute)
+
+    assert const.consumers == [adder] and const._referrers["inputs"][adder] == 2
+    assert adder.consumers == [absolute]
+    assert absolute._referrers["outputs"] == {diagram: 1}
+
+    # Inputs and consumers of each component by index in the diagram's component list
+    assert [list(array) for array in diagram.adjacency()] == [[0, 0, 0, 3, 4], [0, 1, 0, 2]]
+    assert [list(array) for array in diagram.adjacency(fan_out=True)] == [[0, 2, 3, 4, 4], [2, 2, 2, 3]]
+
+    # Removing a component that fills more than one input only touches its consumers
+    diagram.remove_components(const)
+    assert list(adder.inputs.values()) == [const_1]
+    assert const._referrers["inputs"] == {} and const not in diagram.comps
+
+    diagram.remove_components(absolute)
+    assert list(diagram.outputs.values()) == [] and adder.consumers == []
+
+    diagram.clear_diagram()
+    assert diagram.comps == [] and const_1.consumers == []
+
+
+def test_block_diagram_freeze():
+
+    diagram = comps.systems.BlockDiagram("freeze_sys", "seq")
+
+    x = comps.signal_routers.Tag(diagram, "x")
+    const = comps.sources.Constant(diagram, value=2)
+    adder = comps.math_op.Sum(diagram, comp_signs="++")
+    adder.inputs.add(x, const)
+    diagram.inputs.add(x)
+    diagram.outputs.add(adder)
+    diagram.build()
+
+    assert not hasattr(adder, "__dict__") and not hasattr(adder.inputs, "__dict__")
+
+    diagram.freeze()
+    assert diagram.frozen and diagram not in comps.systems.BlockDiagram._DIAGRAMS
+    assert adder.code_str is None and diagram.organizer is None and diagram._name_mgr is None
+
+    # The executor still runs after the build state is released
+    assert executors.run("freeze_sys", {"x": 1})["add"] == 3
+
+    with pytest.raises(AttributeError):
+        diagram.build()
+    with pytest.raises(AttributeError):
+        comps.sources.Constant(diagram, value=1)
+
+    # Nothing else holds the diagram, so it is released along with its components
+    diagram_ref = weakref.ref(diagram)
+    del diagram, x, const, adder
+    gc.collect()
+    assert diagram_ref() is None
+
+
 # Test _NameManager class
 
 def test_name_manager():
@@ -0,0 +1,103 @@
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+
+def _create_edited_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value=1.0)
+
+    shifted = math_op.Sum(diagram, "shifted", comp_signs="++")
+    shifted.inputs.add(x, const)
+    abs_shifted = math_op.Abs(diagram, "abs_shifted")
+    abs_shifted.inputs.add(input=shifted)
+
+    abs_x = math_op.Abs(diagram, "abs_x")  # Does not depend on the constant
+    abs_x.inputs.add(input=x)
+    scaled = math_op.Sum(diagram, "scaled", comp_signs="-")
+    scaled.inputs.add(abs_x)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(abs_shifted, scaled)
+
+    return diagram
+
+
+def _count_generated_code(monkeypatch, comp_classes):
+
+    generated_comps = []
+    for comp_class in comp_classes:
+        def generate_code_string(comp, _generate_code_string=comp_class.generate_code_string):
+            generated_comps.append(comp.name)
+            _generate_code_string(comp)
+        monkeypatch.setattr(comp_class, "generate_code_string", generate_code_string)
+
+    return generated_comps
+
+
+def test_incremental_build(monkeypatch):
+
+    diagram = _create_edited_diagram("incremental_sys")
+    diagram.build()
+    x, const, shifted, abs_shifted, abs_x, scaled = diagram.comps
+    assert executors.run("incremental_sys", {"x": -3.0}) == {"abs_shifted": 2.0, "scaled": -3.0}
+
+    generated_comps = _count_generated_code(monkeypatch, (sources.Constant, math_op.Sum, math_op.Abs))
+
+    # Changing a parameter only regenerates the component and the components downstream of it
+    const.parameters.update(value=5.0)
+    diagram.build(incremental=True)
+    assert sorted(generated_comps) == ["abs_shifted", "const", "shifted"]
+    assert executors.run("incremental_sys", {"x": -3.0}) == {"abs_shifted": 2.0, "scaled": -3.0}
+    assert executors.run("incremental_sys", {"x": -7.0}) == {"abs_shifted": 2.0, "scaled": -7.0}
+
+    # Adding an input reorders the components
+    del generated_comps[:]
+    shifted.inputs.add(scaled)
+    shifted.parameters.update(comp_signs="++-")
+    diagram.build(incremental=True)
+    assert sorted(generated_comps) == ["abs_shifted", "shifted"]
+    assert diagram.organizer.ordered_comps.index(scaled) < diagram.organizer.ordered_comps.index(shifted)
+    assert executors.run("incremental_sys", {"x": -3.0}) == {"abs_shifted": 5.0, "scaled": -3.0}
+
+    # Removing a branch
+    del generated_comps[:]
+    diagram.outputs.remove(scaled)
+    diagram.remove_components(scaled, abs_x)
+    shifted.parameters.update(comp_signs="++")
+    diagram.build(incremental=True)
+    assert sorted(generated_comps) == ["abs_shifted", "shifted"]
+    assert executors.run("incremental_sys", {"x": -3.0}) == {"abs_shifted": 2.0}
+
+    # Without changes, every code string is reused
+    del generated_comps[:]
+    diagram.build(incremental=True)
+    assert generated_comps == []
+
+
+def test_incremental_build_matches_full_build():
+
+    diagram = _create_edited_diagram("edited_sys")
+    diagram.build()
+
+    new_const = sources.Constant(diagram, value="np.array([1.0, 2.0])")
+    diagram.comps[4].inputs.remove(diagram.comps[0])
+    diagram.comps[4].inputs.add(input=new_const)
+    diagram.build(incremental=True)
+
+    full_diagram = _create_edited_diagram("full_edited_sys")
+    full_const = sources.Constant(full_diagram, value="np.array([1.0, 2.0])")
+    full_diagram.comps[4].inputs.add(input=full_const)
+    full_diagram.build()
+
+    assert dict((comp.name, comp.code_str) for comp in diagram.walk()) == \
+        dict((comp.name, comp.code_str) for comp in full_diagram.walk())
+    for step in range(3):
+        outputs = executors.run("edited_sys", {"x": float(step)})
+        full_outputs = executors.run("full_edited_sys", {"x": float(step)})
+        for output_name, value in full_outputs.items():
+            assert np.array_equal(outputs[output_name], value)
@@ -0,0 +1,116 @@
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.optimizers import buffers
+from pyrunner.runners import executors
+
+
+def _create_chain_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    y = signal_routers.Tag(diagram, "y")
+    const = sources.Constant(diagram, value='np.array([1.0, -2.0, 3.0])')
+
+    diff = math_op.Sum(diagram, "diff", comp_signs="-+-")
+    diff.inputs.add(x, y, const)
+    abs_diff = math_op.Abs(diagram, "abs_diff")
+    abs_diff.inputs.add(input=diff)
+    shifted = math_op.Sum(diagram, "shifted", comp_signs="++")
+    shifted.inputs.add(abs_diff, x)
+    abs_shifted = math_op.Abs(diagram, "abs_shifted")
+    abs_shifted.inputs.add(input=shifted)
+    total = math_op.Sum(diagram, "total", comp_signs="+")
+    total.inputs.add(abs_shifted)
+
+    diagram.inputs.add(x, y)
+    diagram.outputs.add(total, abs_diff)
+
+    return diagram
+
+
+def test_preallocate_buffers():
+
+    diagram = _create_chain_diagram("buffered_sys")
+    diagram.build(preallocate=True)
+    _create_chain_diagram("unbuffered_sys").build()
+
+    # Outputs are never buffered and the values of diff and shifted are not alive at the same time
+    assert dict((comp.name, buffer_name) for comp, buffer_name in diagram.buffered_comps.items()) == \
+        {"diff": "_buf_0", "shifted": "_buf_1", "abs_shifted": "_buf_2"}
+    code_strs = dict((comp.name, comp.code_str) for comp in diagram.comps)
+    assert code_strs["diff"]["Warm Up"].endswith("_buf_0 = _buffers.claim(_buffer_pool, 0, diff)")
+    assert code_strs["shifted"]["Warm Up"].endswith("_buf_1 = _buffers.claim(_buffer_pool, 0, shifted)")
+    assert code_strs["abs_shifted"]["Execution"] == "abs_shifted = np.abs(shifted) if _buf_2 is None else np.abs(shifted, out=_buf_2)"
+
+    # The buffers are claimed again when the shapes of the inputs change
+    random_state = np.random.RandomState(0)
+    for shape in ((3,), (3,), (2, 3), (2, 3), (3,)):
+        inputs = {"x": random_state.normal(size=shape), "y": random_state.normal(size=shape)}
+        outputs = executors.run("buffered_sys", inputs)
+        expected_outputs = executors.run("unbuffered_sys", inputs)
+        for output_name, value in expected_outputs.items():
+            assert np.array_equal(outputs[output_name], value)
+
+    # Scalars are computed as usual
+    outputs = executors.run("buffered_sys", {"x": 1.0, "y": 2.0})
+    expected_outputs = executors.run("unbuffered_sys", {"x": 1.0, "y": 2.0})
+    for output_name, value in expected_outputs.items():
+        assert np.array_equal(outputs[output_name], value)
+
+
+def test_claim():
+
+    pool = {}
+    value = np.zeros(3)
+    same_value = np.ones(3)
+    other_value = np.ones(3, dtype=int)
+
+    assert buffers.claim(pool, 0, value) is value
+    assert buffers.claim(pool, 0, same_value) is value  # Values with the same shape and type share the buffer
+    assert buffers.claim(pool, 0, other_value) is other_value
+    assert buffers.claim(pool, 1, value[1:]) is None  # Views are not claimed
+    assert buffers.claim(pool, 1, 2.0) is None
+
+
+def _create_shared_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    y = signal_routers.Tag(diagram, "y")
+
+    absolute = math_op.Abs(diagram)
+    absolute.inputs.add(input=x)
+    absolute_1 = math_op.Abs(diagram)
+    absolute_1.inputs.add(input=y)
+    diff = math_op.Sum(diagram, "diff", comp_signs="+-+")
+    diff.inputs.add(absolute, absolute_1, x)
+    absolute_2 = math_op.Abs(diagram)
+    absolute_2.inputs.add(input=diff)
+    total = math_op.Sum(diagram, "total", comp_signs="+-++")
+    total.inputs.add(absolute, absolute_1, absolute_2, y)
+
+    diagram.inputs.add(x, y)
+    diagram.outputs.add(total)
+
+    return diagram
+
+
+def test_preallocate_shared_buffers():
+
+    diagram = _create_shared_diagram("shared_buffered_sys")
+    diagram.build(share_exprs=True, preallocate=True)
+    _create_shared_diagram("shared_unbuffered_sys").build()
+    assert diagram.shared_exprs
+
+    # The buffered code of total reads absolute, so its buffer is not given to absolute_2
+    slots = dict((comp.name, int(comp.code_str["Warm Up"].split(", ")[-2])) for comp in diagram.buffered_comps)
+    assert slots["absolute"] != slots["absolute_2"]
+
+    random_state = np.random.RandomState(1)
+    for _ in range(4):
+        inputs = {"x": random_state.normal(size=5), "y": random_state.normal(size=5)}
+        assert np.array_equal(executors.run("shared_buffered_sys", inputs)["total"],
+                              executors.run("shared_unbuffered_sys", inputs)["total"])
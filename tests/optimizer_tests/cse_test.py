@@ -0,0 +1,55 @@
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+
+def _create_repeated_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    y = signal_routers.Tag(diagram, "y")
+    z = signal_routers.Tag(diagram, "z")
+
+    # Sums that share their leading terms
+    lead_z = math_op.Sum(diagram, "lead_z", comp_signs="+-+")
+    lead_z.inputs.add(x, y, z)
+    lead_x = math_op.Sum(diagram, "lead_x", comp_signs="+--")
+    lead_x.inputs.add(x, y, x)
+
+    # Sums and absolute values of the same signals
+    total = math_op.Sum(diagram, "total", comp_signs="+")
+    total.inputs.add(x)
+    neg_total = math_op.Sum(diagram, "neg_total", comp_signs="-")
+    neg_total.inputs.add(x)
+    abs_1 = math_op.Abs(diagram, "abs_1")
+    abs_1.inputs.add(input=lead_z)
+    abs_2 = math_op.Abs(diagram, "abs_2")
+    abs_2.inputs.add(input=lead_z)
+
+    diagram.inputs.add(x, y, z)
+    diagram.outputs.add(lead_z, lead_x, total, neg_total, abs_1, abs_2)
+
+    return diagram
+
+
+def test_eliminate_common_subexpressions():
+
+    diagram = _create_repeated_diagram("cse_sys")
+    diagram.build(share_exprs=True)
+    _create_repeated_diagram("no_cse_sys").build()
+
+    assert diagram.shared_exprs == {"_cse_0": "x-y", "total": "np.sum(x)", "abs_1": "np.abs(lead_z)"}
+
+    exec_strs = dict((comp.name, comp.code_str["Execution"]) for comp in diagram.comps)
+    assert exec_strs["lead_z"] == "_cse_0 = x-y\nlead_z = _cse_0+z"
+    assert exec_strs["lead_x"] == "lead_x = _cse_0-x"
+    assert exec_strs["neg_total"] == "neg_total = -total"
+    assert exec_strs["abs_2"] == "abs_2 = abs_1"
+
+    inputs = {"x": np.arange(3.0), "y": 1.5, "z": -4.0}
+    outputs = executors.run("cse_sys", inputs)
+    expected_outputs = executors.run("no_cse_sys", inputs)
+    for output_name, value in expected_outputs.items():
+        assert np.array_equal(outputs[output_name], value)
@@ -0,0 +1,46 @@
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+
+def _create_diagnostic_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value=2)
+
+    absolute = math_op.Abs(diagram)
+    absolute.inputs.add(input=x)
+
+    # Diagnostic branch whose values never reach an output
+    diag_sum = math_op.Sum(diagram, "diag_sum", comp_signs="+-")
+    diag_sum.inputs.add(x, const)
+    diag_abs = math_op.Abs(diagram, "diag_abs")
+    diag_abs.inputs.add(input=diag_sum)
+
+    # Branch that is written to an external source through a tag
+    scaled = math_op.Sum(diagram, "scaled", comp_signs="++")
+    scaled.inputs.add(x, x)
+    written = signal_routers.Tag(diagram, "written")
+    written.inputs.add(input=scaled)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(absolute)
+
+    return diagram
+
+
+def test_eliminate_dead_components():
+
+    diagram = _create_diagnostic_diagram("pruned_sys")
+    diagram.build(prune=True)
+
+    assert sorted(comp.name for comp in diagram.pruned_comps) == ["const", "diag_abs", "diag_sum"]
+    assert [comp.name for comp in diagram.organizer.ordered_comps] == ["x", "absolute", "scaled", "written"]
+    assert executors.run("pruned_sys", {"x": -3}) == {"absolute": 3}
+
+    # Building without pruning puts the components back in the order
+    diagram.build(create_code=False)
+
+    assert diagram.pruned_comps == []
+    assert len(diagram.organizer.ordered_comps) == len(diagram.comps)
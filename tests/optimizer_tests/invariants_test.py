@@ -0,0 +1,76 @@
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.optimizers import invariants
+from pyrunner.runners import executors
+
+
+def _create_offset_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value=2)
+    const_1 = sources.Constant(diagram, value=-5)
+    const_arr = sources.Constant(diagram, value='np.array([1.0, -2.0])')
+
+    # Scalar branch that only depends on constants
+    offset = math_op.Sum(diagram, "offset", comp_signs="++")
+    offset.inputs.add(const, const_1)
+    abs_offset = math_op.Abs(diagram, "abs_offset")
+    abs_offset.inputs.add(input=offset)
+
+    # Array branch that only depends on constants
+    abs_arr = math_op.Abs(diagram, "abs_arr")
+    abs_arr.inputs.add(input=const_arr)
+
+    total = math_op.Sum(diagram, "total", comp_signs="+++")
+    total.inputs.add(x, abs_offset, abs_arr)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(total)
+
+    return diagram
+
+
+def test_hoist_invariant_components():
+
+    diagram = _create_offset_diagram("folded_sys")
+    diagram.build(fold_constants=True)
+
+    assert sorted(comp.name for comp in diagram.hoisted_comps) == ["abs_arr", "abs_offset", "offset"]
+    assert all(comp.code_str["Execution"] is None for comp in diagram.hoisted_comps)
+    assert diagram.comps[4].code_str["Set Up"] == "offset = -3"  # Plain numbers are folded into literals
+    assert diagram.comps[5].code_str["Set Up"] == "abs_offset = np.abs(offset)"  # NumPy scalars are kept
+    assert diagram.comps[6].code_str["Set Up"] == "abs_arr = np.abs(const_2)"
+
+    assert np.array_equal(executors.run("folded_sys", {"x": 1.0})["total"], [5.0, 6.0])
+
+    # Building without folding puts the code back in the execution
+    diagram.build(create_code=False)
+
+    assert diagram.hoisted_comps == []
+    assert diagram.comps[4].code_str == {"Set Up": None, "Execution": "offset = const+const_1"}
+
+
+def test_fold_only_evaluates_hoisted_components(monkeypatch):
+
+    diagram = _create_offset_diagram("partly_folded_sys")
+    scale = sources.Constant(diagram, "scale", value="np.full(2, 3.0)")  # Only used with the diagram's input
+    scaled = math_op.Sum(diagram, "scaled", comp_signs="++")
+    scaled.inputs.add(diagram.comps[0], scale)
+    diagram.outputs.add(scaled)
+
+    executed_code = []
+    def record_exec(code, namespace):
+        executed_code.append(code)
+        exec(code, namespace)
+    monkeypatch.setattr(invariants, "exec", record_exec, raising=False)
+    diagram.build(fold_constants=True)
+
+    # Besides the imports, only the hoisted components and their constants are evaluated while building
+    assert sorted(executed_code[1:]) == sorted(["const = 2", "const_1 = -5", "const_2 = np.array([1.0, -2.0])",
+                                                "offset = const+const_1", "abs_offset = np.abs(offset)",
+                                                "abs_arr = np.abs(const_2)"])
+    assert diagram.comps[4].code_str["Set Up"] == "offset = -3"
+    assert np.array_equal(executors.run("partly_folded_sys", {"x": 1.0})["scaled"], [4.0, 4.0])
@@ -0,0 +1,87 @@
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+
+def test_run_many():
+
+    diagram = systems.BlockDiagram("mp_sys", "mp")
+    assert diagram.runner_name == "mp_runner"
+
+    x = signal_routers.Tag(diagram, "x")
+    y = signal_routers.Tag(diagram, "y")
+
+    diff = math_op.Sum(diagram, comp_signs="+-")
+    diff.inputs.add(x, y)
+
+    absolute = math_op.Abs(diagram)
+    absolute.inputs.add(input=diff)
+
+    diagram.inputs.add(x, y)
+    diagram.outputs.add(absolute)
+    diagram.build()
+
+    executor = executors._POOL["mp_sys"]
+    executor.processes = 2
+
+    inputs = [{"x": np.arange(3.0) * i, "y": 4.0} for i in range(10)]
+    try:
+        outputs = executor.run_many(inputs, chunksize=3)
+    finally:
+        executor.close()
+
+    assert len(outputs) == len(inputs)
+    for output, input_ in zip(outputs, inputs):
+        assert np.array_equal(output["absolute"], executor.run(input_)["absolute"])
+
+
+def test_run_many_bound_constants():
+
+    diagram = systems.BlockDiagram("mp_bound_sys", "mp")
+
+    x = signal_routers.Tag(diagram, "x")
+    weights = sources.Constant(diagram, value=np.arange(100.0))  # The workers receive the array with the source
+
+    adder = math_op.Sum(diagram, comp_signs="++")
+    adder.inputs.add(x, weights)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(adder)
+    diagram.build()
+
+    executor = executors._POOL["mp_bound_sys"]
+    executor.processes = 2
+    try:
+        outputs = executor.run_many([{"x": float(i)} for i in range(4)])
+    finally:
+        executor.close()
+
+    for i, output in enumerate(outputs):
+        assert np.array_equal(output["add"], np.arange(100.0) + i)
+
+
+def test_run_many_independent_executions():
+
+    diagram = systems.BlockDiagram("mp_stateful_sys", "mp")
+
+    x = signal_routers.Tag(diagram, "x")
+    integ = continuous.Integrator(diagram, initial_condition=1.0)  # Its state changes on every step
+    integ.inputs.add(input=x)
+
+    adder = math_op.Sum(diagram, comp_signs="++")
+    adder.inputs.add(x, integ)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(adder)
+    diagram.build()
+
+    # Every worker receives several tasks, and none of them sees the state left by the previous ones
+    executor = executors._POOL["mp_stateful_sys"]
+    executor.processes = 2
+    try:
+        outputs = executor.run_many([{"x": 2.0}] * 8, chunksize=1)
+    finally:
+        executor.close()
+
+    assert outputs == [{"add": 3.0}] * 8
@@ -0,0 +1,97 @@
+import sys
+
+import pytest
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+
+
+def test_deep_chain_order():
+
+    # The components are created from the output to the input, so every one of them waits for the next one
+    diagram = systems.BlockDiagram("deep_chain_sys", "seq")
+
+    depth = 2 * sys.getrecursionlimit()
+    chain = [math_op.Abs(diagram) for _ in range(depth)]
+    for comp, input_comp in zip(chain, chain[1:]):
+        comp.inputs.add(input=input_comp)
+    x = signal_routers.Tag(diagram, "x")
+    chain[-1].inputs.add(input=x)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(chain[0])
+    diagram.build()
+
+    assert diagram.organizer.ordered_comps == [x] + chain[::-1]
+    assert executors.run("deep_chain_sys", {"x": -2}) == {chain[0].name: 2}
+
+
+def test_creation_order_is_kept():
+
+    diagram = systems.BlockDiagram("creation_order_sys", "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    late_input = math_op.Abs(diagram, "late_input")
+    early = math_op.Sum(diagram, "early", comp_signs="++")
+    middle = math_op.Abs(diagram, "middle")
+    middle.inputs.add(input=x)
+    late = math_op.Abs(diagram, "late")
+    late.inputs.add(input=middle)
+    early.inputs.add(x, late)  # Waits for late, so it goes right after it
+    late_input.inputs.add(input=early)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(late_input)
+    diagram.organize()
+
+    assert [comp.name for comp in diagram.organizer.ordered_comps] == ["x", "middle", "late", "early", "late_input"]
+
+
+def test_feedback_loop_cut():
+
+    diagram = systems.BlockDiagram("cut_loop_sys", "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    adder = math_op.Sum(diagram, comp_signs="++")
+    integ = continuous.Integrator(diagram)
+    gain = math_op.Abs(diagram)
+    adder.inputs.add(x, integ)
+    integ.inputs.add(input=gain)
+    gain.inputs.add(input=adder)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(adder)
+    diagram.organize()
+
+    # Only the input of the adder that comes from the integrator is removed
+    assert diagram.organizer.feedback_loops == [[adder, integ, gain]]
+    assert diagram.organizer.ordered_comps == [x, adder, gain, integ]
+    assert diagram.organizer.sys_info[adder]['inputs'] == [x]
+    assert diagram.organizer.sys_info[integ]['inputs'] == [gain]
+
+
+def test_algebraic_loops():
+
+    diagram = systems.BlockDiagram("algebraic_loop_sys", "seq")
+
+    first = math_op.Abs(diagram, "first")
+    second = math_op.Abs(diagram, "second")
+    first.inputs.add(input=second)
+    second.inputs.add(input=first)
+
+    # A loop that can be cut does not show up in the error
+    integ = continuous.Integrator(diagram)
+    neg_integ = math_op.Sum(diagram, "neg_integ", comp_signs="-")
+    neg_integ.inputs.add(integ)
+    integ.inputs.add(input=neg_integ)
+
+    third = math_op.Sum(diagram, "third", comp_signs="++")
+    fourth = math_op.Abs(diagram, "fourth")
+    third.inputs.add(first, fourth)
+    fourth.inputs.add(input=third)
+
+    with pytest.raises(Exception) as error_info:
+        diagram.organize()
+
+    assert str(error_info.value).endswith("feedback loops: [first, second]; [third, fourth]")
+    assert len(diagram.organizer.feedback_loops) == 3
@@ -0,0 +1,88 @@
+from importlib import metadata
+
+import pytest
+
+from pyrunner.components import *
+from pyrunner.runners import registry, seq_runner, mp_runner
+
+
+# Test functions
+
+def test_get_runner():
+
+    assert registry.get_runner("seq") == (seq_runner, "seq_runner")
+    assert registry.get_runner("seq_runner") == (seq_runner, "seq_runner")
+    assert registry.get_runner("mp") == (mp_runner, "mp_runner")
+    assert "base_runner" not in registry.get_runner_names()
+
+    with pytest.raises(ModuleNotFoundError):
+        registry.get_runner("runner")  # Names are not matched by substrings
+    with pytest.raises(TypeError):
+        registry.get_runner(1)
+
+
+def test_register(monkeypatch):
+
+    monkeypatch.setattr(registry, "_RUNNERS", dict(registry._RUNNERS))
+    monkeypatch.setattr(registry, "_ALIASES", dict(registry._ALIASES))
+
+    registry.register("custom", "pyrunner.runners.seq_runner", aliases=("cust",))
+    assert registry.get_runner("cust") == (seq_runner, "custom")
+
+    with pytest.raises(NameError):
+        registry.register("seq_runner", mp_runner)
+    with pytest.raises(ValueError):
+        registry.register("not a name", seq_runner)
+
+    # The discovered runners are reused, so creating diagrams does not look for the runners again
+    monkeypatch.setattr(registry.pkgutil, "iter_modules", None)
+    diagram = systems.BlockDiagram("registry_sys", "custom")
+    assert diagram.runner is seq_runner and diagram.lib_deps == {"pyrunner.runners.seq_runner": "custom"}
+    diagram._DIAGRAMS.remove(diagram)
+
+
+def test_entry_point_runners(monkeypatch):
+
+    entry_point = metadata.EntryPoint("plugin", "pyrunner.runners.mp_runner", registry.ENTRY_POINT_GROUP)
+    monkeypatch.setattr(metadata, "entry_points", lambda group: [entry_point])
+    monkeypatch.setattr(registry, "_RUNNERS", {})
+    monkeypatch.setattr(registry, "_ALIASES", {})
+    monkeypatch.setattr(registry, "_discovered", False)
+
+    assert registry.get_runner("plugin") == (mp_runner, "plugin")
+    assert registry.get_runner_names() == ["mp_runner", "plugin", "seq_runner"]
+
+
+def test_runner_aliases_in_shared_code(monkeypatch):
+
+    monkeypatch.setattr(registry, "_RUNNERS", dict(registry._RUNNERS))
+    monkeypatch.setattr(registry, "_ALIASES", dict(registry._ALIASES))
+    monkeypatch.setattr(systems.BlockDiagram, "_DIAGRAMS", [])  # Only build the diagrams of this test
+    registry.register("other_seq", "pyrunner.runners.seq_runner")
+
+    # The same module is imported under the name of each runner that uses it
+    for name, runner_name in (("first_alias_sys", "seq"), ("second_alias_sys", "other_seq")):
+        diagram = systems.BlockDiagram(name, runner_name)
+        x = signal_routers.Tag(diagram, "x")
+        diagram.inputs.add(x)
+        diagram.outputs.add(x)
+
+    namespace = {}
+    systems.BlockDiagram.build_diagrams(namespace=namespace)
+    assert namespace["seq_runner"] is namespace["other_seq"] is seq_runner
+    assert namespace["second_alias_sys_exec"].run({"x": 1.0}) == {"x": 1.0}
+
+
+def test_invalid_entry_point_names(monkeypatch):
+
+    entry_point = metadata.EntryPoint("bad-plugin", "pyrunner.runners.mp_runner", registry.ENTRY_POINT_GROUP)
+    monkeypatch.setattr(metadata, "entry_points", lambda group: [entry_point])
+    monkeypatch.setattr(registry, "_RUNNERS", {})
+    monkeypatch.setattr(registry, "_ALIASES", {})
+    monkeypatch.setattr(registry, "_discovered", False)
+
+    # The generated code could not import the runner under this name
+    with pytest.raises(ValueError):
+        registry.get_runner("seq")
+    with pytest.raises(ValueError):
+        registry.get_runner_names()
@@ -0,0 +1,260 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from pyrunner.components import *
+from pyrunner.runners import executors, seq_runner
+
+
+def _create_batch_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value='np.array([1.0, -2.0, 3.0])')
+
+    diff = math_op.Sum(diagram, comp_signs="+-")
+    diff.inputs.add(x, const)
+
+    absolute = math_op.Abs(diagram)
+    absolute.inputs.add(input=diff)
+
+    total = math_op.Sum(diagram, comp_signs="-")  # Sums over every element of a scenario
+    total.inputs.add(absolute)
+
+    col_total = math_op.Sum(diagram, comp_signs="+", dimension=0)
+    col_total.inputs.add(absolute)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(absolute, total, col_total)
+
+    return diagram
+
+
+def test_run_batch():
+
+    _create_batch_diagram("batch_sys").build(batch=True)
+    _create_batch_diagram("single_sys").build()
+
+    scenarios = np.random.RandomState(0).normal(size=(5, 2, 3))
+    batch_outputs = executors._POOL["batch_sys"].run_batch({"x": scenarios})
+
+    for i, scenario in enumerate(scenarios):
+        outputs = executors.run("single_sys", {"x": scenario})
+        for output_name, value in outputs.items():
+            assert np.allclose(batch_outputs[output_name][i], value)
+
+
+def _create_mixed_rank_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")  # A vector per scenario
+    y = signal_routers.Tag(diagram, "y")  # A scalar per scenario
+    const = sources.Constant(diagram, value='np.array([10.0, 20.0, 30.0])')
+
+    total = math_op.Sum(diagram, comp_signs="+")
+    total.inputs.add(x)
+    shifted = math_op.Sum(diagram, "shifted", comp_signs="++")
+    shifted.inputs.add(total, const)
+    scaled = math_op.Sum(diagram, "scaled", comp_signs="+-+")
+    scaled.inputs.add(x, y, shifted)
+
+    diagram.inputs.add(x, y)
+    diagram.outputs.add(shifted, scaled)
+
+    return diagram
+
+
+def test_run_batch_mixed_ranks():
+
+    _create_mixed_rank_diagram("mixed_batch_sys").build(batch=True)
+    _create_mixed_rank_diagram("mixed_single_sys").build()
+
+    # As many scenarios as elements in the constant, so misaligned batch axes would still broadcast
+    scenarios = np.arange(9.0).reshape(3, 3)
+    batch_outputs = executors._POOL["mixed_batch_sys"].run_batch({"x": scenarios, "y": np.arange(3.0)})
+    assert np.array_equal(batch_outputs["shifted"], [[13.0, 23.0, 33.0], [22.0, 32.0, 42.0], [31.0, 41.0, 51.0]])
+
+    for i, scenario in enumerate(scenarios):
+        outputs = executors.run("mixed_single_sys", {"x": scenario, "y": float(i)})
+        for output_name, value in outputs.items():
+            assert np.array_equal(batch_outputs[output_name][i], value)
+
+
+def test_run_batch_errors():
+
+    _create_batch_diagram("batch_err_sys").build(batch=True)
+    _create_batch_diagram("single_err_sys").build()
+
+    with pytest.raises(AttributeError):  # The system was not built in batch mode
+        executors._POOL["single_err_sys"].run_batch({"x": np.zeros((2, 3))})
+
+    with pytest.raises(ValueError):  # The input does not carry a batch axis
+        executors._POOL["batch_err_sys"].run_batch({"x": 1.0})
+
+
+def test_async_executor():
+
+    diagram = _create_batch_diagram("async_sys")
+    diagram.build()
+
+    async_executor = seq_runner.AsyncExecutor("async_sys")
+    scenarios = [np.full((2, 3), float(i)) for i in range(4)]
+
+    async def run_system():
+
+        queue = asyncio.Queue()
+        for scenario in scenarios:
+            queue.put_nowait({"x": scenario})
+        queue.put_nowait(None)
+
+        first_outputs = await async_executor.run({"x": scenarios[0]})
+        streamed_outputs = [outputs async for outputs in async_executor.astream(seq_runner.iterate_queue(queue))]
+        return first_outputs, streamed_outputs
+
+    first_outputs, streamed_outputs = asyncio.run(run_system())
+
+    assert np.allclose(first_outputs["absolute"], np.abs(scenarios[0] - [1.0, -2.0, 3.0]))
+    assert len(streamed_outputs) == len(scenarios)
+    for outputs, scenario in zip(streamed_outputs, scenarios):
+        assert np.allclose(outputs["absolute"], np.abs(scenario - [1.0, -2.0, 3.0]))
+
+
+def test_stream():
+
+    diagram = systems.BlockDiagram("stream_sys", "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    y = signal_routers.Tag(diagram, "y")
+
+    diff = math_op.Sum(diagram, comp_signs="+-")
+    diff.inputs.add(x, y)
+
+    diagram.inputs.add(x, y)
+    diagram.outputs.add(diff)
+    diagram.build()
+
+    records = [{"x": float(i), "y": 2.0 * i} for i in range(5)]
+    expected = [{"add": -float(i)} for i in range(5)]
+
+    assert list(executors.stream("stream_sys", iter(records))) == expected
+    assert list(executors.get("stream_sys").stream(((r["x"], r["y"]) for r in records), ordered=True)) == expected
+
+
+class _MultiLineAbs(base_comp.BaseComponent):
+
+    default_name = base_comp.generate_default_name("multi_abs")
+
+    direct_feedthrough = base_comp.generate_direct_feedthrough(True)
+
+    prop_info = base_comp.generate_prop_info(
+        {
+            "inputs": ({"input"}, {"input"}),
+            "outputs": ({}, {}),
+            "parameters": ({}, {})
+        }
+    )
+
+    def generate_code_string(self):
+
+        input_name = self.inputs["input"].name
+        self.code_str["Execution"] = "if {0} < 0:\n\t{1} = -{0}\nelse:\n\t{1} = {0}".format(input_name, self.name)
+
+
+def test_multi_line_code_strings():
+
+    diagram = systems.BlockDiagram("multi_line_sys", "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    multi_abs = _MultiLineAbs(diagram)
+    multi_abs.inputs.add(input=x)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(multi_abs)
+    diagram.build()
+
+    assert executors.run("multi_line_sys", {"x": -3}) == {"multi_abs": 3}
+    assert executors.run("multi_line_sys", {"x": 2}) == {"multi_abs": 2}
+
+
+def _create_multi_rate_diagram(name):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value=10)
+
+    slow = math_op.Sum(diagram, "slow", comp_signs="++")
+    slow.inputs.add(x, const)
+    slow.sample_time = 3
+    slow_abs = math_op.Abs(diagram, "slow_abs")  # Inherits the sample time of slow
+    slow_abs.inputs.add(input=slow)
+
+    fast = math_op.Abs(diagram, "fast")
+    fast.inputs.add(input=x)
+    mixed = math_op.Sum(diagram, "mixed", comp_signs="+-")  # Reads the held value of slow on every step
+    mixed.inputs.add(fast, slow_abs)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(slow_abs, mixed)
+
+    return diagram
+
+
+def test_multi_rate():
+
+    diagram = _create_multi_rate_diagram("multi_rate_sys")
+    diagram.build()
+
+    assert dict((comp.name, sample_time) for comp, sample_time in diagram.sample_times.items()
+                if comp.name != "const") == {"x": 1, "slow": 3, "slow_abs": 3, "fast": 1, "mixed": 1}
+
+    for step in range(7):
+        held_x = step - step % 3  # Value of x in the last step where slow was evaluated
+        assert executors.run("multi_rate_sys", {"x": step}) == {"slow_abs": held_x + 10, "mixed": step - held_x - 10}
+
+
+def test_sample_time_errors():
+
+    diagram = _create_multi_rate_diagram("bad_rate_sys")
+
+    with pytest.raises(TypeError):
+        diagram.comps[2].sample_time = 1.5
+    with pytest.raises(ValueError):
+        diagram.comps[2].sample_time = 0
+
+    diagram.comps[3].sample_time = 2  # Not a multiple of the sample time of its input
+    with pytest.raises(ValueError):
+        diagram.build()
+
+
+def test_instrumented_build():
+
+    timed_diagram = _create_multi_rate_diagram("timed_sys")
+    timed_diagram.build(instrument=True)
+    _create_multi_rate_diagram("untimed_sys").build()
+
+    for step in range(6):
+        assert executors.run("timed_sys", {"x": step}) == executors.run("untimed_sys", {"x": step})
+
+    timed_executor = executors._POOL["timed_sys"]
+    calls = dict((name, calls) for name, calls in zip(timed_executor.profile.names, timed_executor.profile.calls))
+    assert calls["fast"] == 6 and calls["slow"] == 2 and calls["mixed"] == 6
+    assert set(timed_executor.get_timings()) == set(calls)
+    assert set(timed_executor.get_timings(per_call=True)) == set(calls)
+    assert "slow_abs" in timed_executor.format_timings()
+
+    timed_executor.reset_timings()
+    assert sum(timed_executor.get_timings().values()) == 0
+    assert executors.run("timed_sys", {"x": 6}) == executors.run("untimed_sys", {"x": 6})
+    assert timed_executor.profile.calls[timed_executor.profile.names.index("fast")] == 1
+
+    with pytest.raises(AttributeError):  # The system was not instrumented
+        executors._POOL["untimed_sys"].get_timings()
+
+    # A later build without instrumentation does not import the timing modules
+    timed_diagram.build()
+    assert "_profiling" not in seq_runner.Builder.create_code_string([timed_diagram])
+    assert "_time" not in timed_diagram.lib_deps.values()
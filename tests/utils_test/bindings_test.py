@@ -0,0 +1,72 @@
+import os
+import runpy
+
+import numpy as np
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+from pyrunner.utils import bindings
+
+
+def _create_bound_diagram(name, first_value, second_value):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value=first_value)
+    const_1 = sources.Constant(diagram, value=second_value)
+
+    adder = math_op.Sum(diagram, comp_signs="+++")
+    adder.inputs.add(x, const, const_1)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(adder)
+
+    return diagram
+
+
+# Test functions
+
+def test_bound_constants():
+
+    weights = np.arange(1000.0)
+    diagram = _create_bound_diagram("bound_sys", weights, weights.copy())
+    diagram.build()
+
+    # Equal arrays share a single binding, which is the given array itself
+    assert diagram.bindings == {"_bound_sys_bind_0": weights}
+    assert diagram.bindings["_bound_sys_bind_0"] is weights
+    assert diagram.comps[1].code_str["Set Up"] == "const = _bound_sys_bind_0"
+    assert diagram.comps[2].code_str["Set Up"] == "const_1 = _bound_sys_bind_0"
+    assert np.array_equal(executors.run("bound_sys", {"x": 1.0})["add"], 2 * weights + 1)
+
+    # Literal values are still written as code
+    diagram.comps[2].parameters.update(value=2)
+    diagram.build()
+    assert list(diagram.bindings) == ["_bound_sys_bind_0"]
+    assert diagram.comps[2].code_str["Set Up"] == "const_1 = 2"
+
+
+def test_bound_constants_script(tmp_path):
+
+    large_array = np.linspace(0.0, 1.0, bindings.INLINE_SIZE + 1)
+    small_array = np.array([2], dtype=np.int32)
+    file_path = os.path.join(str(tmp_path), "bound_script.py")
+    _create_bound_diagram("bound_script_sys", large_array, small_array).build(file_path)
+
+    # Large arrays are saved next to the script and memory-mapped when it's run
+    assert sorted(os.listdir(str(tmp_path))) == ["bound_script.py", "bound_script_bound_script_sys_bind_0.npy"]
+    script_globals = runpy.run_path(file_path)
+    assert isinstance(script_globals["_bound_script_sys_bind_0"], np.memmap)
+    assert script_globals["_bound_script_sys_bind_1"].dtype == np.int32
+
+    output = script_globals["bound_script_sys_exec"].run({"x": 1})["add"]
+    assert np.array_equal(output, large_array + 3)
+
+
+def test_get_binding_key():
+
+    assert bindings.get_binding_key(np.zeros(3)) == bindings.get_binding_key(np.zeros(3))
+    assert bindings.get_binding_key(np.zeros(3)) != bindings.get_binding_key(np.zeros(3, dtype=np.float32))
+    assert bindings.get_binding_key(np.zeros(3)) != bindings.get_binding_key(np.zeros((3, 1)))
+    assert bindings.get_binding_key(np.array([None])) is None and bindings.get_binding_key([0.0]) is None
@@ -0,0 +1,89 @@
+import os
+
+from pyrunner.components import *
+from pyrunner.runners import executors
+from pyrunner.utils import build_cache
+from pyrunner.utils.build_cache import BuildCache, fingerprint
+
+
+def _create_cached_diagram(name, const_value):
+
+    diagram = systems.BlockDiagram(name, "seq")
+
+    x = signal_routers.Tag(diagram, "x")
+    const = sources.Constant(diagram, value=const_value)
+
+    adder = math_op.Sum(diagram, comp_signs="++")
+    adder.inputs.add(x, const)
+
+    diagram.inputs.add(x)
+    diagram.outputs.add(adder)
+
+    return diagram
+
+
+def test_fingerprint():
+
+    diagram = _create_cached_diagram("fingerprint_sys", 1)
+    same_diagram = _create_cached_diagram("fingerprint_sys", 1)
+    other_diagram = _create_cached_diagram("fingerprint_sys", 2)
+
+    assert fingerprint(diagram) == fingerprint(same_diagram)
+    assert fingerprint(diagram) != fingerprint(other_diagram)
+    assert fingerprint(diagram) != fingerprint(diagram, batch=True)
+
+
+def test_fingerprint_codegen_modules(monkeypatch):
+
+    diagram = _create_cached_diagram("codegen_fingerprint_sys", 1)
+    key = fingerprint(diagram)
+
+    # Editing the code generator or an optimization pass changes the fingerprint
+    for module_name in ("pyrunner.runners.base_runner", "pyrunner.runners.seq_runner", "pyrunner.optimizers.cse",
+                        "pyrunner.components.base_comp"):
+        monkeypatch.setitem(build_cache._MODULE_STAMPS, module_name, -1)
+        assert fingerprint(diagram) != key
+        monkeypatch.undo()
+    assert fingerprint(diagram) == key
+
+
+def test_cached_build(tmp_path, monkeypatch):
+
+    cache = BuildCache(str(tmp_path))
+
+    _create_cached_diagram("cached_sys", 1).build(cache=cache)
+    assert executors.run("cached_sys", {"x": 2}) == {"add": 3}
+    assert len(os.listdir(str(tmp_path))) == 1
+
+    # An identical diagram loads the cached code without organizing its components
+    del executors._POOL["cached_sys"]
+
+    def fail_organize(_):
+        raise AssertionError("The diagram should have been loaded from the cache")
+
+    monkeypatch.setattr(systems.BlockDiagram, "organize", fail_organize)
+    cached_diagram = _create_cached_diagram("cached_sys", 1)
+    cached_diagram.build(cache=str(tmp_path))
+    assert executors.run("cached_sys", {"x": 2}) == {"add": 3}
+
+    # Building the diagram again replaces its executor
+    executor = executors.get("cached_sys")
+    cached_diagram.build(cache=str(tmp_path))
+    assert executors.get("cached_sys") is not executor and executors.run("cached_sys", {"x": 2}) == {"add": 3}
+
+
+def test_cache_eviction(tmp_path):
+
+    cache = BuildCache(str(tmp_path))
+    for key in ("a", "b", "c"):
+        code = "value = '{}'".format(key * 100)
+        cache.store(key, code, compile(code, key, "exec"))
+    assert cache.load("a") is not None
+
+    entry_size = os.path.getsize(os.path.join(str(tmp_path), os.listdir(str(tmp_path))[0]))
+    cache.max_size = 2 * entry_size
+    cache.evict()
+
+    assert cache.load("a") is not None  # It was the most recently used entry
+    assert cache.load("b") is None
+    assert cache.load("c") is not None